@@ -11,4 +11,7 @@ defaults = {
     'find_grain_report_freq': 100,
     # How to find grain in a HRDIC map, either 'floodfill' or 'warp'
     'hrdic_grain_finding_method': 'floodfill',
+    # Maximum number of points in a block when processing a map in blocks
+    # of rows, to limit memory use. None to process the whole map at once
+    'map_block_size': 2 ** 22,
 }
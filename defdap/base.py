@@ -15,6 +15,7 @@
 
 import numpy as np
 import networkx as nx
+from scipy import ndimage
 
 from defdap.quat import Quat
 from defdap import plotting
@@ -34,6 +35,13 @@ class Map(object):
 
     grainList : list of defdap.base.Grain
         List of grains.
+    grainPointIdxs : numpy.ndarray
+        Flat indices of points in the grain map, sorted by grain.
+    grainOffsets : numpy.ndarray
+        Start of each grain in `grainPointIdxs`, with the total number
+        of points as the last element.
+    grainMapCache : tuple
+        Grain data and map painted by last call of `grainDataToMapData`.
     currGrainId : int
         ID of last selected grain.
 
@@ -43,6 +51,9 @@ class Map(object):
         self.yDim = None
 
         self.grainList = None
+        self.grainPointIdxs = None
+        self.grainOffsets = None
+        self.grainMapCache = None
         self.currGrainId = None  # ID of last selected grain
         self.homogPoints = []
 
@@ -96,6 +107,56 @@ class Map(object):
                 return False
         return True
 
+    def buildGrainIndex(self):
+        """Build the index of points in each grain from the grain map.
+        Points of grain i are given by
+        grainPointIdxs[grainOffsets[i]:grainOffsets[i + 1]].
+
+        """
+        grainsFlat = self.grains.reshape(-1)
+        numGrains = max(grainsFlat.max(initial=0), 0)
+
+        pointIdxs = np.flatnonzero(grainsFlat > 0)
+        pointIdxs = pointIdxs[np.argsort(grainsFlat[pointIdxs], kind='stable')]
+
+        grainOffsets = np.zeros(numGrains + 1, dtype=int)
+        np.cumsum(np.bincount(grainsFlat[pointIdxs] - 1, minlength=numGrains),
+                  out=grainOffsets[1:])
+
+        self.grainPointIdxs = pointIdxs
+        self.grainOffsets = grainOffsets
+
+        # clear data derived from previous grains
+        self.grainMapCache = None
+        self.neighbourNetwork = None
+
+    def grainsPointIdxs(self, grainIds):
+        """Flat indices of the points of given grains in the grain map,
+        grouped by grain.
+
+        Parameters
+        ----------
+        grainIds : numpy.ndarray
+            IDs of grains.
+
+        Returns
+        -------
+        numpy.ndarray
+            Flat indices of points.
+        numpy.ndarray
+            Start of each grain in the point indices, with the total
+            number of points as the last element.
+
+        """
+        grainSizes = np.diff(self.grainOffsets)[grainIds]
+        groupOffsets = np.concatenate(([0], np.cumsum(grainSizes)))
+        pointIdxs = self.grainPointIdxs[
+            np.repeat(self.grainOffsets[grainIds] - groupOffsets[:-1],
+                      grainSizes) + np.arange(groupOffsets[-1])
+        ]
+
+        return pointIdxs, groupOffsets
+
     def plotGrainNumbers(self, dilateBoundaries=False, ax=None, **kwargs):
         """Plot a map with grains numbered.
 
@@ -391,57 +452,43 @@ class Map(object):
 
     @reportProgress("constructing neighbour network")
     def buildNeighbourNetwork(self):
-        """Construct a list of neighbours
+        """Construct a list of neighbours. Grains are neighbours if they
+        are both next to the same boundary point.
 
         """
+        grains = self.grains
+        # boundary points, excluding those on the edge of the map
+        isBoundary = self.boundaries[1:-1, 1:-1] != 0
+
+        # grain labels of the 4 nearest neighbour points of each
+        # boundary point (this maybe needs changing considering the
+        # position of boundary pixels relative to the actual edges)
+        neighbours = np.stack([
+            grains[2:, 1:-1][isBoundary],
+            grains[:-2, 1:-1][isBoundary],
+            grains[1:-1, 2:][isBoundary],
+            grains[1:-1, :-2][isBoundary],
+        ])
+        yield 0.5
+
+        # pair every 2 neighbours of a point, excluding boundary points
+        # and points in small grains. Minus 1 as the grain image starts
+        # labeling at 1
+        i, j = np.triu_indices(4, k=1)
+        pairs = np.stack([
+            np.minimum(neighbours[i], neighbours[j]).reshape(-1),
+            np.maximum(neighbours[i], neighbours[j]).reshape(-1)
+        ]) - 1
+        pairs = pairs[:, (pairs[0] >= 0) & (pairs[0] != pairs[1])]
+        pairs = np.unique(pairs, axis=1)
+
         # create network
         nn = nx.Graph()
         nn.add_nodes_from(self.grainList)
-
-        yLocs, xLocs = np.nonzero(self.boundaries)
-        totalPoints = len(xLocs)
-
-        for iPoint, (x, y) in enumerate(zip(xLocs, yLocs)):
-            # report progress
-            yield iPoint / totalPoints
-
-            if (x == 0 or y == 0 or x == self.grains.shape[1] - 1 or
-                    y == self.grains.shape[0] - 1):
-                # exclude boundary pixels of map
-                continue
-
-            # use 4 nearest neighbour points as potential neighbour grains
-            # (this maybe needs changing considering the position of
-            # boundary pixels relative to the actual edges)
-            # use sets as they do not allow duplicate elements
-            # minus 1 on all as the grain image starts labeling at 1
-            neighbours = {
-                self.grains[y + 1, x] - 1,
-                self.grains[y - 1, x] - 1,
-                self.grains[y, x + 1] - 1,
-                self.grains[y, x - 1] - 1
-            }
-            # neighbours = set(neighbours)
-            # remove boundary points (-2) and points in small
-            # grains (-3) (Normally -1 and -2)
-            neighbours.discard(-2)
-            neighbours.discard(-3)
-
-            neighbours = tuple(neighbours)
-            nunNeig = len(neighbours)
-            if nunNeig <= 1:
-                continue
-            for i in range(nunNeig):
-                for j in range(i + 1, nunNeig):
-                    # Add  to network
-                    grain = self[neighbours[i]]
-                    neiGrain = self[neighbours[j]]
-                    try:
-                        # look up boundary
-                        nn[grain][neiGrain]
-                    except KeyError:
-                        # neighbour relation doesn't exist so add it
-                        nn.add_edge(grain, neiGrain)
+        nn.add_edges_from(
+            (self.grainList[grainID], self.grainList[neiGrainID])
+            for grainID, neiGrainID in pairs.T
+        )
 
         self.neighbourNetwork = nn
 
@@ -508,18 +555,37 @@ class Map(object):
         return self.proxigramArr
 
     @reportProgress("calculating proxigram")
-    def calcProxigram(self, numTrials=500, forceCalc=True):
+    def calcProxigram(self, numTrials=None, forceCalc=True, sampling=1.,
+                      returnIndices=False):
         """Calculate distance from a grain boundary at each point in map.
+        Boundaries are placed on the bottom right corner of boundary
+        points and distances are found with an exact Euclidean distance
+        transform on a grid with half the point spacing.
 
         Parameters
         ----------
         numTrials : int, optional
-            number of trials.
+            Not used, kept for compatibility.
         forceCalc : bool, optional
             Force calculation even is proxigramArr is populated.
+        sampling : float or sequence of float, optional
+            Spacing of points along y and x. A single value is used for
+            both directions. Default is distances in number of points.
+        returnIndices : bool, optional
+            If True, also return the nearest boundary point and grain
+            at each point.
+
+        Returns
+        -------
+        numpy.ndarray, numpy.ndarray
+            Only if `returnIndices` is True. Indices (y, x) of the
+            nearest boundary point, shape (2, yDim, xDim), and ID of the
+            grain containing the nearest boundary point, -1 if it is not
+            in a grain. Both are -1 where there are no boundaries.
 
         """
-        if self.proxigramArr is not None and not forceCalc:
+        if self.proxigramArr is not None and not forceCalc and \
+                not returnIndices:
             return
 
         proxBoundaries = np.copy(self.boundaries)
@@ -532,47 +598,183 @@ class Map(object):
         # bottom edge
         if np.all(proxBoundaries[-1, :] == -1):
             proxBoundaries[-1, :] = proxBoundaries[-2, :]
+        proxBoundaries = proxBoundaries == -1
+
+        sampling = np.broadcast_to(np.asarray(sampling, dtype=float), (2,))
 
-        # create list of positions of each boundary point
-        indexBoundaries = []
-        for index, value in np.ndenumerate(proxBoundaries):
-            if value == -1:
-                indexBoundaries.append(index)
-        # add 0.5 to boundary coordiantes as they are placed on the
-        # bottom right edge pixels of grains
-        indexBoundaries = np.array(indexBoundaries) + 0.5
-
-        # array of x and y coordinate of each pixel in the map
-        coords = np.zeros((2, proxShape[0], proxShape[1]), dtype=float)
-        coords[0], coords[1] = np.meshgrid(
-            range(proxShape[0]), range(proxShape[1]), indexing='ij'
+        if not np.any(proxBoundaries):
+            self.proxigramArr = np.full(proxShape, np.inf)
+            if returnIndices:
+                return (np.full((2,) + proxShape, -1, dtype=int),
+                        np.full(proxShape, -1, dtype=int))
+            return
+
+        yield 0.1
+
+        # grid with half the point spacing. Points of the map are on
+        # even indices and boundaries, offset by half a point, on odd
+        fineGrid = np.ones((2 * proxShape[0], 2 * proxShape[1]), dtype=bool)
+        fineGrid[1::2, 1::2][proxBoundaries] = False
+
+        result = ndimage.distance_transform_edt(
+            fineGrid, sampling=sampling / 2, return_indices=returnIndices
         )
 
-        # array to store trial distance from each boundary point
-        trialDistances = np.full((numTrials + 1, proxShape[0], proxShape[1]),
-                                 1000, dtype=float)
+        if not returnIndices:
+            self.proxigramArr = result[::2, ::2]
+            return
+
+        self.proxigramArr = result[0][::2, ::2]
+        boundaryIdxs = (result[1][:, ::2, ::2] - 1) // 2
+
+        grains = getattr(self, 'grains', None)
+        if grains is not None and grains.shape == proxShape:
+            grainIds = grains[boundaryIdxs[0], boundaryIdxs[1]] - 1
+            grainIds[grainIds < 0] = -1
+        else:
+            grainIds = np.full(proxShape, -1, dtype=int)
+
+        return boundaryIdxs, grainIds
+
+    def calcGrainStats(self, mapData, stats=('mean',), percentiles=(),
+                       grainIds=-1, ignoreNan=False):
+        """Calculate statistics of map data for each grain. All grains
+        are reduced together using the grain index of the map.
+
+        Parameters
+        ----------
+        mapData : numpy.ndarray
+            Array of map data, shape (..., yDim, xDim). Any leading
+            dimensions are treated as separate fields. This must be
+            cropped!
+        stats : iterable of str, optional
+            Statistics to calculate, any of 'count', 'mean', 'std',
+            'min', 'max' and 'median'.
+        percentiles : iterable of float, optional
+            Percentiles to calculate, in the range 0 to 100. Linear
+            interpolation is used as in `numpy.percentile`.
+        grainIds : list of int or int, optional
+            IDs of grains to calculate statistics for. Use -1 for all
+            grains in the map.
+        ignoreNan : bool, optional
+            If True, NaN values are excluded from the statistics, as in
+            `numpy.nanmean` etc. Otherwise any NaN in a grain gives NaN
+            for that grain.
+
+        Returns
+        -------
+        dict
+            Arrays of shape (..., number of grains) keyed by statistic
+            name. Percentiles are stored under 'percentiles' with an
+            extra leading dimension of the number of percentiles.
+
+        """
+        # Check that grains have been detected in the map
+        self.checkGrainsDetected()
+
+        validStats = ('count', 'mean', 'std', 'min', 'max', 'median')
+        stats = tuple(stats)
+        for stat in stats:
+            if stat not in validStats:
+                raise ValueError(f"Unknown statistic '{stat}'. Must be one "
+                                 f"of {validStats}.")
+        percentiles = np.asarray(percentiles, dtype=float).reshape(-1)
+        if np.any((percentiles < 0) | (percentiles > 100)):
+            raise ValueError("Percentiles must be in the range 0 to 100.")
+
+        mapData = np.asarray(mapData)
+        if mapData.shape[-2:] != self.grains.shape:
+            raise ValueError("Shape of map data does not match the grain "
+                             "map. Is the data cropped?")
+        fieldShape = mapData.shape[:-2]
+        fieldsData = mapData.reshape((-1, mapData.shape[-2] * mapData.shape[-1]))
+        fieldsData = fieldsData[:, self.grainPointIdxs].astype(float)
+
+        numGrains = len(self.grainOffsets) - 1
+        pointGrainIds = np.repeat(np.arange(numGrains),
+                                  np.diff(self.grainOffsets))
+        orderStats = [stat for stat in stats if stat in
+                      ('min', 'max', 'median')]
+        numPercentiles = len(percentiles)
+        if 'median' in orderStats:
+            percentiles = np.append(percentiles, 50.)
+
+        results = {stat: np.empty((len(fieldsData), numGrains))
+                   for stat in stats}
+        results['percentiles'] = np.empty((len(percentiles), len(fieldsData),
+                                           numGrains))
+        for i, values in enumerate(fieldsData):
+            valueGrainIds = pointGrainIds
+            isNan = np.isnan(values)
+            if ignoreNan:
+                values = values[~isNan]
+                valueGrainIds = pointGrainIds[~isNan]
+                hasNan = np.zeros(numGrains, dtype=bool)
+            else:
+                hasNan = np.bincount(pointGrainIds, weights=isNan,
+                                     minlength=numGrains) > 0
+
+            counts = np.bincount(valueGrainIds, minlength=numGrains)
+            with np.errstate(invalid='ignore', divide='ignore'):
+                means = np.bincount(valueGrainIds, weights=values,
+                                    minlength=numGrains) / counts
+                if 'std' in stats:
+                    deviations = (values - means[valueGrainIds]) ** 2
+                    results['std'][i] = np.sqrt(np.bincount(
+                        valueGrainIds, weights=deviations, minlength=numGrains
+                    ) / counts)
+            if 'count' in stats:
+                results['count'][i] = counts
+            if 'mean' in stats:
+                results['mean'][i] = means
+
+            if not (orderStats or len(percentiles)):
+                continue
 
-        # loop over each boundary point (p) and calculate distance from
-        # p to all points in the map store minimum once numTrails have
-        # been made and start a new batch of trials
-        numBoundaryPoints = len(indexBoundaries)
-        j = 1
-        for i, indexBoundary in enumerate(indexBoundaries):
-            trialDistances[j] = np.sqrt((coords[0] - indexBoundary[0])**2
-                                        + (coords[1] - indexBoundary[1])**2)
+            # sort values within each grain, values are already grouped
+            # by grain so NaNs are sorted to the end of each grain
+            values = values[np.lexsort((values, valueGrainIds))]
+            starts = np.cumsum(counts) - counts
+            empty = (counts == 0) | hasNan
+            lastIdxs = np.maximum(starts + counts - 1, 0)
+            if len(values) == 0:
+                values = np.full(1, np.nan)
+
+            if 'min' in stats:
+                results['min'][i] = np.where(
+                    empty, np.nan, values[np.minimum(starts, len(values) - 1)]
+                )
+            if 'max' in stats:
+                results['max'][i] = np.where(empty, np.nan, values[lastIdxs])
+            for j, percentile in enumerate(percentiles):
+                pos = starts + percentile / 100 * np.maximum(counts - 1, 0)
+                lower = np.minimum(np.floor(pos).astype(int), len(values) - 1)
+                upper = np.minimum(np.ceil(pos).astype(int), len(values) - 1)
+                frac = pos - np.floor(pos)
+                results['percentiles'][j, i] = np.where(
+                    empty, np.nan,
+                    values[lower] + frac * (values[upper] - values[lower])
+                )
 
-            if j == numTrials:
-                # find current minimum distances and store
-                trialDistances[0] = trialDistances.min(axis=0)
-                j = 0
-                # report progress
-                yield i / numBoundaryPoints
-            j += 1
+        if 'median' in stats:
+            results['median'] = results['percentiles'][-1]
+        results['percentiles'] = results['percentiles'][:numPercentiles]
 
-        # find final minimum distances to a boundary
-        self.proxigramArr = trialDistances.min(axis=0)
+        if np.ndim(grainIds) == 0:
+            grainIds = slice(None) if grainIds == -1 else [grainIds]
+        else:
+            grainIds = np.asarray(grainIds, dtype=int)
+        for key, result in results.items():
+            result = result[..., grainIds]
+            results[key] = result.reshape(
+                result.shape[:-2] + fieldShape + result.shape[-1:]
+            )
+        if 'count' in stats:
+            results['count'] = results['count'].astype(int)
+        if numPercentiles == 0:
+            del results['percentiles']
 
-        trialDistances = None
+        return results
 
     def calcGrainAv(self, mapData, grainIds=-1):
         """Calculate grain average of any DIC map data.
@@ -590,31 +792,19 @@ class Map(object):
             Array containing the grain average values.
 
         """
-
-        # Check that grains have been detected in the map
-        self.checkGrainsDetected()
-
-        if type(grainIds) is int and grainIds == -1:
-            grainIds = range(len(self))
-
-        grainAvData = np.zeros(len(grainIds))
-
-        for i, grainId in enumerate(grainIds):
-            grain = self[grainId]
-            grainData = grain.grainData(mapData)
-            grainAvData[i] = grainData.mean()
-
-        return grainAvData
+        return self.calcGrainStats(mapData, grainIds=grainIds)['mean']
 
     def grainDataToMapData(self, grainData, grainIds=-1, bg=0):
         """Create a map array with each grain filled with the given
-        values.
+        values. The map is painted by indexing a lookup table of grain
+        values with the grain map. The result is cached and a copy of
+        it returned again if called with the same grain data.
 
         Parameters
         ----------
         grainData : list or numpy.ndarray
-            Grain values. This can be a single value per grain or RGB
-            values.
+            Grain values. This can be a single value per grain or an
+            array of values per grain, e.g. RGB values.
         grainIds : list of int or int, optional
             IDs of grains to plot for. Use -1 for all grains in the map.
         bg : int or real, optional
@@ -623,36 +813,45 @@ class Map(object):
         Returns
         -------
         grainMap: numpy.ndarray
-            Array filled with grain data values
+            Array filled with grain data values, shape of the grain map
+            followed by the shape of values per grain.
 
         """
         # Check that grains have been detected in the map
         self.checkGrainsDetected()
 
-        if type(grainIds) is int:
+        if np.ndim(grainIds) == 0:
             if grainIds == -1:
                 grainIds = range(len(self))
             else:
                 grainIds = [grainIds]
+        grainIds = np.asarray(grainIds, dtype=int)
 
-        grainData = np.array(grainData)
-        if grainData.shape[0] != len(grainIds):
-            raise ValueError("The length of supplied grain data does not"
+        grainData = np.asarray(grainData)
+        if grainData.ndim == 0 or grainData.shape[0] != len(grainIds):
+            raise ValueError("The length of supplied grain data does not "
                              "match the number of grains.")
-        if len(grainData.shape) == 1:
-            mapShape = [self.yDim, self.xDim]
-        elif len(grainData.shape) == 2 and grainData.shape[1] == 3:
-            mapShape = [self.yDim, self.xDim, 3]
-        else:
-            raise ValueError("The grain data supplied must be either a"
-                             "single value or RGB values per grain.")
 
-        grainMap = np.full(mapShape, bg, dtype=grainData.dtype)
-        for grainId, grainValue in zip(grainIds, grainData):
-            for coord in self[grainId].coordList:
-                grainMap[coord[1], coord[0]] = grainValue
+        cached = self.grainMapCache
+        if (cached is not None and cached[0] is self.grains and
+                cached[1] == bg and np.array_equal(cached[2], grainIds) and
+                cached[3].shape == grainData.shape and
+                np.array_equal(cached[3], grainData,
+                               equal_nan=grainData.dtype.kind in 'fc')):
+            return cached[4].copy()
+
+        # lookup table of values for each label in the grain map,
+        # background and boundary labels are mapped to the first row
+        lut = np.full((len(self) + 1,) + grainData.shape[1:], bg,
+                      dtype=np.result_type(grainData, bg))
+        lut[grainIds + 1] = grainData
+        grainMap = lut[np.maximum(self.grains, 0)]
+
+        grainMap.flags.writeable = False
+        self.grainMapCache = (self.grains, bg, grainIds, grainData.copy(),
+                              grainMap)
 
-        return grainMap
+        return grainMap.copy()
 
     def plotGrainDataMap(
         self, mapData=None, grainData=None, grainIds=-1, bg=0, **kwargs
@@ -758,21 +957,70 @@ class Map(object):
 
 class Grain(object):
     """
-    Base class for a grain.
+    Base class for a grain. Grains are views into the grain index of
+    the map they belong to.
+
+    Attributes
+    ----------
+    grainID : int
+        ID of the grain, the position of the grain in the grain list of
+        the owner map.
+    ownerMap : defdap.base.Map
+        Map this grain is a member of.
+
     """
     def __init__(self, grainID, ownerMap):
-        # list of coords stored as tuples (x, y). These are coords in a
-        # cropped image if crop exists.
         self.grainID = grainID
         self.ownerMap = ownerMap
-        self.coordList = []
 
     def __len__(self):
-        return len(self.coordList)
+        offsets = self.ownerMap.grainOffsets
+        return int(offsets[self.grainID + 1] - offsets[self.grainID])
 
     def __str__(self):
         return f"Grain(ID={self.grainID})"
 
+    @property
+    def pointIdxs(self):
+        """Flat indices of the points of the grain in the grain map.
+
+        Returns
+        -------
+        numpy.ndarray
+
+        """
+        offsets = self.ownerMap.grainOffsets
+        return self.ownerMap.grainPointIdxs[
+            offsets[self.grainID]:offsets[self.grainID + 1]
+        ]
+
+    @property
+    def coords(self):
+        """Coordinates of the points of the grain in the grain map.
+        These are coords in a cropped image if crop exists.
+
+        Returns
+        -------
+        numpy.ndarray, numpy.ndarray
+            y and x coordinates.
+
+        """
+        return np.divmod(self.pointIdxs, self.ownerMap.grains.shape[1])
+
+    @property
+    def coordList(self):
+        """Coordinates of the points of the grain as (x, y) pairs.
+        These are coords in a cropped image if crop exists.
+
+        Returns
+        -------
+        numpy.ndarray
+            Array of shape (number of points, 2).
+
+        """
+        ys, xs = self.coords
+        return np.column_stack((xs, ys))
+
     @property
     def extremeCoords(self):
         """Coordinates of the bounding box for a grain.
@@ -783,12 +1031,9 @@ class Grain(object):
             minimum x, minimum y, maximum x, maximum y.
 
         """
-        coords = np.array(self.coordList, dtype=int)
-
-        x0, y0 = coords.min(axis=0)
-        xmax, ymax = coords.max(axis=0)
+        ys, xs = self.coords
 
-        return x0, y0, xmax, ymax
+        return xs.min(), ys.min(), xs.max(), ys.max()
 
     def centreCoords(self, centreType="box", grainCoords=True):
         """
@@ -846,8 +1091,8 @@ class Grain(object):
         # initialise array with nans so area not in grain displays white
         outline = np.full((ymax - y0 + 1, xmax - x0 + 1), bg, dtype=int)
 
-        for coord in self.coordList:
-            outline[coord[1] - y0, coord[0] - x0] = fg
+        ys, xs = self.coords
+        outline[ys - y0, xs - x0] = fg
 
         return outline
 
@@ -890,12 +1135,9 @@ class Grain(object):
             Array containing this grains values from the given map data.
 
         """
-        grainData = np.zeros(len(self), dtype=mapData.dtype)
-
-        for i, coord in enumerate(self.coordList):
-            grainData[i] = mapData[coord[1], coord[0]]
+        ys, xs = self.coords
 
-        return grainData
+        return mapData[ys, xs]
 
     def grainMapData(self, mapData=None, grainData=None, bg=np.nan):
         """Extract a single grain map from the given map data.
@@ -929,8 +1171,8 @@ class Grain(object):
         grainMapData = np.full((ymax - y0 + 1, xmax - x0 + 1), bg,
                                dtype=type(grainData[0]))
 
-        for coord, data in zip(self.coordList, grainData):
-            grainMapData[coord[1] - y0, coord[0] - x0] = data
+        ys, xs = self.coords
+        grainMapData[ys - y0, xs - x0] = grainData
 
         return grainMapData
 
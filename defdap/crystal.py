@@ -251,6 +251,36 @@ crystalStructures = {
     )
 }
 
+# Coincidence site lattice (CSL) boundaries up to sigma 29 given as
+# (sigma, rotation axis, rotation angle in degrees). CSL boundaries in
+# hexagonal crystals depend on c/a so are not included
+cslBoundaries = {
+    "cubic": [
+        (3, (1, 1, 1), 60.00),
+        (5, (1, 0, 0), 36.87),
+        (7, (1, 1, 1), 38.21),
+        (9, (1, 1, 0), 38.94),
+        (11, (1, 1, 0), 50.48),
+        (13, (1, 0, 0), 22.62),
+        (13, (1, 1, 1), 27.80),
+        (15, (2, 1, 0), 48.19),
+        (17, (1, 0, 0), 28.07),
+        (17, (2, 2, 1), 61.93),
+        (19, (1, 1, 0), 26.53),
+        (19, (1, 1, 1), 46.83),
+        (21, (1, 1, 1), 21.79),
+        (21, (2, 1, 1), 44.40),
+        (23, (3, 1, 1), 40.45),
+        (25, (1, 0, 0), 16.26),
+        (25, (3, 3, 1), 51.68),
+        (27, (1, 1, 0), 31.59),
+        (27, (2, 1, 0), 35.43),
+        (29, (1, 0, 0), 43.60),
+        (29, (2, 2, 1), 46.40),
+    ],
+    "hexagonal": []
+}
+
 
 class SlipSystem(object):
     """Class used for defining and performing operations on a slip system.
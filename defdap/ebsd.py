@@ -14,22 +14,26 @@
 # limitations under the License.
 
 import numpy as np
+from scipy import sparse
+from scipy.sparse import csgraph
 from matplotlib.widgets import Button
 from skimage import morphology as mph
 import networkx as nx
+import pandas as pd
 
 import copy
+from collections import deque
 from warnings import warn
 
-from defdap.file_readers import EBSDDataLoader
+from defdap.file_readers import EBSDDataLoader, OxfordBinaryLoader
 from defdap.file_writers import EBSDDataWriter
-from defdap.quat import Quat
-from defdap.crystal import SlipSystem
+from defdap.quat import Quat, QuatArray
+from defdap.crystal import SlipSystem, CrystalStructure, cslBoundaries
 from defdap import base
 
 from defdap import defaults
 from defdap.plotting import MapPlot
-from defdap.utils import reportProgress
+from defdap.utils import reportProgress, mapBlocks
 
 
 class Map(base.Map):
@@ -49,7 +53,7 @@ class Map(base.Map):
         Euler angles for eaxh point of the map. Shape (3, yDim, xDim).
     bandContrastArray : numpy.ndarray
         Band contrast for each point of map. Shape (yDim, xDim).
-    quatArray : numpy.ndarray of defdap.quat.Quat
+    quatArray : defdap.quat.QuatArray
         Quaterions for each point of map. Shape (yDim, xDim).
     numPhases : int
         Number of phases.
@@ -66,11 +70,13 @@ class Map(base.Map):
         grainID starts at 0. Regions that are smaller than the minimum
         grain size are given value -2. Remnant boundary points are -1.
     misOri : numpy.ndarray
-        Map of misorientation.
-    misOriAxis : list of numpy.ndarray
-        Map of misorientation axis components.
+        Map of misorientation to the grain reference orientation, as
+        the cosine of half the angle. NaN where not calculated.
+    misOriAxis : numpy.ndarray
+        Map of misorientation axis scaled by angle, shape
+        (3, yDim, xDim). NaN where not calculated.
     kam : numpy.ndarray
-        Map of KAM.
+        Map of KAM, the mean of cos(theta/2) over neighbours.
     slipSystems : list of list of defdap.crystal.SlipSystem
         Slip systems grouped by slip plane.
     slipTraceColours list(str)
@@ -82,10 +88,16 @@ class Map(base.Map):
         GND scalar map.
     Nye : numpy.ndarray
         3x3 Nye tensor at each point.
+    boundaryTable : pandas.DataFrame
+        Properties of the boundary between each pair of neighbouring
+        grains, see :func:`defdap.ebsd.Map.buildBoundaryTable`.
+    filledPoints : numpy.ndarray
+        Map of points changed by
+        :func:`defdap.ebsd.Map.fillNonIndexed`.
 
     """
 
-    def __init__(self, fileName, dataType=None):
+    def __init__(self, fileName, dataType=None, memmap=False):
         """
         Initialise class and load EBSD data.
 
@@ -95,6 +107,9 @@ class Map(base.Map):
             Path to EBSD file, including name, excluding extension.
         dataType : str, {'OxfordBinary', 'OxfordText'}
             Format of EBSD data file.
+        memmap : bool
+            Memory map the data file instead of reading it, see
+            :func:`loadData`.
 
         """
         # Call base class constructor
@@ -123,6 +138,8 @@ class Map(base.Map):
         self.origin = (0, 0)
         self.GND = None
         self.Nye = None
+        self.boundaryTable = None
+        self.filledPoints = None
         self.slipSystems = None
         self.slipTraceColours = None
 
@@ -135,10 +152,10 @@ class Map(base.Map):
         self.plotDefault = self.plotEulerMap
         self.highlightAlpha = 1
 
-        self.loadData(fileName, dataType=dataType)
+        self.loadData(fileName, dataType=dataType, memmap=memmap)
 
     @reportProgress("loading EBSD data")
-    def loadData(self, fileName, dataType=None):
+    def loadData(self, fileName, dataType=None, memmap=False):
         """Load in EBSD data from file.
 
         Parameters
@@ -147,10 +164,21 @@ class Map(base.Map):
             Path to EBSD file, including name, excluding extension.
         dataType : str, {'OxfordBinary', 'OxfordText'}
             Format of EBSD data file.
+        memmap : bool
+            Memory map the data file instead of reading it, so data is
+            only read from disk when used. Only for 'OxfordBinary'
+            files, see
+            :func:`defdap.file_readers.OxfordBinaryLoader.loadOxfordCRC`.
 
         """
         dataLoader = EBSDDataLoader.getLoader(dataType)
-        dataLoader.load(fileName)
+        if memmap:
+            if not isinstance(dataLoader, OxfordBinaryLoader):
+                raise ValueError("Memory mapping is only supported for "
+                                 "OxfordBinary data.")
+            dataLoader.load(fileName, memmap=True)
+        else:
+            dataLoader.load(fileName)
 
         metadataDict = dataLoader.loadedMetadata
         self.xDim = metadataDict['xDim']
@@ -254,8 +282,7 @@ class Map(base.Map):
         transformQuat = Quat.fromAxisAngle(np.array([0, 0, 1]), np.pi).conjugate
 
         # Perform vectorised multiplication
-        quats = Quat.multiplyManyQuats(self.quatArray.flatten(), transformQuat)
-        self.quatArray = np.array(quats).reshape(self.yDim, self.xDim)
+        self.quatArray = self.quatArray * transformQuat
 
         yield 1.
 
@@ -402,46 +429,154 @@ class Map(base.Map):
 
         return plot
 
-    def calcKam(self):
+    @reportProgress("calculating KAM")
+    def calcKam(self, kernelOrder=1, misOriTol=None, blockSize=None):
         """
-        Calculates Kernel Average Misorientaion (KAM) for the EBSD map,
-        based on a 3x3 kernel. Crystal symmetric equivalences are not
-        considered. Stores result in self.kam.
+        Calculates Kernel Average Misorientaion (KAM) for the EBSD map.
+        Neighbours lying on the perimeter of a square kernel of size
+        (2*kernelOrder + 1) are considered, as in OIM. Crystal symmetry
+        of each phase is taken into account and only neighbours of the
+        same phase contribute. Non-indexed points are excluded and
+        given a value of NaN. Stores result in self.kam as the mean
+        over neighbours of the cosine of half the misorientation angle,
+        cos(theta/2). This is not the cosine of half the mean angle,
+        but 2*arccos(kam) is close to the mean angle for the small
+        misorientations within grains.
+
+        Parameters
+        ----------
+        kernelOrder : int, optional
+            Order of neighbour shell to use, 1 for nearest neighbours.
+        misOriTol : float, optional
+            Neighbours with a misorientation greater than this (in
+            degrees) are excluded, to remove grain boundaries from the
+            average. All neighbours are used if None.
+        blockSize : int, optional
+            Maximum number of points to process at once, see
+            :func:`defdap.utils.mapBlocks`.
 
         """
-        quatComps = np.empty((4, self.yDim, self.xDim))
+        self.buildQuatArray()
+        kernelOrder = int(kernelOrder)
+        if kernelOrder < 1:
+            raise ValueError("kernelOrder must be 1 or greater.")
+
+        quatComps = self.quatArray.quatCoef
+        if misOriTol is None:
+            minDot = -1.
+        else:
+            minDot = np.cos(misOriTol * np.pi / 360)
+
+        self.kam = np.empty(self.shape)
+        for rows, haloRows, innerRows in mapBlocks(self.shape, blockSize,
+                                                   halo=kernelOrder):
+            kamSum, kamCount = Map._calcKamSums(
+                quatComps[:, haloRows], self.phaseArray[haloRows],
+                self.phases, kernelOrder, minDot
+            )
+            with np.errstate(divide='ignore', invalid='ignore'):
+                self.kam[rows] = kamSum[innerRows] / kamCount[innerRows]
+
+            yield rows.stop / self.shape[0]
+
+    @staticmethod
+    def _calcKamSums(quatComps, phaseArray, phases, kernelOrder, minDot):
+        """Sum the misorientation to neighbours in the kernel shell of
+        each point of a map.
+
+        Parameters
+        ----------
+        quatComps : numpy.ndarray
+            Quat components of the map, shape (4, y, x).
+        phaseArray : numpy.ndarray
+            Phase ids of the map. 1-based, 0 is non-indexed points.
+        phases : list of defdap.crystal.Phase
+            List of phases.
+        kernelOrder : int
+            Order of neighbour shell to use.
+        minDot : float
+            Neighbours with misorientation (cosine of half angle) less
+            than this are excluded.
+
+        Returns
+        -------
+        numpy.ndarray
+            Sum of misorientation (cosine of half angle) to neighbours.
+        numpy.ndarray
+            Number of neighbours included in the sum.
 
-        for i, row in enumerate(self.quatArray):
-            for j, quat in enumerate(row):
-                quatComps[:, i, j] = quat.quatCoef
+        """
+        kamSum = np.zeros(phaseArray.shape)
+        kamCount = np.zeros(phaseArray.shape, dtype=int)
+
+        # Offsets in one half of the kernel shell, each pair of points
+        # is visited once and added to both
+        n = kernelOrder
+        offsets = [(dy, dx) for dy in range(0, n + 1)
+                   for dx in range(-n, n + 1)
+                   if max(abs(dy), abs(dx)) == n and (dy > 0 or dx > 0)]
+
+        for dy, dx in offsets:
+            sl0, sl1 = Map._shiftSlices(dy, dx)
+            phases0 = phaseArray[sl0]
+            phases1 = phaseArray[sl1]
+
+            for phaseID, phase in enumerate(phases, start=1):
+                valid = (phases0 == phaseID) & (phases1 == phaseID)
+                if not np.any(valid):
+                    continue
+                quats0 = QuatArray(quatComps[(slice(None),) + sl0][:, valid],
+                                   allow_southern=True)
+                quats1 = QuatArray(quatComps[(slice(None),) + sl1][:, valid],
+                                   allow_southern=True)
+                misOri = quats0.misOri(quats1, phase.crystalStructure.name)
+                misOri[misOri > 1] = 1
+
+                keep = misOri >= minDot
+                misOriFull = np.zeros(phases0.shape)
+                misOriFull[valid] = np.where(keep, misOri, 0)
+                keepFull = np.zeros(phases0.shape, dtype=bool)
+                keepFull[valid] = keep
+
+                kamSum[sl0] += misOriFull
+                kamSum[sl1] += misOriFull
+                kamCount[sl0] += keepFull
+                kamCount[sl1] += keepFull
+
+        return kamSum, kamCount
 
-        self.kam = np.empty((self.yDim, self.xDim))
+    @staticmethod
+    def _shiftSlices(dy, dx):
+        """Slices selecting pairs of points in a map separated by the
+        given offset. Must have dy >= 0.
 
-        # Start with rows. Calculate misorientation with neighbouring rows.
-        # First and last row only in one direction
-        self.kam[0, :] = abs(np.einsum("ij,ij->j", quatComps[:, 0, :], quatComps[:, 1, :]))
-        self.kam[-1, :] = abs(np.einsum("ij,ij->j", quatComps[:, -1, :], quatComps[:, -2, :]))
-        for i in range(1, self.yDim - 1):
-            self.kam[i, :] = (abs(np.einsum("ij,ij->j", quatComps[:, i, :], quatComps[:, i + 1, :])) +
-                              abs(np.einsum("ij,ij->j", quatComps[:, i, :], quatComps[:, i - 1, :]))) / 2
+        Parameters
+        ----------
+        dy, dx : int
+            Offset between points in y and x directions.
 
-        self.kam[self.kam > 1] = 1
+        Returns
+        -------
+        tuple of slice, tuple of slice
+            Slices for the first and second point of each pair.
 
-        # Do the same for columns
-        self.kam[:, 0] += abs(np.einsum("ij,ij->j", quatComps[:, :, 0], quatComps[:, :, 1]))
-        self.kam[:, -1] += abs(np.einsum("ij,ij->j", quatComps[:, :, -1], quatComps[:, :, -2]))
-        for i in range(1, self.xDim - 1):
-            self.kam[:, i] += (abs(np.einsum("ij,ij->j", quatComps[:, :, i], quatComps[:, :, i + 1])) +
-                               abs(np.einsum("ij,ij->j", quatComps[:, :, i], quatComps[:, :, i - 1]))) / 2
+        """
+        sl0 = (slice(0, -dy if dy else None),
+               slice(max(-dx, 0), -dx if dx > 0 else None))
+        sl1 = (slice(dy, None),
+               slice(max(dx, 0), dx if dx < 0 else None))
 
-        self.kam /= 2
-        self.kam[self.kam > 1] = 1
+        return sl0, sl1
 
-    def plotKamMap(self, **kwargs):
+    def plotKamMap(self, kernelOrder=1, misOriTol=None, **kwargs):
         """Plot Kernel Average Misorientaion (KAM) for the EBSD map.
 
         Parameters
         ----------
+        kernelOrder : int, optional
+            Order of neighbour shell to use, see :func:`calcKam`.
+        misOriTol : float, optional
+            Misorientation cut-off in degrees, see :func:`calcKam`.
         kwargs
             All arguments are passed to :func:`defdap.plotting.MapPlot.create`.
 
@@ -457,7 +592,7 @@ class Map(base.Map):
         }
         plotParams.update(kwargs)
 
-        self.calcKam()
+        self.calcKam(kernelOrder=kernelOrder, misOriTol=misOriTol)
         # Convert to degrees and plot
         kam = 2 * np.arccos(self.kam) * 180 / np.pi
 
@@ -466,89 +601,41 @@ class Map(base.Map):
         return plot
 
     @reportProgress("calculating Nye tensor")
-    def calcNye(self):
+    def calcNye(self, blockSize=None):
         """
         Calculates Nye tensor and related GND density for the EBSD map.
         Stores result in self.Nye and self.GND. Uses the crystal
         symmetry of the primary phase.
 
+        Parameters
+        ----------
+        blockSize : int, optional
+            Maximum number of points to process at once, see
+            :func:`defdap.utils.mapBlocks`.
+
         """
         self.buildQuatArray()
-        syms = self.primaryPhase.crystalStructure.symmetries
-        numSyms = len(syms)
-
-        # array to store quat components of initial and symmetric equivalents
-        quatComps = np.empty((numSyms, 4, self.yDim, self.xDim))
-
-        # populate with initial quat components
-        for i, row in enumerate(self.quatArray):
-            for j, quat in enumerate(row):
-                quatComps[0, :, i, j] = quat.quatCoef
-
-        # loop of over symmetries and apply to initial quat components
-        # (excluding first symmetry as this is the identity transformation)
-        for i, sym in enumerate(syms[1:], start=1):
-            # sym[i] * quat for all points (* is quaternion product)
-            quatComps[i, 0] = (quatComps[0, 0] * sym[0] - quatComps[0, 1] * sym[1] -
-                               quatComps[0, 2] * sym[2] - quatComps[0, 3] * sym[3])
-            quatComps[i, 1] = (quatComps[0, 0] * sym[1] + quatComps[0, 1] * sym[0] -
-                               quatComps[0, 2] * sym[3] + quatComps[0, 3] * sym[2])
-            quatComps[i, 2] = (quatComps[0, 0] * sym[2] + quatComps[0, 2] * sym[0] -
-                               quatComps[0, 3] * sym[1] + quatComps[0, 1] * sym[3])
-            quatComps[i, 3] = (quatComps[0, 0] * sym[3] + quatComps[0, 3] * sym[0] -
-                               quatComps[0, 1] * sym[2] + quatComps[0, 2] * sym[1])
-
-            # swap into positve hemisphere if required
-            quatComps[i, :, quatComps[i, 0] < 0] *= -1
-
-        # Arrays to store neigbour misorientation in positive x and y direction
-        misOrix = np.zeros((numSyms, self.yDim, self.xDim))
-        misOriy = np.zeros((numSyms, self.yDim, self.xDim))
-
-        # loop over symmetries calculating misorientation to initial
-        for i in range(numSyms):
-            for j in range(self.xDim - 1):
-                misOrix[i, :, j] = abs(np.einsum("ij,ij->j", quatComps[0, :, :, j], quatComps[i, :, :, j + 1]))
-
-            for j in range(self.yDim - 1):
-                misOriy[i, j, :] = abs(np.einsum("ij,ij->j", quatComps[0, :, j, :], quatComps[i, :, j + 1, :]))
-
-        misOrix[misOrix > 1] = 1
-        misOriy[misOriy > 1] = 1
-
-        # find min misorientation (max here as misorientaion is cos of this)
-        argmisOrix = np.argmax(misOrix, axis=0)
-        argmisOriy = np.argmax(misOriy, axis=0)
-        misOrix = np.max(misOrix, axis=0)
-        misOriy = np.max(misOriy, axis=0)
-
-        # convert to misorientation in degrees
-        misOrix = 360 * np.arccos(misOrix) / np.pi
-        misOriy = 360 * np.arccos(misOriy) / np.pi
+        symGroup = self.primaryPhase.crystalStructure.name
 
-        # calculate relative elastic distortion tensors at each point in the two directions
+        # calculate relative elastic distortion tensors at each point
+        # in the two directions
         betaderx = np.zeros((3, 3, self.yDim, self.xDim))
-        betadery = betaderx
-        for i in range(self.xDim - 1):
-            for j in range(self.yDim - 1):
-                q0x = Quat(quatComps[0, 0, j, i], quatComps[0, 1, j, i],
-                           quatComps[0, 2, j, i], quatComps[0, 3, j, i])
-                qix = Quat(quatComps[argmisOrix[j, i], 0, j, i + 1],
-                           quatComps[argmisOrix[j, i], 1, j, i + 1],
-                           quatComps[argmisOrix[j, i], 2, j, i + 1],
-                           quatComps[argmisOrix[j, i], 3, j, i + 1])
-                misoquatx = qix.conjugate * q0x
-                # change stepsize to meters
-                betaderx[:, :, j, i] = (Quat.rotMatrix(misoquatx) - np.eye(3)) / self.stepSize / 1e-6
-                q0y = Quat(quatComps[0, 0, j, i], quatComps[0, 1, j, i],
-                           quatComps[0, 2, j, i], quatComps[0, 3, j, i])
-                qiy = Quat(quatComps[argmisOriy[j, i], 0, j + 1, i],
-                           quatComps[argmisOriy[j, i], 1, j + 1, i],
-                           quatComps[argmisOriy[j, i], 2, j + 1, i],
-                           quatComps[argmisOriy[j, i], 3, j + 1, i])
-                misoquaty = qiy.conjugate * q0y
-                # change stepsize to meters
-                betadery[:, :, j, i] = (Quat.rotMatrix(misoquaty) - np.eye(3)) / self.stepSize / 1e-6
+        betadery = np.zeros((3, 3, self.yDim, self.xDim))
+        for rows, _, _ in mapBlocks((self.yDim, self.xDim), blockSize):
+            # include one extra row for neighbours in y direction
+            quats = self.quatArray[rows.start:rows.stop + 1]
+            numRows = rows.stop - rows.start
+
+            betaderx[:, :, rows, :-1] = Map._calcBetaDer(
+                quats[:numRows, :-1], quats[:numRows, 1:], symGroup,
+                self.stepSize
+            )
+            if quats.shape[0] > 1:
+                betadery[:, :, rows.start:rows.start + quats.shape[0] - 1] = \
+                    Map._calcBetaDer(quats[:-1], quats[1:], symGroup,
+                                     self.stepSize)
+
+            yield rows.stop / self.yDim
 
         # Calculate the Nye Tensor
         alpha = np.empty((3, 3, self.yDim, self.xDim))
@@ -588,6 +675,36 @@ class Map(base.Map):
 
         yield 1.
 
+    @staticmethod
+    def _calcBetaDer(quats, quatsNeighbour, symGroup, stepSize):
+        """Calculate the relative elastic distortion between points and
+        their neighbours, using the symmetric equivalent of the
+        neighbour with minimum misorientation.
+
+        Parameters
+        ----------
+        quats : defdap.quat.QuatArray
+            Orientations at the points.
+        quatsNeighbour : defdap.quat.QuatArray
+            Orientations at the neighbouring points.
+        symGroup : str
+            Crystal type (cubic, hexagonal).
+        stepSize : float
+            Step size between points in micron.
+
+        Returns
+        -------
+        numpy.ndarray
+            Distortion tensor per metre, shape (3, 3, n, ..., m).
+
+        """
+        _, quatsSym = quats.misOri(quatsNeighbour, symGroup, returnQuat=2)
+        misOriQuats = quatsSym.conjugate * quats
+        identity = np.eye(3).reshape((3, 3) + (1,) * len(quats.shape))
+
+        # change stepsize to meters
+        return (misOriQuats.rotMatrix() - identity) / stepSize / 1e-6
+
     def plotGNDMap(self, **kwargs):
         """Plots a map of geometrically necessary dislocation (GND) density
 
@@ -628,167 +745,355 @@ class Map(base.Map):
         return True
 
     @reportProgress("building quaternion array")
-    def buildQuatArray(self, force = False):
+    def buildQuatArray(self, force=False, blockSize=None):
         """Build quaternion array
 
         Parameters
         ----------
         force, optional
             If true, re-build quaternion array
+        blockSize : int, optional
+            Maximum number of points to process at once, see
+            :func:`defdap.utils.mapBlocks`.
         """
         self.checkDataLoaded()
 
-        if force == False:
-            if self.quatArray is None:
-                # create the array of quat objects
-                self.quatArray = Quat.createManyQuats(self.eulerAngleArray)
-        if force == True:
-            self.quatArray = Quat.createManyQuats(self.eulerAngleArray)
+        if self.quatArray is None or force:
+            # create the array of quats
+            quatCoef = np.empty((4,) + self.eulerAngleArray.shape[1:])
+            for rows, _, _ in mapBlocks(quatCoef.shape[1:], blockSize):
+                quatCoef[:, rows] = QuatArray.fromEulerAngles(
+                    self.eulerAngleArray[:, rows]
+                ).quatCoef
+
+                yield rows.stop / quatCoef.shape[1]
+
+            # already moved to northern hemisphere
+            self.quatArray = QuatArray(quatCoef, allow_southern=True)
 
         yield 1.
 
-    def filterData(self, misOriTol=5):
-        # Kuwahara filter
-        print("8 quadrants")
-        misOriTol *= np.pi / 180
-        misOriTol = np.cos(misOriTol / 2)
-
-        # store quat components in array
-        quatComps = np.empty((4,) + self.shape)
-        for idx in np.ndindex(self.shape):
-            quatComps[(slice(None),) + idx] = self.quatArray[idx].quatCoef
-
-        # misorientation in each quadrant surrounding a point
-        misOris = np.zeros((8,) + self.shape)
-
-        for i in range(2, self.shape[0] - 2):
-            for j in range(2, self.shape[1] - 2):
-
-                refQuat = quatComps[:, i, j]
-                quadrants = [
-                    quatComps[:, i - 2:i + 1, j - 2:j + 1],   # UL
-                    quatComps[:, i - 2:i + 1, j - 1:j + 2],   # UC
-                    quatComps[:, i - 2:i + 1, j:j + 3],       # UR
-                    quatComps[:, i - 1:i + 2, j:j + 3],       # MR
-                    quatComps[:, i:i + 3, j:j + 3],           # LR
-                    quatComps[:, i:i + 3, j - 1:j + 2],       # LC
-                    quatComps[:, i:i + 3, j - 2:j + 1],       # LL
-                    quatComps[:, i - 1:i + 2, j - 2:j + 1]    # ML
-                ]
-
-                for k, quats in enumerate(quadrants):
-                    misOrisQuad = np.abs(
-                        np.einsum("ijk,i->jk", quats, refQuat)
-                    )
-                    misOrisQuad = misOrisQuad[misOrisQuad > misOriTol]
-                    misOris[k, i, j] = misOrisQuad.mean()
-
-        minMisOriQuadrant = np.argmax(misOris, axis=0)
-        # minMisOris = np.max(misOris, axis=0)
-        # minMisOris[minMisOris > 1.] = 1.
-        # minMisOris = 2 * np.arccos(minMisOris)
-
-        quatCompsNew = np.copy(quatComps)
-
-        for i in range(2, self.shape[0] - 2):
-            for j in range(2, self.shape[1] - 2):
-                # if minMisOris[i, j] < misOriTol:
-                #     continue
-
-                refQuat = quatComps[:, i, j]
-                quadrants = [
-                    quatComps[:, i - 2:i + 1, j - 2:j + 1],   # UL
-                    quatComps[:, i - 2:i + 1, j - 1:j + 2],   # UC
-                    quatComps[:, i - 2:i + 1, j:j + 3],       # UR
-                    quatComps[:, i - 1:i + 2, j:j + 3],       # MR
-                    quatComps[:, i:i + 3, j:j + 3],           # LR
-                    quatComps[:, i:i + 3, j - 1:j + 2],       # LC
-                    quatComps[:, i:i + 3, j - 2:j + 1],       # LL
-                    quatComps[:, i - 1:i + 2, j - 2:j + 1]    # ML
-                ]
-                quats = quadrants[minMisOriQuadrant[i, j]]
-
-                misOrisQuad = np.abs(
-                    np.einsum("ijk,i->jk", quats, refQuat)
-                )
-                quats = quats[:, misOrisQuad > misOriTol]
+    @reportProgress("filtering orientation data")
+    def filterData(self, misOriTol=5, kernelSize=3, numIterations=1,
+                   useSymmetry=True, mask=None, blockSize=None):
+        """Filter the orientation data with a Kuwahara filter. For each
+        point, the 8 square windows of size `kernelSize` that have the
+        point at a corner or edge centre are considered and the point
+        is replaced by the average orientation of the window with the
+        lowest average misorientation to it. Only neighbours within
+        `misOriTol` of the point and of the same phase are used.
+        Non-indexed and masked points are not used and not changed.
+        The filtered orientations are stored in `quatArray`.
 
-                avOri = np.einsum("ij->i", quats)
-                # avOri /= np.sqrt(np.dot(avOri, avOri))
+        Parameters
+        ----------
+        misOriTol : float, optional
+            Neighbours with a misorientation greater than this (in
+            degrees) to the point are excluded.
+        kernelSize : int, optional
+            Size of the windows in pixels, at least 2.
+        numIterations : int, optional
+            Number of times to apply the filter.
+        useSymmetry : bool, optional
+            If True, neighbours are replaced by their symmetric
+            equivalent closest to the point, using the crystal symmetry
+            of each phase. Otherwise the quats are used as stored.
+        mask : numpy.ndarray(bool), optional
+            Map of points to exclude from filtering, shape (yDim, xDim).
+        blockSize : int, optional
+            Maximum number of points to process at once, see
+            :func:`defdap.utils.mapBlocks`.
+
+        Returns
+        -------
+        defdap.quat.QuatArray
+            Filtered orientations.
+
+        """
+        self.buildQuatArray()
+        kernelSize = int(kernelSize)
+        if kernelSize < 2:
+            raise ValueError("kernelSize must be 2 or greater.")
+
+        minDot = np.cos(misOriTol * np.pi / 360)
+        phaseArray = self.phaseArray
+        if mask is not None:
+            phaseArray = np.where(mask, 0, phaseArray)
+
+        for i in range(numIterations):
+            quatComps = self.quatArray.quatCoef
+            quatCompsNew = np.empty_like(quatComps)
+            for rows, haloRows, innerRows in mapBlocks(
+                    self.shape, blockSize, halo=kernelSize - 1):
+                quatCompsNew[:, rows] = Map._kuwaharaFilter(
+                    quatComps[:, haloRows], phaseArray[haloRows],
+                    self.phases, kernelSize, minDot, useSymmetry
+                )[:, innerRows]
+
+                yield (i + rows.stop / self.shape[0]) / numIterations
+
+            self.quatArray = QuatArray(quatCompsNew)
+
+        return self.quatArray
 
-                quatCompsNew[:, i, j] = avOri
+    @staticmethod
+    def _kuwaharaFilter(quatComps, phaseArray, phases, kernelSize, minDot,
+                        useSymmetry):
+        """Apply one pass of the Kuwahara filter to a map, see
+        :func:`filterData`. The sums for all windows are accumulated
+        one neighbour offset at a time over the whole map.
 
-        quatCompsNew /= np.sqrt(np.einsum("ijk,ijk->jk", quatCompsNew, quatCompsNew))
+        Parameters
+        ----------
+        quatComps : numpy.ndarray
+            Quat components of the map, shape (4, y, x).
+        phaseArray : numpy.ndarray
+            Phase ids of the map. 1-based, 0 is excluded points.
+        phases : list of defdap.crystal.Phase
+            List of phases.
+        kernelSize : int
+            Size of the windows.
+        minDot : float
+            Neighbours with misorientation (cosine of half angle) less
+            than this are excluded.
+        useSymmetry : bool
+            Use the symmetric equivalent of neighbours closest to each
+            point.
 
-        quatArrayNew = np.empty(self.shape, dtype=Quat)
+        Returns
+        -------
+        numpy.ndarray
+            Filtered quat components, shape (4, y, x).
 
-        for idx in np.ndindex(self.shape):
-            quatArrayNew[idx] = Quat(quatCompsNew[(slice(None),) + idx])
+        """
+        # start of the 8 windows relative to the point, excluding the
+        # window centred on it
+        starts = (1 - kernelSize, -(kernelSize // 2), 0)
+        windows = [(sy, sx) for sy in starts for sx in starts
+                   if (sy, sx) != (starts[1], starts[1])]
+
+        # sums of misorientation, number of neighbours and quats in
+        # each window, starting with the point itself
+        valid = phaseArray > 0
+        dotSum = np.repeat(valid[np.newaxis].astype(float), 8, axis=0)
+        count = dotSum.copy()
+        quatSum = np.repeat(np.where(valid, quatComps, 0)[np.newaxis], 8,
+                            axis=0)
+
+        # Offsets in one half of the kernel, each pair of points is
+        # visited once and added to both
+        n = kernelSize - 1
+        offsets = [(dy, dx) for dy in range(0, n + 1)
+                   for dx in range(-n, n + 1) if dy > 0 or dx > 0]
+
+        for dy, dx in offsets:
+            sl0, sl1 = Map._shiftSlices(dy, dx)
+            phases0 = phaseArray[sl0]
+            phases1 = phaseArray[sl1]
+            windows0 = [i for i, (sy, sx) in enumerate(windows)
+                        if sy <= dy <= sy + n and sx <= dx <= sx + n]
+            windows1 = [i for i, (sy, sx) in enumerate(windows)
+                        if sy <= -dy <= sy + n and sx <= -dx <= sx + n]
+            if not (windows0 or windows1):
+                continue
 
-        self.quatArray = quatArrayNew
+            for phaseID, phase in enumerate(phases, start=1):
+                valid = (phases0 == phaseID) & (phases1 == phaseID)
+                if not np.any(valid):
+                    continue
+                quats0 = quatComps[(slice(None),) + sl0][:, valid]
+                quats1 = quatComps[(slice(None),) + sl1][:, valid]
+
+                # equivalent of each neighbour closest to the point
+                if useSymmetry:
+                    symGroup = phase.crystalStructure.name
+                    symMatrices = Quat.symEqvMatrices(symGroup)
+                    dots, symIndex = Quat.calcMaxSymDot(
+                        quats0, quats1, symGroup, returnIndex=True
+                    )
+                    # inverse of each symmetry for the reverse pair
+                    invIndex = np.argmax(np.abs(np.einsum(
+                        "sij,tji->st", symMatrices, symMatrices)), axis=1)
+                    eqvs1 = np.einsum("nij,jn->in", symMatrices[symIndex],
+                                      quats1)
+                    eqvs0 = np.einsum("nij,jn->in",
+                                      symMatrices[invIndex[symIndex]], quats0)
+                else:
+                    dots = np.abs(np.einsum("ij,ij->j", quats0, quats1))
+                    eqvs1, eqvs0 = quats1, quats0
+                keep = np.minimum(dots, 1) >= minDot
+
+                dotsFull = np.zeros(phases0.shape)
+                dotsFull[valid] = np.where(keep, np.minimum(dots, 1), 0)
+                keepFull = np.zeros(phases0.shape)
+                keepFull[valid] = keep
+                for i, eqvs, refs, sl, windowIdxs in (
+                        (0, eqvs1, quats0, sl0, windows0),
+                        (1, eqvs0, quats1, sl1, windows1)):
+                    if not windowIdxs:
+                        continue
+                    # on the same side as the point
+                    eqvs = eqvs * np.where(
+                        np.einsum("ij,ij->j", eqvs, refs) < 0, -1, 1) * keep
+                    eqvsFull = np.zeros((4,) + phases0.shape)
+                    eqvsFull[:, valid] = eqvs
+                    for j in windowIdxs:
+                        dotSum[j][sl] += dotsFull
+                        count[j][sl] += keepFull
+                        quatSum[j][(slice(None),) + sl] += eqvsFull
+
+        # window with lowest average misorientation
+        with np.errstate(divide='ignore', invalid='ignore'):
+            bestWindow = np.argmax(np.nan_to_num(dotSum / count), axis=0)
+        quatCompsNew = np.take_along_axis(
+            quatSum, bestWindow[np.newaxis, np.newaxis], axis=0)[0]
+
+        valid = phaseArray > 0
+        quatCompsNew[:, valid] /= np.sqrt(np.sum(quatCompsNew[:, valid]**2,
+                                                 axis=0))
+        quatCompsNew[:, ~valid] = quatComps[:, ~valid]
+
+        return quatCompsNew
+
+    @reportProgress("filling non-indexed points")
+    def fillNonIndexed(self, minNeighbours=4, maxMad=None,
+                       maxIterations=None):
+        """Fill non-indexed points from their neighbours, to clean a map
+        before finding boundaries and grains. In each iteration, a
+        non-indexed point with at least `minNeighbours` of its 8
+        neighbours in the same phase is given that phase and the
+        average orientation of those neighbours. All points are updated
+        together from the result of the previous iteration, until no
+        more points can be filled. Points changed are recorded in
+        `filledPoints`.
 
-        return quats
+        Parameters
+        ----------
+        minNeighbours : int, optional
+            Minimum number of neighbours of the most common phase
+            needed to fill a point, from 1 to 8.
+        maxMad : float, optional
+            Points with a mean angular deviation greater than this are
+            treated as non-indexed and refilled.
+        maxIterations : int, optional
+            Maximum number of iterations. Runs until no more points
+            can be filled if None.
+
+        """
+        self.buildQuatArray()
+        if not 1 <= minNeighbours <= 8:
+            raise ValueError("minNeighbours must be between 1 and 8.")
+
+        phaseArray = self.phaseArray.copy()
+        quatComps = self.quatArray.quatCoef.copy()
+        if maxMad is not None:
+            phaseArray[self.meanAngularDeviationArray > maxMad] = 0
+        filledPoints = phaseArray != self.phaseArray
+        numToFill = max(np.count_nonzero(phaseArray == 0), 1)
+
+        neighbourOffsets = [(dy, dx) for dy in (-1, 0, 1) for dx in (-1, 0, 1)
+                            if dy or dx]
+        iteration = 0
+        while maxIterations is None or iteration < maxIterations:
+            iteration += 1
+
+            # phase and quat of the 8 neighbours of each point, points
+            # outside the map are non-indexed
+            phasePad = np.pad(phaseArray, 1)
+            quatPad = np.pad(quatComps, ((0, 0), (1, 1), (1, 1)))
+            neighbourPhases = np.stack([
+                phasePad[1 + dy:1 + dy + self.yDim, 1 + dx:1 + dx + self.xDim]
+                for dy, dx in neighbourOffsets
+            ])
+
+            # most common phase of neighbours
+            phaseCounts = np.stack([
+                np.count_nonzero(neighbourPhases == phaseID, axis=0)
+                for phaseID in range(1, self.numPhases + 1)
+            ])
+            majorityPhase = np.argmax(phaseCounts, axis=0) + 1
+            toFill = (phaseArray == 0) & (np.max(phaseCounts, axis=0) >=
+                                          minNeighbours)
+            if not np.any(toFill):
+                break
+            ys, xs = np.nonzero(toFill)
+
+            for phaseID, phase in enumerate(self.phases, start=1):
+                isPhase = majorityPhase[ys, xs] == phaseID
+                if not np.any(isPhase):
+                    continue
+                pointYs, pointXs = ys[isPhase], xs[isPhase]
+
+                # neighbours of the phase, grouped by point
+                neighbourQuats = np.stack([
+                    quatPad[:, 1 + dy + pointYs, 1 + dx + pointXs]
+                    for dy, dx in neighbourOffsets
+                ], axis=2)
+                isNeighbour = (neighbourPhases[:, pointYs, pointXs].T ==
+                               phaseID)
+                groupOffsets = np.concatenate(
+                    ([0], np.cumsum(np.count_nonzero(isNeighbour, axis=1)))
+                )
+                quatComps[:, pointYs, pointXs] = Quat.calcAverageOris(
+                    neighbourQuats[:, isNeighbour],
+                    phase.crystalStructure.name, groupOffsets
+                ).quatCoef
+                phaseArray[pointYs, pointXs] = phaseID
+
+            filledPoints |= toFill
+
+            yield 1 - np.count_nonzero(phaseArray == 0) / numToFill
+
+        self.phaseArray = phaseArray
+        self.quatArray = QuatArray(quatComps)
+        isFilled = filledPoints & (phaseArray > 0)
+        self.eulerAngleArray = self.eulerAngleArray.copy()
+        self.eulerAngleArray[:, isFilled] = QuatArray(
+            quatComps[:, isFilled]).eulerAngles()
+        self.filledPoints = filledPoints
+
+        yield 1.
 
     @reportProgress("finding grain boundaries")
-    def findBoundaries(self, boundDef=10):
+    def findBoundaries(self, boundDef=10, blockSize=None):
         """Find grain and phase boundaries
 
         Parameters
         ----------
         boundDef : float
             Critical misorientation.
+        blockSize : int, optional
+            Maximum number of points to process at once, see
+            :func:`defdap.utils.mapBlocks`.
 
         """
         # TODO: what happens with non-indexed points
         # TODO: grain boundaries should be calculated per crystal structure
-        syms = self.primaryPhase.crystalStructure.symmetries
-        numSyms = len(syms)
-
-        # array to store quat components of initial and symmetric equivalents
-        quatComps = np.empty((numSyms, 4, self.yDim, self.xDim))
-
-        # populate with initial quat components
-        for i, row in enumerate(self.quatArray):
-            for j, quat in enumerate(row):
-                quatComps[0, :, i, j] = quat.quatCoef
-
-        # loop of over symmetries and apply to initial quat components
-        # (excluding first symmetry as this is the identity transformation)
-        for i, sym in enumerate(syms[1:], start=1):
-            # sym[i] * quat for all points (* is quaternion product)
-            quatComps[i, 0] = (quatComps[0, 0] * sym[0] - quatComps[0, 1] * sym[1] -
-                               quatComps[0, 2] * sym[2] - quatComps[0, 3] * sym[3])
-            quatComps[i, 1] = (quatComps[0, 0] * sym[1] + quatComps[0, 1] * sym[0] -
-                               quatComps[0, 2] * sym[3] + quatComps[0, 3] * sym[2])
-            quatComps[i, 2] = (quatComps[0, 0] * sym[2] + quatComps[0, 2] * sym[0] -
-                               quatComps[0, 3] * sym[1] + quatComps[0, 1] * sym[3])
-            quatComps[i, 3] = (quatComps[0, 0] * sym[3] + quatComps[0, 3] * sym[0] -
-                               quatComps[0, 1] * sym[2] + quatComps[0, 2] * sym[1])
-
-            # swap into positive hemisphere if required
-            quatComps[i, :, quatComps[i, 0] < 0] *= -1
+        symGroup = self.primaryPhase.crystalStructure.name
 
         # Arrays to store neighbour misorientation in positive x and y
         # directions
-        misOriX = np.ones((numSyms, self.yDim, self.xDim))
-        misOriY = np.ones((numSyms, self.yDim, self.xDim))
-
-        # loop over symmetries calculating misorientation to initial
-        for i in range(numSyms):
-            for j in range(self.xDim - 1):
-                misOriX[i, :, j] = abs(
-                    np.einsum("ij,ij->j", quatComps[0, :, :, j], quatComps[i, :, :, j + 1]))
-
-            for j in range(self.yDim - 1):
-                misOriY[i, j, :] = abs(np.einsum("ij,ij->j", quatComps[0, :, j, :], quatComps[i, :, j + 1, :]))
+        misOriX = np.ones((self.yDim, self.xDim))
+        misOriY = np.ones((self.yDim, self.xDim))
+
+        # min misorientation over symmetries to neighbour (max here as
+        # misorientation is cos of this)
+        for rows, _, _ in mapBlocks((self.yDim, self.xDim), blockSize):
+            # include one extra row for neighbours in y direction
+            quatComps = self.quatArray.quatCoef[:, rows.start:rows.stop + 1]
+            numRows = rows.stop - rows.start
+
+            misOriX[rows, :-1] = Quat.calcMaxSymDot(
+                quatComps[:, :numRows, :-1], quatComps[:, :numRows, 1:],
+                symGroup
+            )
+            misOriY[rows.start:rows.start + quatComps.shape[1] - 1] = \
+                Quat.calcMaxSymDot(quatComps[:, :-1], quatComps[:, 1:],
+                                   symGroup)
 
         misOriX[misOriX > 1] = 1
         misOriY[misOriY > 1] = 1
 
-        # find min misorientation (max here as misorientaion is cos of this)
-        misOriX = np.max(misOriX, axis=0)
-        misOriY = np.max(misOriY, axis=0)
-
         # convert to misorientation in degrees
         misOriX = 2 * np.arccos(misOriX) * 180 / np.pi
         misOriY = 2 * np.arccos(misOriY) * 180 / np.pi
@@ -861,50 +1166,209 @@ class Map(base.Map):
 
     @reportProgress("constructing neighbour network")
     def buildNeighbourNetwork(self):
+        """Construct the network of neighbouring grains, with the
+        boundary segment between each pair of grains stored on the edges
+        as `boundary`.
+
+        """
+        grains = self.grains
+        numGrains = len(self.grainList)
+
+        # boundary points (x, y) and grain IDs either side of them for
+        # horizontal (X) and vertical (Y) boundaries
+        points, grainIDs, neiGrainIDs, kinds = [], [], [], []
+        for i, boundaries in enumerate((self.boundariesX, self.boundariesY)):
+            # exclude boundary pixels of map
+            boundaries = np.copy(boundaries)
+            boundaries[[0, -1], :] = False
+            boundaries[:, [0, -1]] = False
+            yLocs, xLocs = np.nonzero(boundaries)
+
+            # minus 1 on all as the grain image starts labeling at 1
+            grainID = grains[yLocs, xLocs] - 1
+            neiGrainID = grains[yLocs + i, xLocs - i + 1] - 1
+
+            # ignore if neighbour is same as grain or if not a grain
+            # (boundary points -1 and points in small grains -2)
+            keep = (grainID != neiGrainID) & (grainID >= 0) & (neiGrainID >= 0)
+            points.append(np.column_stack((xLocs[keep], yLocs[keep])))
+            grainIDs.append(grainID[keep])
+            neiGrainIDs.append(neiGrainID[keep])
+            kinds.append(np.full(np.count_nonzero(keep), i))
+        points = np.concatenate(points)
+        grainIDs = np.concatenate(grainIDs)
+        neiGrainIDs = np.concatenate(neiGrainIDs)
+        kinds = np.concatenate(kinds)
+        yield 0.5
+
+        # group boundary points by pair of grains, keeping x points
+        # before y points and each in map order
+        pairKeys = (np.minimum(grainIDs, neiGrainIDs) * numGrains +
+                    np.maximum(grainIDs, neiGrainIDs))
+        order = np.argsort(pairKeys, kind='stable')
+        _, starts = np.unique(pairKeys[order], return_index=True)
+        ends = np.append(starts[1:], len(order))
+        # the grain owning the first point of a pair is grain1 of the
+        # boundary segment. Create segments in order of first point
+        firstPoints = order[starts]
+        segmentOrder = np.argsort(firstPoints)
+
+        edges = []
+        for start, end in zip(starts[segmentOrder], ends[segmentOrder]):
+            pointIdxs = order[start:end]
+            grain = self.grainList[grainIDs[pointIdxs[0]]]
+            neiGrain = self.grainList[neiGrainIDs[pointIdxs[0]]]
+            owners = grainIDs[pointIdxs] == grain.grainID
+            isX = kinds[pointIdxs] == 0
+
+            bSeg = BoundarySegment(self, grain, neiGrain)
+            bSeg.boundaryPointsX = points[pointIdxs[isX]]
+            bSeg.boundaryPointsY = points[pointIdxs[~isX]]
+            bSeg.boundaryPointOwnersX = owners[isX]
+            bSeg.boundaryPointOwnersY = owners[~isX]
+            edges.append((grain, neiGrain, {'boundary': bSeg}))
+
         # create network
         nn = nx.Graph()
         nn.add_nodes_from(self.grainList)
+        nn.add_edges_from(edges)
 
-        for i, boundaries in enumerate((self.boundariesX, self.boundariesY)):
-            yLocs, xLocs = np.nonzero(boundaries)
-            totalPoints = len(xLocs)
+        self.neighbourNetwork = nn
 
-            for iPoint, (x, y) in enumerate(zip(xLocs, yLocs)):
-                # report progress, assumes roughly equal number of x and
-                # y boundary points
-                yield 0.5 * (i + iPoint / totalPoints)
+    @reportProgress("building boundary table")
+    def buildBoundaryTable(self, twinTol=5.):
+        """Build a table of the boundaries between neighbouring grains.
+        Misorientations of all boundaries are calculated together from
+        the average orientations of the grains. Boundaries are
+        classified as CSL boundaries with the Brandon criterion and as
+        twin boundaries if within a tolerance of the twin
+        misorientation ({10-12} twin for hexagonal). The neighbour
+        network and grain average orientations are calculated if
+        needed.
 
-                if (x == 0 or y == 0 or x == self.grains.shape[1] - 1 or
-                        y == self.grains.shape[0] - 1):
-                    # exclude boundary pixels of map
-                    continue
+        Parameters
+        ----------
+        twinTol : float, optional
+            Maximum deviation from the twin misorientation, in degrees.
+
+        Notes
+        -----
+        The table is stored in `boundaryTable` and has a row per
+        boundary segment with columns:
+        grain1, grain2: IDs of the grains either side of the boundary.
+        pointsX, pointsY: boundary points (x, y) of horizontal and
+        vertical boundaries, see :class:`defdap.ebsd.BoundarySegment`.
+        length: length of the boundary in microns.
+        misOri: misorientation angle in degrees.
+        axisX, axisY, axisZ: misorientation axis in the crystal frame
+        of grain1.
+        sigma: sigma value of the CSL boundary, 1 for low angle
+        boundaries and 0 if not a CSL boundary.
+        twin: True for twin boundaries.
+
+        """
+        if self.neighbourNetwork is None:
+            self.buildNeighbourNetwork()
+        if any(grain.refOri is None for grain in self):
+            self.calcGrainAvOris()
+        yield 0.1
+
+        bSegs = [bSeg for _, _, bSeg in
+                 self.neighbourNetwork.edges(data='boundary')]
+        refOris = np.array([grain.refOri.quatCoef for grain in self]).T
+        grainIDs1 = np.array([bSeg.grain1.grainID for bSeg in bSegs],
+                             dtype=int)
+        grainIDs2 = np.array([bSeg.grain2.grainID for bSeg in bSegs],
+                             dtype=int)
+
+        # misorientation of all boundaries at once
+        quats1 = QuatArray(refOris[:, grainIDs1])
+        misOri, minQuatSym = quats1.misOri(
+            QuatArray(refOris[:, grainIDs2]), self.crystalSym, returnQuat=2
+        )
+        misOriAxis = quats1.misOriAxis(minQuatSym)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            misOriAxis /= np.sqrt(np.sum(misOriAxis**2, axis=0))
+        misOri = 2 * np.arccos(np.clip(misOri, -1, 1)) * 180 / np.pi
+        # misorientations in the crystal frame
+        misOriQuats = (minQuatSym * quats1.conjugate).quatCoef
+        yield 0.5
+
+        # CSL boundaries with the Brandon criterion, keep lowest sigma
+        sigma = np.where(misOri <= 15., 1, 0)
+        for cslSigma, axis, angle in cslBoundaries[self.crystalSym][::-1]:
+            deviation = Map._calcDeviation(
+                misOriQuats, Quat.fromAxisAngle(axis, angle * np.pi / 180),
+                self.crystalSym
+            )
+            isCsl = (sigma != 1) & (deviation <= 15. / np.sqrt(cslSigma))
+            sigma[isCsl] = cslSigma
 
-                grainID = self.grains[y, x] - 1
-                neiGrainID = self.grains[y + i, x - i + 1] - 1
+        # twin boundaries
+        if self.crystalSym == 'cubic':
+            twinQuat = Quat.fromAxisAngle((1, 1, 1), np.pi / 3)
+        else:
+            aAxis = CrystalStructure.lMatrix(
+                *self.primaryPhase.latticeParams
+            )[:, 0]
+            twinQuat = Quat.fromAxisAngle(
+                aAxis, 2 * np.arctan(self.cOverA / np.sqrt(3))
+            )
+        twin = Map._calcDeviation(misOriQuats, twinQuat,
+                                  self.crystalSym) <= twinTol
+
+        self.boundaryTable = pd.DataFrame({
+            'grain1': grainIDs1,
+            'grain2': grainIDs2,
+            'pointsX': [bSeg.boundaryPointsX for bSeg in bSegs],
+            'pointsY': [bSeg.boundaryPointsY for bSeg in bSegs],
+            'length': np.array([len(bSeg) for bSeg in bSegs],
+                               dtype=float) * self.stepSize,
+            'misOri': misOri,
+            'axisX': misOriAxis[0],
+            'axisY': misOriAxis[1],
+            'axisZ': misOriAxis[2],
+            'sigma': sigma,
+            'twin': twin,
+        })
 
-                if neiGrainID == grainID:
-                    # ignore if neighbour is same as grain
-                    continue
-                if neiGrainID < 0 or grainID < 0:
-                    # ignore if not a grain (boundary points -1 and
-                    # points in small grains -2)
-                    continue
+        yield 1.
 
-                grain = self[grainID]
-                neiGrain = self[neiGrainID]
+    @staticmethod
+    def _calcDeviation(misOriQuats, refQuat, symGroup):
+        """Calculate angle between misorientations and the closest
+        symmetrically equivalent variant of a reference misorientation.
 
-                try:
-                    # look up boundary segment if it exists
-                    bSeg = nn[grain][neiGrain]['boundary']
-                except KeyError:
-                    # neighbour relation doesn't exist so add it
-                    bSeg = BoundarySegment(self, grain, neiGrain)
-                    nn.add_edge(grain, neiGrain, boundary=bSeg)
+        Parameters
+        ----------
+        misOriQuats : numpy.ndarray
+            Quat components of misorientations, shape (4, n).
+        refQuat : defdap.quat.Quat
+            Reference misorientation.
+        symGroup : str
+            Crystal type (cubic, hexagonal).
 
-                # add the boundary point
-                bSeg.addBoundaryPoint((x, y), i, grain)
+        Returns
+        -------
+        numpy.ndarray
+            Deviation angle in degrees, shape (n,).
 
-        self.neighbourNetwork = nn
+        """
+        # all variants of the reference, sym2 * ref * sym1, without
+        # duplicates (q and -q are the same rotation)
+        symComps = np.array([sym.quatCoef for sym in Quat.symEqv(symGroup)])
+        variants = np.einsum('sij,jt->sti', Quat.symEqvMatrices(symGroup),
+                             (refQuat * QuatArray(symComps.T)).quatCoef)
+        variants = variants.reshape((-1, 4))
+        variants[variants[:, 0] < 0] *= -1
+        variants = np.unique(np.round(variants, 10), axis=0)
+
+        maxDot = np.zeros(misOriQuats.shape[1:])
+        for i in range(0, len(variants), 64):
+            np.maximum(maxDot, np.abs(variants[i:i + 64] @ misOriQuats).max(
+                axis=0), out=maxDot)
+
+        return 2 * np.arccos(np.clip(maxDot, -1, 1)) * 180 / np.pi
 
     @reportProgress("finding phase boundaries")
 
@@ -974,51 +1438,25 @@ class Map(base.Map):
 
         """
         # TODO: grains need to be assigned a phase
-        # Initialise the grain map
-        # TODO: Look at grain map compared to boundary map
-        # self.grains = np.copy(self.boundaries)
-        self.grains = np.zeros_like(self.boundaries)
+        # Label connected regions of indexed points not separated by a
+        # boundary
+        self.grains = Map.labelGrains(
+            self.boundariesX, self.boundariesY, self.phaseArray != 0,
+            minGrainSize=minGrainSize
+        )
+        self.buildGrainIndex()
+        self.boundaryTable = None
+        self.misOri = None
+        self.misOriAxis = None
 
         self.grainList = []
-
-        # List of points where no grain has be set yet
-        points_left = self.phaseArray != 0
-        total_points = points_left.sum()
-        found_point = 0
-        next_point = points_left.tobytes().find(b'\x01')
-
-        # Start counter for grains
-        grainIndex = 1
-
-        # Loop until all points (except boundaries) have been assigned
-        # to a grain or ignored
-        i = 0
-        while found_point >= 0:
-            # Flood fill first unknown point and return grain object
-            idx = np.unravel_index(next_point, self.grains.shape)
-            currentGrain = self.floodFill(idx[1], idx[0], grainIndex,
-                                          points_left)
-
-            if len(currentGrain) < minGrainSize:
-                # if grain size less than minimum, ignore grain and set
-                # values in grain map to -2
-                for coord in currentGrain.coordList:
-                    self.grains[coord[1], coord[0]] = -2
-            else:
-                # add grain to list and increment grain index
-                self.grainList.append(currentGrain)
-                grainIndex += 1
-
-            # find next search point
-            points_left_sub = points_left.reshape(-1)[next_point + 1:]
-            found_point = points_left_sub.tobytes().find(b'\x01')
-            next_point += found_point + 1
+        numGrains = len(self.grainOffsets) - 1
+        for i in range(numGrains):
+            self.grainList.append(Grain(i, self))
 
             # report progress
-            i += 1
-            if i == defaults['find_grain_report_freq']:
-                yield 1. - points_left_sub.sum() / total_points
-                i = 0
+            if i % defaults['find_grain_report_freq'] == 0:
+                yield i / numGrains
 
         # Assign phase to each grain
         for grain in self:
@@ -1035,6 +1473,71 @@ class Map(base.Map):
             grain.phaseID = phaseID
             grain.phase = self.phases[phaseID]
 
+    @staticmethod
+    def labelGrains(boundariesX, boundariesY, mask=None, minGrainSize=0):
+        """Label regions of a map that are connected without crossing a
+        boundary. Points are connected to their 4 nearest neighbours.
+        Regions are numbered in order of their first point (in row
+        major order), giving the same IDs as flood filling from each
+        unassigned point in turn.
+
+        Parameters
+        ----------
+        boundariesX : numpy.ndarray
+            Boundaries between each point and the point to the right.
+        boundariesY : numpy.ndarray
+            Boundaries between each point and the point below.
+        mask : numpy.ndarray, optional
+            Points to label, all points are labelled if None.
+        minGrainSize : int, optional
+            Minimum region area in pixels.
+
+        Returns
+        -------
+        numpy.ndarray
+            Map of region labels. Labels start at 1, regions that are
+            smaller than the minimum size are given value -2 and points
+            outside the mask are 0.
+
+        """
+        shape = boundariesX.shape
+        numPoints = boundariesX.size
+        if mask is None:
+            mask = np.ones(shape, dtype=bool)
+
+        # Connections between neighbouring points in the positive x and
+        # y directions that do not cross a boundary
+        connX = np.zeros(shape, dtype=bool)
+        connX[:, :-1] = ~boundariesX[:, :-1] & mask[:, :-1] & mask[:, 1:]
+        connY = np.zeros(shape, dtype=bool)
+        connY[:-1] = ~boundariesY[:-1] & mask[:-1] & mask[1:]
+
+        startX = np.flatnonzero(connX)
+        startY = np.flatnonzero(connY)
+        graph = sparse.coo_matrix(
+            (np.ones(len(startX) + len(startY), dtype=bool),
+             (np.concatenate((startX, startY)),
+              np.concatenate((startX + 1, startY + shape[1])))),
+            shape=(numPoints, numPoints)
+        )
+        _, labels = csgraph.connected_components(graph, directed=False)
+
+        # Order regions by their first point and remove small regions
+        maskFlat = mask.reshape(-1)
+        regions, firstPoints, regionSizes = np.unique(
+            labels[maskFlat], return_index=True, return_counts=True
+        )
+        order = np.argsort(firstPoints)
+        keep = regionSizes[order] >= minGrainSize
+
+        lookup = np.zeros(labels.max() + 1 if numPoints else 0, dtype=int)
+        lookup[regions[order]] = np.where(keep, np.cumsum(keep), -2)
+
+        grains = np.zeros(numPoints, dtype=int)
+        grains[maskFlat] = lookup[labels[maskFlat]]
+
+        return grains.reshape(shape)
+
     def plotGrainMap(self, **kwargs):
         """Plot a map with grains coloured.
 
@@ -1060,8 +1563,9 @@ class Map(base.Map):
 
     def floodFill(self, x, y, grainIndex, points_left):
         """Flood fill algorithm that uses the x and y boundary arrays to
-        fill a connected area around the seed point. The points are inserted
-        into a grain object and the grain map array is updated.
+        fill a connected area around the seed point. The grain map array
+        is updated with the grain index. Used for filling individual
+        grains, :func:`findGrains` labels all grains at once.
 
         Parameters
         ----------
@@ -1076,20 +1580,17 @@ class Map(base.Map):
 
         Returns
         -------
-        currentGrain : defdap.ebsd.Grain
-            New grain object with points added
+        numpy.ndarray
+            Coordinates (x, y) of the filled points, shape (n, 2).
         """
-        # create new grain
-        currentGrain = Grain(grainIndex - 1, self)
-
         # add first point to the grain
-        currentGrain.addPoint((x, y), self.quatArray[y, x])
+        filledPoints = [(x, y)]
         self.grains[y, x] = grainIndex
         points_left[y, x] = False
-        edge = [(x, y)]
+        edge = deque([(x, y)])
 
         while edge:
-            x, y = edge.pop(0)
+            x, y = edge.popleft()
 
             moves = [(x+1, y), (x-1, y), (x, y+1), (x, y-1)]
             # get rid of any that go out of the map area
@@ -1126,47 +1627,110 @@ class Map(base.Map):
                         addPoint = not self.boundariesY[t, s]
 
                 if addPoint:
-                    currentGrain.addPoint((s, t), self.quatArray[t, s])
+                    filledPoints.append((s, t))
                     self.grains[t, s] = grainIndex
                     points_left[t, s] = False
                     edge.append((s, t))
 
-        return currentGrain
+        return np.array(filledPoints)
 
     @reportProgress("calculating grain mean orientations")
-    def calcGrainAvOris(self):
-        """Calculate the average orientation of grains.
+    def calcGrainAvOris(self, numRefine=1, method='mean'):
+        """Calculate the average orientation of grains. All grains are
+        averaged at once using the grain index, see
+        :func:`defdap.quat.Quat.calcAverageOris`.
+
+        Parameters
+        ----------
+        numRefine : int
+            Number of refinement passes.
+        method : str
+            Averaging method, 'mean' or 'markley'.
 
         """
         # Check that grains have been detected in the map
         self.checkGrainsDetected()
 
+        quatComps = self.quatArray.quatCoef.reshape((4, -1))
+        avOris = Quat.calcAverageOris(
+            quatComps[:, self.grainPointIdxs], self.crystalSym,
+            groupOffsets=self.grainOffsets, numRefine=numRefine,
+            method=method
+        )
+
         numGrains = len(self)
         for iGrain, grain in enumerate(self):
-            grain.calcAverageOri()
+            grain.refOri = avOris[iGrain]
 
             # report progress
             yield (iGrain + 1) / numGrains
 
     @reportProgress("calculating grain misorientations")
-    def calcGrainMisOri(self, calcAxis=False):
-        """Calculate the misorientation within grains.
+    def calcGrainMisOri(self, calcAxis=False, grainIds=-1):
+        """Calculate the misorientation of each point to the reference
+        orientation of its grain (GROD). All points of the selected
+        grains are calculated at once and stored in the `misOri` and
+        `misOriAxis` map arrays, points not calculated are NaN. Grains
+        without a reference orientation are averaged first.
 
         Parameters
         ----------
         calcAxis : bool
             Calculate the misorientation axis if True.
+        grainIds : list of int or int, optional
+            IDs of grains to calculate for. Use -1 for all grains in
+            the map.
 
         """
         # Check that grains have been detected in the map
         self.checkGrainsDetected()
 
-        numGrains = len(self)
-        for iGrain, grain in enumerate(self):
-            grain.buildMisOriList(calcAxis=calcAxis)
+        if np.ndim(grainIds) == 0:
+            grainIds = range(len(self)) if grainIds == -1 else [grainIds]
+        grainIds = np.asarray(grainIds, dtype=int)
+        if len(grainIds) == 0:
+            return
+        quatComps = self.quatArray.quatCoef.reshape((4, -1))
+
+        noRefOriIds = grainIds[[self[i].refOri is None for i in grainIds]]
+        if len(noRefOriIds) > 0:
+            pointIdxs, groupOffsets = self.grainsPointIdxs(noRefOriIds)
+            avOris = Quat.calcAverageOris(quatComps[:, pointIdxs],
+                                          self.crystalSym, groupOffsets)
+            for grainId, avOri in zip(noRefOriIds, avOris):
+                self[grainId].refOri = avOri
+        yield 0.2
+
+        pointIdxs, groupOffsets = self.grainsPointIdxs(grainIds)
+        refOris = QuatArray(np.repeat(
+            np.array([self[i].refOri.quatCoef for i in grainIds]).T,
+            np.diff(groupOffsets), axis=1
+        ))
+        misOri, minQuatSym = refOris.misOri(
+            QuatArray(quatComps[:, pointIdxs], allow_southern=True),
+            self.crystalSym, returnQuat=2
+        )
+        misOri = np.minimum(misOri, 1)
 
-            # report progress
-            yield (iGrain + 1) / numGrains
+        if self.misOri is None:
+            self.misOri = np.full(self.shape, np.nan)
+        self.misOri.flat[pointIdxs] = misOri
+        yield 0.6
+
+        if calcAxis:
+            misOriAxis = refOris.misOriAxis(minQuatSym)
+            misOriAxis[:, misOri == 1] = 0
+
+            if self.misOriAxis is None:
+                self.misOriAxis = np.full((3,) + self.shape, np.nan)
+            self.misOriAxis.reshape((3, -1))[:, pointIdxs] = misOriAxis
+
+        averageMisOris = (np.add.reduceat(misOri, groupOffsets[:-1]) /
+                          np.diff(groupOffsets))
+        for grainId, averageMisOri in zip(grainIds, averageMisOris):
+            self[grainId].averageMisOri = averageMisOri
+
+        yield 1.
 
     def plotMisOriMap(self, component=0, **kwargs):
         """Plot misorientation map.
@@ -1186,30 +1750,26 @@ class Map(base.Map):
         # Check that grains have been detected in the map
         self.checkGrainsDetected()
 
-        self.misOri = np.ones([self.yDim, self.xDim])
-
         if component in [1, 2, 3]:
             # Calculate misorientation axis if not calculated
-            if np.any([grain.misOriAxisList is None for grain in self.grainList]):
-                self.calcGrainMisOri(calcAxis = True)
-            for grain in self.grainList:
-                for coord, misOriAxis in zip(grain.coordList, np.array(grain.misOriAxisList)):
-                    self.misOri[coord[1], coord[0]] = misOriAxis[component - 1]
+            if (self.misOriAxis is None or np.any(np.isnan(
+                    self.misOriAxis[0].flat[self.grainPointIdxs]))):
+                self.calcGrainMisOri(calcAxis=True)
 
-            misOri = self.misOri * 180 / np.pi
+            misOri = self.misOriAxis[component - 1] * 180 / np.pi
             clabel = "Rotation around {:} axis ($^\circ$)".format(
                 ['X', 'Y', 'Z'][component-1]
             )
         else:
             # Calculate misorientation if not calculated
-            if np.any([grain.misOriList is None for grain in self.grainList]):
-                self.calcGrainMisOri(calcAxis = False)
-            for grain in self.grainList:
-                for coord, misOri in zip(grain.coordList, grain.misOriList):
-                    self.misOri[coord[1], coord[0]] = misOri
+            if (self.misOri is None or np.any(np.isnan(
+                    self.misOri.flat[self.grainPointIdxs]))):
+                self.calcGrainMisOri(calcAxis=False)
 
             misOri = np.arccos(self.misOri) * 360 / np.pi
             clabel = "Grain reference orienation deviation (GROD) ($^\circ$)"
+        # points outside grains are plotted as 0 as before
+        misOri = np.nan_to_num(misOri)
 
         # Set default plot parameters then update with any input
         plotParams = {
@@ -1358,11 +1918,11 @@ class Grain(base.Grain):
         EBSD map this grain is a member of.
     ownerMap : defdap.ebsd.Map
         EBSD map this grain is a member of.
-    quatList : list
-        List of quats.
-    misOriList : list
+    quatList : defdap.quat.QuatArray
+        Quats at each point in grain, in the same order as `coordList`.
+    misOriList : numpy.ndarray
         MisOri at each point in grain.
-    misOriAxisList : list
+    misOriAxisList : numpy.ndarray
         MisOri axes at each point in grain.
     refOri : defdap.quat.Quat
         Average ori of grain
@@ -1386,9 +1946,6 @@ class Grain(base.Grain):
         self.crystalSym = ebsdMap.crystalSym    # symmetry of material e.g. "cubic", "hexagonal"
         self.slipSystems = ebsdMap.slipSystems
         self.ebsdMap = self.ownerMap            # ebsd map this grain is a member of
-        self.quatList = []                      # list of quats
-        self.misOriList = None                  # list of misOri at each point in grain
-        self.misOriAxisList = None              # list of misOri axes at each point in grain
         self.refOri = None                      # (quat) average ori of grain
         self.averageMisOri = None               # average misOri of grain
 
@@ -1402,30 +1959,58 @@ class Grain(base.Grain):
             *args, **kwargs
         )
 
-    def addPoint(self, coord, quat):
-        """Append a coordinate and a quat to a grain.
+    @property
+    def quatList(self):
+        ys, xs = self.coords
+        return QuatArray(self.ebsdMap.quatArray.quatCoef[:, ys, xs],
+                         allow_southern=True)
 
-        Parameters
-        ----------
-        coord : tuple
-            (x,y) coordinate to append
-        quat : defdap.quat.Quat
-            Quaternion to append.
+    def calcAverageOri(self):
+        """Calculate the average orientation of a grain.
 
         """
-        self.coordList.append(coord)
-        self.quatList.append(quat)
+        self.refOri = Quat.calcAverageOris(self.quatList,
+                                           self.crystalSym)[0]
 
-    def calcAverageOri(self):
-        """Calculate the average orientation of a grain.
+    @property
+    def misOriList(self):
+        """Misorientation at each point of the grain, taken from the
+        `misOri` array of the map. None if not calculated.
+
+        Returns
+        -------
+        numpy.ndarray
 
         """
-        quatCompsSym = Quat.calcSymEqvs(self.quatList, self.crystalSym)
+        if self.ebsdMap.misOri is None:
+            return None
+        misOriList = self.ebsdMap.misOri.flat[self.pointIdxs]
+        if np.isnan(misOriList[0]):
+            return None
+        return misOriList
 
-        self.refOri = Quat.calcAverageOri(quatCompsSym)
+    @property
+    def misOriAxisList(self):
+        """Misorientation axis at each point of the grain, taken from
+        the `misOriAxis` array of the map. None if not calculated.
+
+        Returns
+        -------
+        numpy.ndarray
+            Shape (number of points, 3).
+
+        """
+        if self.ebsdMap.misOriAxis is None:
+            return None
+        misOriAxisList = self.ebsdMap.misOriAxis.reshape((3, -1))[
+            :, self.pointIdxs].T
+        if np.isnan(misOriAxisList[0, 0]):
+            return None
+        return misOriAxisList
 
     def buildMisOriList(self, calcAxis=False):
-        """Calculate the misorientation within given grain.
+        """Calculate the misorientation within given grain, see
+        :func:`defdap.ebsd.Map.calcGrainMisOri`.
 
         Parameters
         ----------
@@ -1433,47 +2018,8 @@ class Grain(base.Grain):
             Calculate the misorientation axis if True.
 
         """
-        quatCompsSym = Quat.calcSymEqvs(self.quatList, self.crystalSym)
-
-        if self.refOri is None:
-            self.refOri = Quat.calcAverageOri(quatCompsSym)
-
-        misOriArray, minQuatComps = Quat.calcMisOri(quatCompsSym, self.refOri)
-
-        self.averageMisOri = misOriArray.mean()
-        self.misOriList = list(misOriArray)
-
-        if calcAxis:
-            # Now for axis calulation
-            refOriInv = self.refOri.conjugate
-
-            misOriAxis = np.empty((3, minQuatComps.shape[1]))
-            Dq = np.empty((4, minQuatComps.shape[1]))
-
-            # refOriInv * minQuat for all points (* is quaternion product)
-            # change to minQuat * refOriInv
-            Dq[0, :] = (refOriInv[0] * minQuatComps[0, :] - refOriInv[1] * minQuatComps[1, :] -
-                        refOriInv[2] * minQuatComps[2, :] - refOriInv[3] * minQuatComps[3, :])
-
-            Dq[1, :] = (refOriInv[1] * minQuatComps[0, :] + refOriInv[0] * minQuatComps[1, :] +
-                        refOriInv[3] * minQuatComps[2, :] - refOriInv[2] * minQuatComps[3, :])
-
-            Dq[2, :] = (refOriInv[2] * minQuatComps[0, :] + refOriInv[0] * minQuatComps[2, :] +
-                        refOriInv[1] * minQuatComps[3, :] - refOriInv[3] * minQuatComps[1, :])
-
-            Dq[3, :] = (refOriInv[3] * minQuatComps[0, :] + refOriInv[0] * minQuatComps[3, :] +
-                        refOriInv[2] * minQuatComps[1, :] - refOriInv[1] * minQuatComps[2, :])
-
-            Dq[:, Dq[0] < 0] = -Dq[:, Dq[0] < 0]
-
-            # numpy broadcasting taking care of different array sizes
-            misOriAxis[:, :] = (2 * Dq[1:4, :] * np.arccos(Dq[0, :])) / np.sqrt(1 - np.power(Dq[0, :], 2))
-
-            # hack it back into a list. Need to change self.*List to be arrays, it was a bad decision to
-            # make them lists in the beginning
-            self.misOriAxisList = []
-            for row in misOriAxis.transpose():
-                self.misOriAxisList.append(row)
+        self.ebsdMap.calcGrainMisOri(calcAxis=calcAxis,
+                                     grainIds=self.grainID)
 
     def plotRefOri(self, direction=np.array([0, 0, 1]), **kwargs):
         """Plot the average grain orientation on an IPF.
@@ -1706,14 +2252,14 @@ class BoundarySegment(object):
         self.grain1 = grain1
         self.grain2 = grain2
 
-        # list of boundary points (x, y) for horizontal (X) and
+        # array of boundary points (x, y) for horizontal (X) and
         # vertical (Y) boundaries
-        self.boundaryPointsX = []
-        self.boundaryPointsY = []
+        self.boundaryPointsX = np.empty((0, 2), dtype=int)
+        self.boundaryPointsY = np.empty((0, 2), dtype=int)
         # Boolean value for each point above, True if boundary point is
         # in grain1 and False if in grain2
-        self.boundaryPointOwnersX = []
-        self.boundaryPointOwnersY = []
+        self.boundaryPointOwnersX = np.empty(0, dtype=bool)
+        self.boundaryPointOwnersY = np.empty(0, dtype=bool)
 
     def __eq__(self, right):
         if type(self) is not type(right):
@@ -1729,17 +2275,22 @@ class BoundarySegment(object):
 
     def addBoundaryPoint(self, point, kind, ownerGrain):
         if kind == 0:
-            self.boundaryPointsX.append(point)
-            self.boundaryPointOwnersX.append(ownerGrain is self.grain1)
+            self.boundaryPointsX = np.append(self.boundaryPointsX, [point],
+                                             axis=0)
+            self.boundaryPointOwnersX = np.append(self.boundaryPointOwnersX,
+                                                  ownerGrain is self.grain1)
         elif kind == 1:
-            self.boundaryPointsY.append(point)
-            self.boundaryPointOwnersY.append(ownerGrain is self.grain1)
+            self.boundaryPointsY = np.append(self.boundaryPointsY, [point],
+                                             axis=0)
+            self.boundaryPointOwnersY = np.append(self.boundaryPointOwnersY,
+                                                  ownerGrain is self.grain1)
         else:
             raise ValueError("Boundary point kind is 0 for x and 1 for y")
 
     def boundaryPointPairs(self, kind):
         """Return pairs of points either side of the boundary. The first
-        point is always in grain1
+        point is always in grain1. Returned as an array of shape
+        (number of points, 2, 2) of ((x1, y1), (x2, y2)) pairs.
         """
         if kind == 0:
             boundaryPoints = self.boundaryPointsX
@@ -1750,13 +2301,12 @@ class BoundarySegment(object):
             boundaryPointOwners = self.boundaryPointOwnersY
             delta = (0, 1)
 
-        boundaryPointPairs = []
-        for point, owner in zip(boundaryPoints, boundaryPointOwners):
-            otherPoint = (point[0] + delta[0], point[1] + delta[1])
-            if owner:
-                boundaryPointPairs.append((point, otherPoint))
-            else:
-                boundaryPointPairs.append((otherPoint, point))
+        otherPoints = boundaryPoints + delta
+        owners = boundaryPointOwners[:, None]
+        boundaryPointPairs = np.stack((
+            np.where(owners, boundaryPoints, otherPoints),
+            np.where(owners, otherPoints, boundaryPoints)
+        ), axis=1)
 
         return boundaryPointPairs
 
@@ -1943,7 +2493,7 @@ class Linker(object):
 
         """
         for i, ebsdMap in enumerate(self.ebsdMaps[1:], start=1):
-            for link in self.links:
-                ebsdMap.grainList[link[i]].buildMisOriList(calcAxis=calcAxis)
+            ebsdMap.calcGrainMisOri(calcAxis=calcAxis,
+                                    grainIds=[link[i] for link in self.links])
 
         return
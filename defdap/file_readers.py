@@ -14,6 +14,7 @@
 # limitations under the License.
 
 import numpy as np
+from numpy.lib.recfunctions import structured_to_unstructured
 import pandas as pd
 import pathlib
 import re
@@ -78,10 +79,12 @@ class OxfordTextLoader(EBSDDataLoader):
     def load(
         self,
         fileName: str,
-        fileDir: str = ""
+        fileDir: str = "",
+        chunkSize: Optional[int] = None
     ) -> None:
         """ Read an Oxford Instruments .ctf file, which is a HKL single
-        orientation file.
+        orientation file. The data table is parsed with the pandas C
+        parser directly into the output arrays.
 
         Parameters
         ----------
@@ -89,6 +92,10 @@ class OxfordTextLoader(EBSDDataLoader):
             File name.
         fileDir
             Path to file.
+        chunkSize
+            Number of rows of the data table to parse at a time, to
+            limit memory use for large files. The whole table is parsed
+            at once if None.
 
         Returns
         -------
@@ -181,11 +188,27 @@ class OxfordTextLoader(EBSDDataLoader):
             raise TypeError("Unknown data in EBSD file.")
         self.dataFormat = np.dtype(dataFormat)
 
-        # now read the data from file
-        binData = np.loadtxt(
-            str(filePath), self.dataFormat, usecols=loadCols,
-            skiprows=numHeaderLines
+        # now read the data from file, a chunk of rows at a time, into
+        # arrays for each field
+        numPoints = xDim * yDim
+        binData = {name: np.empty(numPoints, dtype=dtype)
+                   for name, dtype in dataFormat}
+        reader = pd.read_csv(
+            str(filePath), sep='\t', header=None, skiprows=numHeaderLines,
+            usecols=loadCols,
+            dtype={i: dtype for i, (_, dtype) in zip(loadCols, dataFormat)},
+            engine='c', nrows=numPoints, chunksize=chunkSize or numPoints
         )
+        numRead = 0
+        with reader:
+            for chunk in reader:
+                rows = slice(numRead, numRead + len(chunk))
+                for colIdx, (name, _) in zip(loadCols, dataFormat):
+                    binData[name][rows] = chunk[colIdx].values
+                numRead = rows.stop
+        if numRead != numPoints:
+            raise ValueError(f"Expected {numPoints} points in EBSD file but "
+                             f"read {numRead}.")
 
         self.loadedData['bandContrast'] = np.reshape(
             binData['BC'], (yDim, xDim)
@@ -199,12 +222,9 @@ class OxfordTextLoader(EBSDDataLoader):
         self.loadedData['phase'] = np.reshape(
             binData['phase'], (yDim, xDim)
         )
-        eulerAngles = np.reshape(
-            binData[['ph1', 'phi', 'ph2']], (yDim, xDim)
-        )
-        # flatten the structures so that the Euler angles are stored
-        # into a normal array
-        eulerAngles = np.array(eulerAngles.tolist()).transpose((2, 0, 1))
+        eulerAngles = np.stack(
+            [binData[name] for name in ('ph1', 'phi', 'ph2')]
+        ).astype(np.float64).reshape((3, yDim, xDim))
         self.loadedData['eulerAngle'] = eulerAngles * np.pi / 180.
 
         self.checkData()
@@ -214,7 +234,8 @@ class OxfordBinaryLoader(EBSDDataLoader):
     def load(
         self,
         fileName: str,
-        fileDir: str = ""
+        fileDir: str = "",
+        memmap: bool = False
     ) -> None:
         """Read Oxford Instruments .cpr/.crc file pair.
 
@@ -224,6 +245,9 @@ class OxfordBinaryLoader(EBSDDataLoader):
             File name.
         fileDir
             Path to file.
+        memmap
+            Memory map the .crc file instead of reading it, see
+            :func:`loadOxfordCRC`.
 
         Returns
         -------
@@ -232,7 +256,7 @@ class OxfordBinaryLoader(EBSDDataLoader):
 
         """
         self.loadOxfordCPR(fileName, fileDir=fileDir)
-        self.loadOxfordCRC(fileName, fileDir=fileDir)
+        self.loadOxfordCRC(fileName, fileDir=fileDir, memmap=memmap)
 
     def loadOxfordCPR(self, fileName: str, fileDir: str = "") -> None:
         """
@@ -346,8 +370,14 @@ class OxfordBinaryLoader(EBSDDataLoader):
 
         self.dataFormat = np.dtype(dataFormat)
 
-    def loadOxfordCRC(self, fileName: str, fileDir: str = "") -> None:
-        """Read binary EBSD data from an Oxford Instruments .crc file
+    def loadOxfordCRC(
+        self,
+        fileName: str,
+        fileDir: str = "",
+        memmap: bool = False
+    ) -> None:
+        """Read binary EBSD data from an Oxford Instruments .crc file.
+        Fields are loaded as views of the records in the file.
 
         Parameters
         ----------
@@ -355,6 +385,11 @@ class OxfordBinaryLoader(EBSDDataLoader):
             File name.
         fileDir
             Path to file.
+        memmap
+            If True, the file is memory mapped (read only) instead of
+            read into memory. Data are only read from disk when
+            accessed and Euler angles are kept as a float32 view of the
+            file. Otherwise Euler angles are converted to float64.
 
         """
         xDim = self.loadedMetadata['xDim']
@@ -366,7 +401,10 @@ class OxfordBinaryLoader(EBSDDataLoader):
             raise FileNotFoundError("Cannot open file {}".format(filePath))
 
         # load binary data from file
-        binData = np.fromfile(str(filePath), self.dataFormat, count=-1)
+        if memmap:
+            binData = np.memmap(str(filePath), self.dataFormat, mode='r')
+        else:
+            binData = np.fromfile(str(filePath), self.dataFormat, count=-1)
 
         self.loadedData['bandContrast'] = np.reshape(
             binData['BC'], (yDim, xDim)
@@ -380,21 +418,27 @@ class OxfordBinaryLoader(EBSDDataLoader):
         self.loadedData['phase'] = np.reshape(
             binData['phase'], (yDim, xDim)
         )
-        eulerAngles = np.reshape(
-            binData[['ph1', 'phi', 'ph2']], (yDim, xDim)
-        )
 
-        # Load EDX data into a dict
+        # Load EDX data into a dict of views, these are only read from
+        # the file when accessed if memory mapped
         if int(self.loadedMetadata['EDX Windows']['Count']) > 0:
-            EDXFields = [key for key in binData.dtype.fields.keys() if key.startswith('EDX')]        
+            EDXFields = [key for key in binData.dtype.fields.keys()
+                         if key.startswith('EDX')]
             self.loadedData['EDXDict'] = dict(
-                [(field[4:], np.reshape(binData[field], (yDim, xDim))) for field in EDXFields]
-                )
+                [(field[4:], np.reshape(binData[field], (yDim, xDim)))
+                 for field in EDXFields]
+            )
 
-        # flatten the structures so that the Euler angles are stored
-        # into a normal array
-        eulerAngles = np.array(eulerAngles.tolist()).transpose((2, 0, 1))
-        self.loadedData['eulerAngle'] = eulerAngles
+        # view the Euler angle fields of the records as a normal array
+        eulerAngles = structured_to_unstructured(
+            binData[['ph1', 'phi', 'ph2']],
+            dtype=None if memmap else np.float64
+        )
+        eulerAngles = np.reshape(eulerAngles, (yDim, xDim, 3))
+        if memmap:
+            # the view does not keep the read only flag of the map
+            eulerAngles.flags.writeable = False
+        self.loadedData['eulerAngle'] = eulerAngles.transpose((2, 0, 1))
 
         self.checkData()
 
@@ -453,22 +497,23 @@ class DICDataLoader(object):
         return
 
     def checkData(self) -> None:
-        """ Calculate size of map from loaded data and check it matches
-        values from metadata.
+        """ Check the loaded data is a grid of the size given in the
+        metadata, using the coordinates at the ends of the first row
+        and column.
 
         """
-        coords = self.loadedData['xc']
-        xdim = int(
-            (coords.max() - coords.min()) / min(abs(np.diff(coords))) + 1
-        )
-
-        coords = self.loadedData['yc']
-        ydim = int(
-            (coords.max() - coords.min()) / max(abs(np.diff(coords))) + 1
-        )
+        xDim = self.loadedMetadata['xDim']
+        yDim = self.loadedMetadata['yDim']
+        xc = self.loadedData['xc']
+        yc = self.loadedData['yc']
 
-        assert xdim == self.loadedMetadata['xDim'], "Dimensions of data and header do not match"
-        assert ydim == self.loadedMetadata['yDim'], "Dimensions of data and header do not match"
+        assert len(xc) == xDim * yDim, "Dimensions of data and header do not match"
+        # coordinates of first row vary along x and are constant in y
+        assert xDim == 1 or xc[xDim - 1] != xc[0], "Dimensions of data and header do not match"
+        assert yc[xDim - 1] == yc[0], "Dimensions of data and header do not match"
+        # last point is in the last row and column
+        assert xc[-1] == xc[xDim - 1], "Dimensions of data and header do not match"
+        assert yDim == 1 or yc[-1] != yc[0], "Dimensions of data and header do not match"
 
     def loadDavisMetadata(self,
         fileName: str,
@@ -513,10 +558,14 @@ class DICDataLoader(object):
     def loadDavisData(
         self,
         fileName: str,
-        fileDir: str = ""
+        fileDir: str = "",
+        chunkSize: Optional[int] = None,
+        dtype: type = np.float64
     ) -> Dict[str, Any]:
         """Load displacement data from Davis .txt file containing x and
         y coordinates and x and y displacements for each coordinate.
+        The columns are parsed into arrays of the size given in the
+        header, which is read first if not already loaded.
 
         Parameters
         ----------
@@ -524,6 +573,12 @@ class DICDataLoader(object):
             File name.
         fileDir
             Path to file.
+        chunkSize
+            Number of rows to parse at a time, to limit memory use for
+            large files. The whole file is parsed at once if None.
+        dtype
+            Floating point type of the loaded arrays. Use float32 to
+            halve the memory used by the data.
 
         Returns
         -------
@@ -535,21 +590,40 @@ class DICDataLoader(object):
         if not filePath.is_file():
             raise FileNotFoundError("Cannot open file {}".format(filePath))
 
-        data = pd.read_table(str(filePath), delimiter='\t', skiprows=1,
-                             header=None)
-        # x and y coordinates
-        self.loadedData['xc'] = data.values[:, 0]
-        self.loadedData['yc'] = data.values[:, 1]
-        # x and y displacement
-        self.loadedData['xd'] = data.values[:, 2]
-        self.loadedData['yd'] = data.values[:, 3]
+        if not (self.loadedMetadata['xDim'] and self.loadedMetadata['yDim']):
+            self.loadDavisMetadata(fileName, fileDir)
+        shape = (self.loadedMetadata['yDim'], self.loadedMetadata['xDim'])
+        numPoints = shape[0] * shape[1]
+
+        # x and y coordinates and x and y displacements, rows of the
+        # file are points of the map in row major order
+        columns = [np.empty(shape, dtype=dtype) for _ in range(4)]
+        reader = pd.read_csv(
+            str(filePath), sep='\t', header=None, skiprows=1,
+            usecols=range(4), dtype=dtype, engine='c', nrows=numPoints,
+            chunksize=chunkSize or numPoints
+        )
+        numRead = 0
+        with reader:
+            for chunk in reader:
+                rows = slice(numRead, numRead + len(chunk))
+                for i, column in enumerate(columns):
+                    column.reshape(-1)[rows] = chunk[i].values
+                numRead = rows.stop
+
+        for key, column in zip(('xc', 'yc', 'xd', 'yd'), columns):
+            self.loadedData[key] = column.reshape(-1)[:numRead]
 
         self.checkData()
 
         return self.loadedData
 
     @staticmethod
-    def loadDavisImageData(fileName: str, fileDir: str = "") -> np.ndarray:
+    def loadDavisImageData(
+        fileName: str,
+        fileDir: str = "",
+        dtype: Optional[type] = None
+    ) -> np.ndarray:
         """ A .txt file from DaVis containing a 2D image
 
         Parameters
@@ -558,6 +632,8 @@ class DICDataLoader(object):
             File name.
         fileDir
             Path to file.
+        dtype
+            Type of the loaded array, inferred from the data if None.
 
         Returns
         -------
@@ -570,7 +646,7 @@ class DICDataLoader(object):
             raise FileNotFoundError("Cannot open file {}".format(filePath))
 
         data = pd.read_table(str(filePath), delimiter='\t', skiprows=1,
-                             header=None)
+                             header=None, dtype=dtype)
        
         # x and y coordinates
         loadedData = np.array(data)
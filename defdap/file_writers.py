@@ -71,10 +71,7 @@ class OxfordTextWriter(EBSDDataWriter):
         step_size = self.metadata['step_size']
 
         # convert quats to Euler angles
-        out_euler_array = np.zeros(shape + (3,))
-        for idx in np.ndindex(shape):
-            out_euler_array[idx] = self.data['quat'][idx].eulerAngles()
-        out_euler_array *= 180 / np.pi
+        out_euler_array = self.data['quat'].eulerAngles() * 180 / np.pi
         acq_rot = self.metadata['acquisition_rotation'].eulerAngles()
         acq_rot *= 180 / np.pi
 
@@ -112,14 +109,17 @@ class OxfordTextWriter(EBSDDataWriter):
             ctf_file.write("Phase\tX\tY\tBands\tError\tEuler1\tEuler2"
                            "\tEuler3\tMAD\tBC\tBS\n")
 
-            for x, y, phase, eulers, bc in zip(
-                x_grid.flat, y_grid.flat,
-                self.data['phase'].flat,
-                out_euler_array.reshape((shape[0] * shape[1], 3)),
-                self.data['band_contrast'].flat,
-            ):
-                error = 3 if phase == 0 else 0
-                ctf_file.write(
-                    f"{phase}\t{x:.3f}\t{y:.3f}\t10\t{error}\t{eulers[0]:.3f}"
-                    f"\t{eulers[1]:.3f}\t{eulers[2]:.3f}\t0.0000\t{bc}\t0\n"
-                )
+            # write all points at once, columns are phase, x, y, error,
+            # 3 Euler angles and band contrast
+            phase = self.data['phase'].reshape(-1)
+            point_data = np.column_stack((
+                phase, x_grid.reshape(-1), y_grid.reshape(-1),
+                np.where(phase == 0, 3, 0),
+                out_euler_array.reshape((3, -1)).T,
+                self.data['band_contrast'].reshape(-1),
+            ))
+            np.savetxt(
+                ctf_file, point_data,
+                fmt="%d\t%.3f\t%.3f\t10\t%d\t%.3f\t%.3f\t%.3f\t0.0000"
+                    "\t%d\t0"
+            )
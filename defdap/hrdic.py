@@ -16,6 +16,8 @@
 import numpy as np
 from matplotlib.pyplot import imread
 import inspect
+from collections import deque, OrderedDict
+from collections.abc import Mapping
 
 from skimage import transform as tf
 from skimage import morphology as mph
@@ -70,6 +72,10 @@ class Map(base.Map):
         Transform from DIC to EBSD coordinates.
     ebsdGrainIds : list
         EBSD grain IDs corresponding to DIC map grain IDs.
+    warpCoordsCache : dict
+        Warp coordinates from the DIC to EBSD frame for the linked
+        transform, keyed by (0, output shape) for warps cropped to the
+        DIC map and (1, input shape) otherwise.
     patternImPath : str
         Path to BSE image of map.
     plotHomog :
@@ -85,13 +91,15 @@ class Map(base.Map):
         File path.
     fname : str
         File name.
+    dtype : type
+        Floating point type of the displacements and map components.
     xDim : int
         Size of map along x (after cropping).
     yDim : int
         Size of map along y (after cropping).
-    self.x_map : numpy.ndarray
+    x_map : numpy.ndarray
         Map of u displacement component along x.
-    self.y_map : numpy.ndarray
+    y_map : numpy.ndarray
         Map of v displacement component along x.
     f11, f22, f12, f21 ; numpy.ndarray
         Components of the deformation gradient, where 1=x and 2=y.
@@ -99,11 +107,31 @@ class Map(base.Map):
         Components of the green strain , where 1=x and 2=y.
     eMaxShear : numpy.ndarray
         Max shear component np.sqrt(((e11 - e22) / 2.)**2 + e12**2).
+    eMaxPrincipal, eMinPrincipal : numpy.ndarray
+        In-plane principal components of the green strain.
+    rotation : numpy.ndarray
+        In-plane rotation angle in radians.
+    eVonMises : numpy.ndarray
+        Von Mises equivalent strain.
+    component : defdap.hrdic.MapComponents
+        Mapping of component names to maps, calculated on access.
+    componentCache : dict
+        Map components and displacement gradients calculated so far,
+        cleared by :func:`~defdap.hrdic.Map.clearComponentCache`.
+    mask : numpy.ndarray
+        Mask generated by :func:`~defdap.hrdic.Map.generateThresholdMask`.
+    appliedMask : numpy.ndarray
+        Mask applied to all map components.
     cropDists : numpy.ndarray
         Crop distances (default all zeros).
 
     """
-    def __init__(self, path, fname, dataType=None):
+    # Names of map components that can be calculated
+    componentNames = ('f11', 'f12', 'f21', 'f22', 'e11', 'e12', 'e22',
+                      'eMaxShear', 'x_map', 'y_map', 'eMaxPrincipal',
+                      'eMinPrincipal', 'rotation', 'eVonMises')
+
+    def __init__(self, path, fname, dataType=None, dtype=np.float64):
         """Initialise class and import DIC data from file.
 
         Parameters
@@ -114,6 +142,9 @@ class Map(base.Map):
             Name of file including extension.
         dataType : str
             Type of data file.
+        dtype : type, optional
+            Floating point type of the displacements and map components.
+            Use float32 to halve the memory used by the map.
 
         """
         # Call base class constructor
@@ -137,6 +168,7 @@ class Map(base.Map):
         self.ebsdTransform = None           # Transform from EBSD to DIC coordinates
         self.ebsdTransformInv = None        # Transform from DIC to EBSD coordinates
         self.ebsdGrainIds = None
+        self.warpCoordsCache = {}           # warp coordinates for the linked transform
         self.patternImPath = None           # Path to BSE image of map
         self.plotHomog = self.plotMaxShear  # Use max shear map for defining homologous points
         self.highlightAlpha = 0.6
@@ -147,6 +179,7 @@ class Map(base.Map):
         # half the size of the dic data.
         self.path = path                    # file path
         self.fname = fname                  # file name
+        self.dtype = dtype                  # type of displacements and components
 
         self.loadData(path, fname, dataType=dataType)
   
@@ -154,31 +187,10 @@ class Map(base.Map):
         self.xDim = self.xdim
         self.yDim = self.ydim
         
-        self.x_map = self._map(self.xd)     # u displacement component along x
-        self.y_map = self._map(self.yd)     # v displacement component along x
-        xDispGrad = self._grad(self.x_map)  #d/dy is first term, d/dx is second
-        yDispGrad = self._grad(self.y_map)
-
-        # Deformation gradient
-        self.f11 = xDispGrad[1] + 1
-        self.f22 = yDispGrad[0] + 1
-        self.f12 = xDispGrad[0]
-        self.f21 = yDispGrad[1]
-
-        # Green strain
-        self.e11 = xDispGrad[1] + \
-                   0.5*(xDispGrad[1]*xDispGrad[1] + yDispGrad[1]*yDispGrad[1])
-        self.e22 = yDispGrad[0] + \
-                   0.5*(xDispGrad[0]*xDispGrad[0] + yDispGrad[0]*yDispGrad[0])
-        self.e12 = 0.5*(xDispGrad[0] + yDispGrad[1] +
-                        xDispGrad[1]*xDispGrad[0] + yDispGrad[1]*yDispGrad[0])
-        # max shear component
-        self.eMaxShear = np.sqrt(((self.e11 - self.e22) / 2.)**2 + self.e12**2)
-
-        self.component = {'f11': self.f11, 'f12': self.f12, 'f21': self.f21, 'f22': self.f22,
-                         'e11': self.e11, 'e12': self.e12, 'e22': self.e22,
-                         'eMaxShear': self.eMaxShear,
-                         'x_map': self.x_map, 'y_map': self.y_map}
+        self.mask = None            # mask generated by generateThresholdMask
+        self.appliedMask = None     # mask applied to all map components
+        self.componentCache = {}    # map components and gradients calculated so far
+        self.component = MapComponents(self)
 
         # crop distances (default all zeros)
         self.cropDists = np.array(((0, 0), (0, 0)), dtype=int)
@@ -208,7 +220,7 @@ class Map(base.Map):
         dataLoader = DICDataLoader()
         if dataType == "DavisText":
             metadataDict = dataLoader.loadDavisMetadata(fileName, fileDir)
-            dataDict = dataLoader.loadDavisData(fileName, fileDir)
+            dataDict = dataLoader.loadDavisData(fileName, fileDir, dtype=self.dtype)
         else:
             raise Exception("No loader found for this DIC data.")
 
@@ -246,7 +258,8 @@ class Map(base.Map):
 
         dataLoader = DICDataLoader()
         if dataType == "DavisImage":
-            loadedData = dataLoader.loadDavisImageData(fileName, fileDir)
+            loadedData = dataLoader.loadDavisImageData(fileName, fileDir,
+                                                       dtype=self.dtype)
         else:
             raise Exception("No loader found for this DIC data.")
             
@@ -258,14 +271,219 @@ class Map(base.Map):
             "Dimensions of imported data and dic data do not match"
 
     def _map(self, data_col):
-        data_map = np.reshape(np.array(data_col), (self.ydim, self.xdim))
+        data_map = np.reshape(data_col, (self.ydim, self.xdim))
         return data_map
 
     def _grad(self, data_map):
-        grad_step = min(abs((np.diff(self.xc))))
+        # spacing of the grid from the first row of coordinates
+        grad_step = abs(self.xc[1] - self.xc[0])
         data_grad = np.gradient(data_map, grad_step, grad_step)
         return data_grad
 
+    def _dispGrad(self, axis):
+        """Gradient of the x or y displacement map. This is calculated
+        once from the unmasked displacements and stored in the
+        component cache for all components that use it.
+
+        Parameters
+        ----------
+        axis : str {'x', 'y'}
+            Displacement component.
+
+        Returns
+        -------
+        list of numpy.ndarray
+            d/dy and d/dx of the displacement map.
+
+        """
+        key = axis + 'DispGrad'
+        if key not in self.componentCache:
+            self.componentCache[key] = self._grad(
+                self._map(self.xd if axis == 'x' else self.yd)
+            )
+        return self.componentCache[key]
+
+    def _calcComponent(self, name):
+        """Calculate a map component from the displacement gradients.
+        Components it depends on are taken from the cache, calculating
+        and caching them first if needed.
+
+        Parameters
+        ----------
+        name : str
+            Name of the component.
+
+        Returns
+        -------
+        numpy.ndarray
+            Map of the component.
+
+        """
+        if name == 'x_map':
+            return self._map(self.xd)
+        if name == 'y_map':
+            return self._map(self.yd)
+
+        # d/dy is first term, d/dx is second
+        if name in ('f11', 'f12', 'f21', 'f22', 'e11', 'e22', 'e12'):
+            xDispGrad = self._dispGrad('x')
+            yDispGrad = self._dispGrad('y')
+
+        # Deformation gradient
+        if name == 'f11':
+            return xDispGrad[1] + 1
+        if name == 'f22':
+            return yDispGrad[0] + 1
+        if name == 'f12':
+            return xDispGrad[0]
+        if name == 'f21':
+            return yDispGrad[1]
+
+        # Green strain
+        if name == 'e11':
+            return xDispGrad[1] + \
+                0.5*(xDispGrad[1]*xDispGrad[1] + yDispGrad[1]*yDispGrad[1])
+        if name == 'e22':
+            return yDispGrad[0] + \
+                0.5*(xDispGrad[0]*xDispGrad[0] + yDispGrad[0]*yDispGrad[0])
+        if name == 'e12':
+            return 0.5*(xDispGrad[0] + yDispGrad[1] +
+                        xDispGrad[1]*xDispGrad[0] + yDispGrad[1]*yDispGrad[0])
+
+        if name == 'rotation':
+            # rotation of the polar decomposition F = RU
+            return np.arctan2(
+                self.getComponent('f21') - self.getComponent('f12'),
+                self.getComponent('f11') + self.getComponent('f22')
+            )
+
+        e11 = self.getComponent('e11')
+        e22 = self.getComponent('e22')
+        if name in ('eMaxShear', 'eVonMises'):
+            e12 = self.getComponent('e12')
+        # max shear component
+        if name == 'eMaxShear':
+            return np.sqrt(((e11 - e22) / 2.)**2 + e12**2)
+        if name == 'eVonMises':
+            # assume volume is conserved, e33 = -(e11 + e22)
+            return np.sqrt(2. / 3. * (e11**2 + e22**2 + (e11 + e22)**2 + 2 * e12**2))
+
+        # in-plane principal strains
+        eMaxShear = self.getComponent('eMaxShear')
+        if name == 'eMaxPrincipal':
+            return (e11 + e22) / 2. + eMaxShear
+        if name == 'eMinPrincipal':
+            return (e11 + e22) / 2. - eMaxShear
+
+        raise ValueError(f"Unknown map component '{name}'.")
+
+    def getComponent(self, name):
+        """Get a map component, calculating it from the displacements
+        if it is not already cached. Points in the applied threshold
+        mask are set to NaN.
+
+        Parameters
+        ----------
+        name : str
+            Name of the component, one of `componentNames`.
+
+        Returns
+        -------
+        numpy.ndarray
+            Map of the component.
+
+        """
+        if name not in self.componentNames:
+            raise ValueError(f"Unknown map component '{name}'.")
+
+        data = self.componentCache.get(name)
+        if data is None:
+            data = self._calcComponent(name)
+            if self.appliedMask is not None:
+                data = np.where(self.appliedMask, np.nan, data)
+            self.componentCache[name] = data
+
+        return data
+
+    def clearComponentCache(self):
+        """Remove all calculated map components and displacement
+        gradients so they are recalculated when next used.
+
+        """
+        self.componentCache = {}
+
+    @property
+    def x_map(self):
+        """Map of u displacement component along x."""
+        return self.getComponent('x_map')
+
+    @property
+    def y_map(self):
+        """Map of v displacement component along y."""
+        return self.getComponent('y_map')
+
+    @property
+    def f11(self):
+        """Deformation gradient component F11."""
+        return self.getComponent('f11')
+
+    @property
+    def f12(self):
+        """Deformation gradient component F12."""
+        return self.getComponent('f12')
+
+    @property
+    def f21(self):
+        """Deformation gradient component F21."""
+        return self.getComponent('f21')
+
+    @property
+    def f22(self):
+        """Deformation gradient component F22."""
+        return self.getComponent('f22')
+
+    @property
+    def e11(self):
+        """Green strain component E11."""
+        return self.getComponent('e11')
+
+    @property
+    def e12(self):
+        """Green strain component E12."""
+        return self.getComponent('e12')
+
+    @property
+    def e22(self):
+        """Green strain component E22."""
+        return self.getComponent('e22')
+
+    @property
+    def eMaxShear(self):
+        """Max shear strain np.sqrt(((e11 - e22) / 2.)**2 + e12**2)."""
+        return self.getComponent('eMaxShear')
+
+    @property
+    def eMaxPrincipal(self):
+        """Maximum in-plane principal green strain."""
+        return self.getComponent('eMaxPrincipal')
+
+    @property
+    def eMinPrincipal(self):
+        """Minimum in-plane principal green strain."""
+        return self.getComponent('eMinPrincipal')
+
+    @property
+    def rotation(self):
+        """In-plane rotation angle in radians, from the polar
+        decomposition of the deformation gradient."""
+        return self.getComponent('rotation')
+
+    @property
+    def eVonMises(self):
+        """Von Mises equivalent strain, assuming the volume is
+        conserved."""
+        return self.getComponent('eVonMises')
+
     def retrieveName(self):
         """Gets the first name assigned to the a map, as a string
 
@@ -376,6 +594,9 @@ class Map(base.Map):
         self.xDim = self.xdim - self.cropDists[0, 0] - self.cropDists[0, 1]
         self.yDim = self.ydim - self.cropDists[1, 0] - self.cropDists[1, 1]
 
+        # release cached map components, recalculated when next used
+        self.clearComponentCache()
+
     def crop(self, mapData, binned=True):
         """ Crop given data using crop parameters stored in map
         i.e. cropped_data = DicMap.crop(DicMap.data_to_crop).
@@ -445,12 +666,13 @@ class Map(base.Map):
 
         """
         self.ebsdMap = ebsdMap
+        # warp coordinates of the previous transform are no longer valid
+        self.warpCoordsCache = {}
+
         if transformType.lower() == "piecewiseaffine":
             self.ebsdTransform = tf.PiecewiseAffineTransform()
-            self.ebsdTransformInv = self.ebsdTransform.inverse
         elif transformType.lower() == "projective":
             self.ebsdTransform = tf.ProjectiveTransform()
-            self.ebsdTransformInv = self.ebsdTransform.inverse
         elif transformType.lower() == "polynomial":
             self.ebsdTransform = tf.PolynomialTransform()
             # You can't calculate the inverse of a polynomial transform
@@ -472,13 +694,14 @@ class Map(base.Map):
         else:
             # default to using affine
             self.ebsdTransform = tf.AffineTransform()
-            self.ebsdTransformInv = self.ebsdTransform.inverse
 
         # calculate transform from EBSD to DIC frame
         self.ebsdTransform.estimate(
             np.array(self.homogPoints),
             np.array(self.ebsdMap.homogPoints)
         )
+        # inverse must be taken after the transform is estimated
+        self.ebsdTransformInv = self.ebsdTransform.inverse
 
         # Transform the EBSD boundaryLines to DIC reference frame
         boundaryLineList = np.array(self.ebsdMap.boundaryLines).reshape(-1, 2)       # Flatten to coord list
@@ -508,58 +731,163 @@ class Map(base.Map):
             raise Exception("No EBSD map linked.")
         return True
 
-    def warpToDicFrame(self, mapData, cropImage=True, order=1, preserve_range=False):
-        """Warps a map to the DIC frame.
+    def warpCoords(self, inputShape, cropImage=True):
+        """Coordinates in the EBSD frame of each point of a map warped
+        to the DIC frame. These are calculated once for the linked
+        transform and output shape, then cached.
 
         Parameters
         ----------
-        mapData : numpy.ndarray
-            Data to warp.
+        inputShape : tuple of int
+            Shape of the map to warp.
         cropImage : bool, optional
             Crop to size of DIC map if true.
-        order : int, optional
-            Order of interpolation (0: Nearest-neighbor, 1: Bi-linear...).
-        preserve_range: bool, optional
-            Keep the original range of values.
 
         Returns
-        ----------
-        warpedMap
-            Map (i.e. EBSD map) warped to the DIC frame.
+        -------
+        numpy.ndarray
+            Row and column coordinates, shape (2, output rows, output
+            columns).
 
         """
         # Check a EBSD map is linked
         self.checkEbsdLinked()
 
-        if (cropImage or type(self.ebsdTransform) is not tf.AffineTransform):
+        if cropImage or type(self.ebsdTransform) is not tf.AffineTransform:
+            key = (0, self.yDim, self.xDim)
+        else:
+            key = (1, int(inputShape[0]), int(inputShape[1]))
+
+        coords = self.warpCoordsCache.get(key)
+        if coords is not None:
+            return coords
+
+        if key[0] == 0:
             # crop to size of DIC map
+            transform = self.ebsdTransform
             outputShape = (self.yDim, self.xDim)
-            # warp the map
-            warpedMap = tf.warp(
-                mapData, self.ebsdTransform,
-                output_shape=outputShape,
-                order=order, preserve_range=preserve_range
-            )
         else:
             # copy ebsd transform and change translation to give an extra
             # 5% border to show the entire image after rotation/shearing
-            tempEbsdTransform = tf.AffineTransform(matrix=np.copy(self.ebsdTransform.params))
-            tempEbsdTransform.params[0:2, 2] = -0.05 * np.array(mapData.shape)
+            transform = tf.AffineTransform(matrix=np.copy(self.ebsdTransform.params))
+            transform.params[0:2, 2] = -0.05 * np.array(inputShape[:2])
 
             # output the entire warped image with 5% border (add some
             # extra to fix a bug)
-            outputShape = np.array(mapData.shape) * 1.4 / tempEbsdTransform.scale
+            outputShape = np.array(inputShape[:2]) * 1.4 / transform.scale
+            outputShape = tuple(outputShape.astype(int))
 
-            # warp the map
-            warpedMap = tf.warp(
-                mapData, tempEbsdTransform,
-                output_shape=outputShape.astype(int),
-                order=order, preserve_range=preserve_range
-            )
+        coords = tf.warp_coords(transform, outputShape)
+        self.warpCoordsCache[key] = coords
+
+        return coords
+
+    def warpToDicFrame(self, mapData, cropImage=True, order=1, preserve_range=False):
+        """Warps a map to the DIC frame, using warp coordinates cached
+        for the linked transform.
+
+        Parameters
+        ----------
+        mapData : numpy.ndarray
+            Data to warp, shape (y, x) or (y, x, channels).
+        cropImage : bool, optional
+            Crop to size of DIC map if true.
+        order : int, optional
+            Order of interpolation (0: Nearest-neighbor, 1: Bi-linear...).
+        preserve_range: bool, optional
+            Keep the original range of values.
+
+        Returns
+        ----------
+        warpedMap
+            Map (i.e. EBSD map) warped to the DIC frame.
+
+        """
+        coords = self.warpCoords(mapData.shape, cropImage=cropImage)
+        if mapData.ndim > 2:
+            # add channel coordinates for multichannel maps, i.e. RGB
+            numChannels = mapData.shape[2]
+            outputShape = coords.shape[1:] + (numChannels,)
+            coords = np.stack((
+                np.broadcast_to(coords[0, ..., np.newaxis], outputShape),
+                np.broadcast_to(coords[1, ..., np.newaxis], outputShape),
+                np.broadcast_to(np.arange(numChannels, dtype=coords.dtype), outputShape),
+            ))
+
+        # warp the map
+        warpedMap = tf.warp(mapData, coords, order=order,
+                            preserve_range=preserve_range)
 
         # return map
         return warpedMap
 
+    def _warpCoordsId(self):
+        """Arrays identifying the linked transform, stored with saved
+        warp coordinates.
+
+        """
+        transformId = {
+            'transformType': np.array(type(self.ebsdTransform).__name__),
+            'dicHomogPoints': np.array(self.homogPoints, dtype=float),
+            'ebsdHomogPoints': np.array(self.ebsdMap.homogPoints, dtype=float),
+        }
+        if hasattr(self.ebsdTransform, 'params'):
+            transformId['transformParams'] = np.array(self.ebsdTransform.params)
+
+        return transformId
+
+    def saveWarpCoords(self, filePath):
+        """Save the cached warp coordinates to a numpy .npz file, so
+        they can be loaded for the same transform in a later session.
+
+        Parameters
+        ----------
+        filePath : str
+            Path of file to write.
+
+        """
+        self.checkEbsdLinked()
+
+        arrays = self._warpCoordsId()
+        arrays['keys'] = np.array(list(self.warpCoordsCache), dtype=int).reshape(-1, 3)
+        for i, coords in enumerate(self.warpCoordsCache.values()):
+            arrays[f'coords{i}'] = coords
+
+        np.savez(filePath, **arrays)
+
+    def loadWarpCoords(self, filePath):
+        """Load warp coordinates saved by
+        :func:`~defdap.hrdic.Map.saveWarpCoords` into the cache.
+
+        Parameters
+        ----------
+        filePath : str
+            Path of file to read.
+
+        Raises
+        ----------
+        ValueError
+            If the coordinates were saved for a different transform.
+
+        """
+        self.checkEbsdLinked()
+
+        with np.load(filePath) as data:
+            for name, value in self._warpCoordsId().items():
+                if name not in data:
+                    match = False
+                elif value.dtype.kind == 'f':
+                    match = (data[name].shape == value.shape and
+                             np.allclose(data[name], value))
+                else:
+                    match = data[name] == value
+                if not match:
+                    raise ValueError("Warp coordinates were saved for a "
+                                     "different transform.")
+
+            for i, key in enumerate(data['keys']):
+                self.warpCoordsCache[tuple(int(k) for k in key)] = data[f'coords{i}']
+
     def generateThresholdMask(self, mask, dilation=0, preview=True):
         """ 
         Generate a dilated mask, based on a boolean array and previews the appication of
@@ -621,25 +949,16 @@ class Map(base.Map):
 
     def applyThresholdMask(self):
         """ Apply mask to all DIC map data by setting masked values to nan.
+        Masks applied previously are kept.
 
         """
-        self.eMaxShear = np.where(self.mask == True, np.nan, self.eMaxShear)
-
-        self.e11 = np.where(self.mask == True, np.nan, self.e11)
-        self.e12 = np.where(self.mask == True, np.nan, self.e12)
-        self.e22 = np.where(self.mask == True, np.nan, self.e22)
-
-        self.f11 = np.where(self.mask == True, np.nan, self.f11)
-        self.f12 = np.where(self.mask == True, np.nan, self.f12)
-        self.f22 = np.where(self.mask == True, np.nan, self.f22)
-
-        self.x_map = np.where(self.mask == True, np.nan, self.x_map)
-        self.y_map = np.where(self.mask == True, np.nan, self.y_map)
+        if self.appliedMask is None:
+            self.appliedMask = np.array(self.mask, dtype=bool)
+        else:
+            self.appliedMask = self.appliedMask | self.mask
 
-        self.component = {'f11': self.f11, 'f12': self.f12, 'f21': self.f21, 'f22': self.f22,
-                 'e11': self.e11, 'e12': self.e12, 'e22': self.e22,
-                 'eMaxShear': self.eMaxShear,
-                 'x_map': self.x_map, 'y_map': self.y_map}
+        # map components are recalculated with the mask when next used
+        self.clearComponentCache()
 
     @property
     def boundaries(self):
@@ -656,8 +975,8 @@ class Map(base.Map):
         boundaries = boundaries > 0.1
 
         boundaries = mph.skeletonize(boundaries)
-        mph.remove_small_objects(boundaries, min_size=10, in_place=True,
-                                 connectivity=2)
+        boundaries = mph.remove_small_objects(boundaries, min_size=10,
+                                              connectivity=2)
 
         # crop image if it is a simple affine transform
         if type(self.ebsdTransform) is tf.AffineTransform:
@@ -834,18 +1153,14 @@ class Map(base.Map):
             index = np.digitize(self.grains.ravel(), old, right=True)
             self.grains = new[index].reshape(self.grains.shape)
 
+            self.buildGrainIndex()
+
             self.grainList = []
-            for i, (dicGrainId, ebsdGrainId) in enumerate(zip(dicGrainIds, self.ebsdGrainIds)):
-                yield i / len(dicGrainIds)          # Report progress
+            for i, ebsdGrainId in enumerate(self.ebsdGrainIds):
+                yield i / len(self.ebsdGrainIds)          # Report progress
 
                 # Make grain object
-                currentGrain = Grain(grainID=dicGrainId, dicMap=self)
-
-                # Find (x,y) coordinates and corresponding max shears of grain
-                coords = np.argwhere(self.grains == dicGrainId)       # (y,x)
-                currentGrain.coordList = np.flip(coords, axis=1)      # (x,y)
-                currentGrain.maxShearList = self.eMaxShear[coords[:,0]+ self.cropDists[1, 0], 
-                                                           coords[:,1]+ self.cropDists[0, 0]]
+                currentGrain = Grain(grainID=i, dicMap=self)
 
                 # Assign EBSD grain ID to DIC grain and increment grain list
                 currentGrain.ebsdGrainId = ebsdGrainId - 1
@@ -874,17 +1189,15 @@ class Map(base.Map):
             while found_point >= 0:
                 # Flood fill first unknown point and return grain object
                 idx = np.unravel_index(next_point, self.grains.shape)
-                currentGrain = self.floodFill(idx[1], idx[0], grainIndex,
+                filledPoints = self.floodFill(idx[1], idx[0], grainIndex,
                                               points_left)
 
-                if len(currentGrain) < minGrainSize:
+                if len(filledPoints) < minGrainSize:
                     # if grain size less than minimum, ignore grain and set
                     # values in grain map to -2
-                    for coord in currentGrain.coordList:
-                        self.grains[coord[1], coord[0]] = -2
+                    self.grains[filledPoints[:, 1], filledPoints[:, 0]] = -2
                 else:
-                    # add grain to list and increment grain index
-                    self.grainList.append(currentGrain)
+                    # increment grain index
                     grainIndex += 1
 
                 # find next search point
@@ -898,6 +1211,10 @@ class Map(base.Map):
                     yield 1. - points_left_sub.sum() / total_points
                     i = 0
 
+            self.buildGrainIndex()
+            for i in range(grainIndex - 1):
+                self.grainList.append(Grain(i, self))
+
             # Now link grains to those in ebsd Map
             # Warp DIC grain map to EBSD frame
             dicGrains = self.grains
@@ -917,7 +1234,7 @@ class Map(base.Map):
                 # selected grain from the warped dic grain image. The modal
                 # value is the EBSD grain label.
                 modeId, _ = mode(self.ebsdMap.grains[warpedDicGrains == i + 1])
-                ebsd_grain_idx = modeId[0] - 1
+                ebsd_grain_idx = int(np.ravel(modeId)[0]) - 1
                 self.ebsdGrainIds.append(ebsd_grain_idx)
                 self[i].ebsdGrainId = ebsd_grain_idx
                 self[i].ebsdGrain = self.ebsdMap[ebsd_grain_idx]
@@ -928,8 +1245,8 @@ class Map(base.Map):
 
     def floodFill(self, x, y, grainIndex, points_left):
         """Flood fill algorithm that uses the combined x and y boundary array 
-        to fill a connected area around the seed point. The points are inserted
-        into a grain object and the grain map array is updated.
+        to fill a connected area around the seed point. The grain map array
+        is updated with the grain index.
 
         Parameters
         ----------
@@ -944,22 +1261,18 @@ class Map(base.Map):
 
         Returns
         -------
-        currentGrain : defdap.hrdic.Grain
-            New grain object with points added
+        numpy.ndarray
+            Coordinates (x, y) of the filled points, shape (n, 2).
 
         """
-        # create new grain
-        currentGrain = Grain(grainIndex - 1, self)
-
         # add first point to the grain
-        currentGrain.addPoint((x, y), self.eMaxShear[y + self.cropDists[1, 0],
-                                                     x + self.cropDists[0, 0]])
+        filledPoints = [(x, y)]
         self.grains[y, x] = grainIndex
         points_left[y, x] = False
-        edge = [(x, y)]
+        edge = deque([(x, y)])
 
         while edge:
-            x, y = edge.pop(0)
+            x, y = edge.popleft()
 
             moves = [(x+1, y), (x-1, y), (x, y+1), (x, y-1)]
             # get rid of any that go out of the map area
@@ -983,15 +1296,11 @@ class Map(base.Map):
                     addPoint = True
 
                 if addPoint:
-                    currentGrain.addPoint(
-                        (s, t),
-                        self.eMaxShear[t + self.cropDists[1, 0],
-                                       s + self.cropDists[0, 0]]
-                    )
+                    filledPoints.append((s, t))
                     self.grains[t, s] = grainIndex
                     points_left[t, s] = False
 
-        return currentGrain
+        return np.array(filledPoints)
 
     def runGrainInspector(self, vmax=0.1, corrAngle=None):
         """Run the grain inspector interactive tool.
@@ -1009,6 +1318,573 @@ class Map(base.Map):
         GrainInspector(currMap=self, vmax=vmax, corrAngle=corrAngle)
 
 
+class MapComponents(Mapping):
+    """Read only mapping of component names to maps of a DIC map.
+    Components are calculated when they are first accessed.
+
+    """
+    def __init__(self, dicMap):
+        """
+
+        Parameters
+        ----------
+        dicMap : defdap.hrdic.Map
+            DIC map the components are of.
+
+        """
+        self.dicMap = dicMap
+
+    def __getitem__(self, name):
+        if name not in self.dicMap.componentNames:
+            raise KeyError(name)
+        return self.dicMap.getComponent(name)
+
+    def __iter__(self):
+        return iter(self.dicMap.componentNames)
+
+    def __len__(self):
+        return len(self.dicMap.componentNames)
+
+
+class MapSeries(object):
+    """
+    Class to encapsulate a series of DIC maps of the same area at
+    successive load steps. Steps are loaded when first used. Crop,
+    threshold mask, homologous points, EBSD link and grains are set up
+    once on a reference step and shared by all steps in the series.
+
+    Attributes
+    ----------
+    path : str
+        File path.
+    fnames : list of str
+        File names of the steps, in load order.
+    dataType : str
+        Type of data files.
+    dtype : type
+        Floating point type of the displacements and map components.
+    cumulativeData : bool
+        True if displacements of each step are relative to the
+        undeformed image, False if relative to the previous step.
+    refStep : int
+        Step used for setting homologous points and finding grains.
+    maxLoaded : int
+        Maximum number of steps kept loaded, all are kept if None.
+    refMap : defdap.hrdic.Map
+        Map of the reference step, holds the shared state.
+
+    """
+    def __init__(self, path, fnames, dataType=None, dtype=np.float64,
+                 cumulativeData=True, refStep=-1, maxLoaded=None):
+        """Initialise the series and load the reference step.
+
+        Parameters
+        ----------
+        path : str
+            Path to files.
+        fnames : list of str
+            Names of the files of each step including extension, in
+            load order.
+        dataType : str, optional
+            Type of data files.
+        dtype : type, optional
+            Floating point type of the displacements and map components.
+        cumulativeData : bool, optional
+            True if displacements of each step are relative to the
+            undeformed image, False if relative to the previous step.
+        refStep : int, optional
+            Step used for setting homologous points and finding grains,
+            defaults to the last step.
+        maxLoaded : int, optional
+            Maximum number of steps kept loaded. The least recently
+            used steps are unloaded and reloaded when needed. All steps
+            are kept if None.
+
+        """
+        if len(fnames) < 1:
+            raise ValueError("A map series must have at least one step.")
+
+        self.path = path
+        self.fnames = list(fnames)
+        self.dataType = dataType
+        self.dtype = dtype
+        self.cumulativeData = cumulativeData
+        self.refStep = range(len(self.fnames))[refStep]
+        self.maxLoaded = maxLoaded
+
+        self.loadedMaps = OrderedDict()     # loaded maps keyed by step
+        self.refMap = self.loadStep(self.refStep)
+
+    def __len__(self):
+        return len(self.fnames)
+
+    def __getitem__(self, step):
+        return self.loadStep(step)
+
+    def __iter__(self):
+        for step in range(len(self)):
+            yield self.loadStep(step)
+
+    def loadStep(self, step):
+        """Get the map of a step, loading it and applying the shared
+        state of the series if not already loaded.
+
+        Parameters
+        ----------
+        step : int
+            Index of the step.
+
+        Returns
+        -------
+        defdap.hrdic.Map
+
+        """
+        step = range(len(self))[step]
+
+        dicMap = self.loadedMaps.get(step)
+        if dicMap is not None:
+            self.loadedMaps.move_to_end(step)
+            return dicMap
+
+        dicMap = Map(self.path, self.fnames[step], dataType=self.dataType,
+                     dtype=self.dtype)
+        if step != self.refStep:
+            self._shareState(dicMap)
+        self.loadedMaps[step] = dicMap
+
+        # unload least recently used steps, keeping the reference
+        if self.maxLoaded is not None:
+            for oldStep in list(self.loadedMaps):
+                if len(self.loadedMaps) <= max(self.maxLoaded, 1):
+                    break
+                if oldStep not in (step, self.refStep):
+                    del self.loadedMaps[oldStep]
+
+        return dicMap
+
+    def unloadStep(self, step):
+        """Unload the map of a step to free memory. It is loaded again
+        when next used. The reference step is always kept loaded.
+
+        Parameters
+        ----------
+        step : int
+            Index of the step.
+
+        """
+        step = range(len(self))[step]
+        if step != self.refStep:
+            self.loadedMaps.pop(step, None)
+
+    def _shareState(self, dicMap):
+        """Copy the state shared by the series from the reference map
+        to another map.
+
+        Parameters
+        ----------
+        dicMap : defdap.hrdic.Map
+            Map to update.
+
+        """
+        refMap = self.refMap
+        if (dicMap.xdim, dicMap.ydim) != (refMap.xdim, refMap.ydim):
+            raise ValueError("Dimensions of DIC maps in series do not match")
+
+        dicMap.setCrop(xMin=refMap.cropDists[0, 0], xMax=refMap.cropDists[0, 1],
+                       yMin=refMap.cropDists[1, 0], yMax=refMap.cropDists[1, 1])
+        dicMap.homogPoints = refMap.homogPoints
+        dicMap.bseScale = refMap.bseScale
+        dicMap.patternImPath = refMap.patternImPath
+        dicMap.patScale = refMap.patScale
+
+        dicMap.mask = refMap.mask
+        dicMap.appliedMask = refMap.appliedMask
+        dicMap.clearComponentCache()
+
+        dicMap.ebsdMap = refMap.ebsdMap
+        dicMap.ebsdTransform = refMap.ebsdTransform
+        dicMap.ebsdTransformInv = refMap.ebsdTransformInv
+        dicMap.warpCoordsCache = refMap.warpCoordsCache
+        for attr in ('boundaryLines', 'phaseBoundaryLines'):
+            if hasattr(refMap, attr):
+                setattr(dicMap, attr, getattr(refMap, attr))
+
+        if refMap.checkGrainsDetected(raiseExc=False):
+            dicMap.grains = refMap.grains
+            dicMap.grainPointIdxs = refMap.grainPointIdxs
+            dicMap.grainOffsets = refMap.grainOffsets
+            dicMap.ebsdGrainIds = refMap.ebsdGrainIds
+            dicMap.grainMapCache = None
+            dicMap.neighbourNetwork = None
+
+            dicMap.grainList = []
+            for refGrain in refMap:
+                grain = Grain(refGrain.grainID, dicMap)
+                grain.ebsdGrainId = refGrain.ebsdGrainId
+                grain.ebsdGrain = refGrain.ebsdGrain
+                grain.ebsdMap = refGrain.ebsdMap
+                dicMap.grainList.append(grain)
+
+    def _updateLoaded(self):
+        """Apply the shared state of the reference map to all other
+        loaded maps.
+
+        """
+        for step, dicMap in self.loadedMaps.items():
+            if step != self.refStep:
+                self._shareState(dicMap)
+
+    def setCrop(self, **kwargs):
+        """Set a crop for all maps in the series.
+
+        Parameters
+        ----------
+        kwargs
+            All arguments are passed to :func:`defdap.hrdic.Map.setCrop`.
+
+        """
+        self.refMap.setCrop(**kwargs)
+        self._updateLoaded()
+
+    def setScale(self, micrometrePerPixel):
+        """Sets the scale of all maps in the series.
+
+        Parameters
+        ----------
+        micrometrePerPixel : float
+            Length of pixel in original BSE image in micrometres.
+
+        """
+        self.refMap.setScale(micrometrePerPixel)
+        self._updateLoaded()
+
+    def setPatternPath(self, filePath, windowSize):
+        """Set the path to the image of the pattern of the reference
+        step.
+
+        Parameters
+        ----------
+        filePath : str
+            Path to image.
+        windowSize : float
+            Size of pixel in pattern image relative to pixel size of
+            DIC data.
+
+        """
+        self.refMap.setPatternPath(filePath, windowSize)
+        self._updateLoaded()
+
+    def setHomogPoint(self, points=None, display=None, **kwargs):
+        """Set homologous points on the reference step. Uses
+        interactive GUI if points is None.
+
+        Parameters
+        ----------
+        points : list, optional
+            homologous points to set.
+        display : string, optional
+            Use max shear map if set to 'maxshear' or pattern if set to
+            'pattern'.
+        kwargs
+            All other arguments are passed to
+            :func:`defdap.hrdic.Map.setHomogPoint`.
+
+        """
+        self.refMap.setHomogPoint(points=points, display=display, **kwargs)
+        self._updateLoaded()
+
+    @property
+    def homogPoints(self):
+        return self.refMap.homogPoints
+
+    @homogPoints.setter
+    def homogPoints(self, points):
+        self.refMap.homogPoints = points
+        self._updateLoaded()
+
+    def linkEbsdMap(self, ebsdMap, transformType="affine", order=2):
+        """Calculate the transformation to align an EBSD map to the
+        series once and share it with all steps.
+
+        Parameters
+        ----------
+        ebsdMap : defdap.ebsd.Map
+            EBSD map object to link.
+        transformType : str, optional
+            affine, piecewiseAffine or polynomial.
+        order : int, optional
+            Order of polynomial transform to apply.
+
+        """
+        self.refMap.linkEbsdMap(ebsdMap, transformType=transformType,
+                                order=order)
+        self._updateLoaded()
+
+    def findGrains(self, algorithm=None, minGrainSize=10):
+        """Find grains once on the reference step and share them with
+        all steps.
+
+        Parameters
+        ----------
+        algorithm : str {'warp', 'floodfill'}
+            Use floodfill or warp algorithm.
+        minGrainSize : int
+            Minimum grain area in pixels for floodfill algorithm.
+
+        """
+        self.refMap.findGrains(algorithm=algorithm, minGrainSize=minGrainSize)
+        self._updateLoaded()
+
+    def generateThresholdMask(self, mask, dilation=0, preview=True):
+        """Generate a mask for the series, previewed on the reference
+        step.
+
+        Parameters
+        ----------
+        mask : numpy.array(bool)
+            A boolean array where points to be removed are True.
+        dilation : int, optional
+            Number of pixels to dilate the mask by.
+        preview : bool
+            If true, show the mask and preview the masked effective
+            shear strain map.
+
+        """
+        self.refMap.generateThresholdMask(mask, dilation=dilation,
+                                          preview=preview)
+        self._updateLoaded()
+
+    def applyThresholdMask(self):
+        """Apply the mask to all maps in the series by setting masked
+        values to nan.
+
+        """
+        self.refMap.applyThresholdMask()
+        self._updateLoaded()
+
+    def defGrad(self, step, incremental=False):
+        """Deformation gradient of a step.
+
+        The incremental deformation gradient Fi of a step is found from
+        the cumulative deformation gradients of it and the previous
+        step as F(n) = Fi(n) F(n-1). Points are taken as fixed in the
+        map when combining steps.
+
+        Parameters
+        ----------
+        step : int
+            Index of the step.
+        incremental : bool, optional
+            If True, deformation from the previous step, otherwise
+            from the undeformed state.
+
+        Returns
+        -------
+        tuple of numpy.ndarray
+            Components f11, f12, f21 and f22.
+
+        """
+        step = range(len(self))[step]
+
+        if self.cumulativeData:
+            defGrad = self._stepDefGrad(step)
+            if incremental and step > 0:
+                defGrad = _matMul2(defGrad, _inv2(self._stepDefGrad(step - 1)))
+            return defGrad
+
+        if incremental:
+            return self._stepDefGrad(step)
+        for defGrad in self._iterDefGrads(incremental=False, stop=step + 1):
+            pass
+        return defGrad
+
+    def _stepDefGrad(self, step):
+        dicMap = self.loadStep(step)
+        return dicMap.f11, dicMap.f12, dicMap.f21, dicMap.f22
+
+    def _iterDefGrads(self, incremental=False, stop=None):
+        """Deformation gradients of each step in turn, keeping a running
+        product for the cumulative deformation of incremental data.
+
+        Parameters
+        ----------
+        incremental : bool, optional
+            If True, deformation from the previous step, otherwise
+            from the undeformed state.
+        stop : int, optional
+            Step to stop before, defaults to the end of the series.
+
+        Yields
+        ------
+        tuple of numpy.ndarray
+            Components f11, f12, f21 and f22.
+
+        """
+        prevDefGrad = None
+        for step in range(len(self) if stop is None else stop):
+            stepDefGrad = self._stepDefGrad(step)
+
+            if prevDefGrad is None or self.cumulativeData != incremental:
+                defGrad = stepDefGrad
+            elif incremental:
+                defGrad = _matMul2(stepDefGrad, _inv2(prevDefGrad))
+            else:
+                defGrad = _matMul2(stepDefGrad, prevDefGrad)
+            yield defGrad
+
+            # keep the previous cumulative deformation gradient
+            prevDefGrad = stepDefGrad if self.cumulativeData else defGrad
+
+    def calcComponent(self, name, step, incremental=False):
+        """Calculate a map component of a step, from either the
+        incremental or cumulative deformation.
+
+        Parameters
+        ----------
+        name : str
+            Name of the component, one of `Map.componentNames`.
+        step : int
+            Index of the step.
+        incremental : bool, optional
+            If True, component of the deformation from the previous
+            step, otherwise from the undeformed state.
+
+        Returns
+        -------
+        numpy.ndarray
+            Map of the component, not cropped.
+
+        """
+        if name not in Map.componentNames:
+            raise ValueError(f"Unknown map component '{name}'.")
+        step = range(len(self))[step]
+
+        if (self.cumulativeData != incremental) or step == 0:
+            # component of the loaded data
+            return self.loadStep(step).getComponent(name)
+
+        if name in ('x_map', 'y_map'):
+            if incremental:
+                return (self.loadStep(step).getComponent(name) -
+                        self.loadStep(step - 1).getComponent(name))
+            return sum(self.loadStep(i).getComponent(name)
+                       for i in range(step + 1))
+
+        return _calcDefGradComponent(name, self.defGrad(step, incremental=incremental))
+
+    def grainHistory(self, name='eMaxShear', stat='mean', incremental=False,
+                     grainIds=-1, ignoreNan=False):
+        """Calculate a statistic of a map component for each grain at
+        every step of the series.
+
+        Parameters
+        ----------
+        name : str, optional
+            Name of the component, one of `Map.componentNames`.
+        stat : str, optional
+            Statistic to calculate, any of those of
+            :func:`defdap.base.Map.calcGrainStats`.
+        incremental : bool, optional
+            If True, component of the deformation from the previous
+            step, otherwise from the undeformed state.
+        grainIds : list of int or int, optional
+            IDs of grains to calculate for. Use -1 for all grains.
+        ignoreNan : bool, optional
+            If True, NaN values are excluded from the statistics.
+
+        Returns
+        -------
+        numpy.ndarray
+            Array of shape (number of steps, number of grains).
+
+        """
+        refMap = self.refMap
+        refMap.checkGrainsDetected()
+        if name not in Map.componentNames:
+            raise ValueError(f"Unknown map component '{name}'.")
+
+        deformationComponent = name not in ('x_map', 'y_map')
+        loadedComponent = (self.cumulativeData != incremental)
+        if deformationComponent and not loadedComponent:
+            steps = (_calcDefGradComponent(name, defGrad) for defGrad
+                     in self._iterDefGrads(incremental=incremental))
+        else:
+            steps = (self.calcComponent(name, step, incremental=incremental)
+                     for step in range(len(self)))
+
+        history = [
+            refMap.calcGrainStats(refMap.crop(mapData), stats=(stat,),
+                                  grainIds=grainIds, ignoreNan=ignoreNan)[stat]
+            for mapData in steps
+        ]
+
+        return np.array(history)
+
+
+def _matMul2(a, b):
+    """Product of two fields of 2x2 matrices given as tuples of
+    components (11, 12, 21, 22).
+
+    """
+    return (a[0] * b[0] + a[1] * b[2], a[0] * b[1] + a[1] * b[3],
+            a[2] * b[0] + a[3] * b[2], a[2] * b[1] + a[3] * b[3])
+
+
+def _inv2(a):
+    """Inverse of a field of 2x2 matrices given as a tuple of
+    components (11, 12, 21, 22).
+
+    """
+    det = a[0] * a[3] - a[1] * a[2]
+    return a[3] / det, -a[1] / det, -a[2] / det, a[0] / det
+
+
+def _calcDefGradComponent(name, defGrad):
+    """Calculate a map component from a deformation gradient.
+
+    Parameters
+    ----------
+    name : str
+        Name of the component, one of `Map.componentNames` except the
+        displacement maps.
+    defGrad : tuple of numpy.ndarray
+        Components f11, f12, f21 and f22.
+
+    Returns
+    -------
+    numpy.ndarray
+
+    """
+    f11, f12, f21, f22 = defGrad
+    if name in ('f11', 'f12', 'f21', 'f22'):
+        return defGrad[('f11', 'f12', 'f21', 'f22').index(name)]
+    if name == 'rotation':
+        return np.arctan2(f21 - f12, f11 + f22)
+
+    # Green strain E = (F^T F - I) / 2
+    e11 = 0.5 * (f11 * f11 + f21 * f21 - 1)
+    e22 = 0.5 * (f12 * f12 + f22 * f22 - 1)
+    e12 = 0.5 * (f11 * f12 + f21 * f22)
+    if name == 'e11':
+        return e11
+    if name == 'e22':
+        return e22
+    if name == 'e12':
+        return e12
+    if name == 'eVonMises':
+        return np.sqrt(2. / 3. * (e11**2 + e22**2 + (e11 + e22)**2 + 2 * e12**2))
+
+    eMaxShear = np.sqrt(((e11 - e22) / 2.)**2 + e12**2)
+    if name == 'eMaxShear':
+        return eMaxShear
+    if name == 'eMaxPrincipal':
+        return (e11 + e22) / 2. + eMaxShear
+    if name == 'eMinPrincipal':
+        return (e11 + e22) / 2. - eMaxShear
+
+    raise ValueError(f"Unknown map component '{name}'.")
+
+
 class Grain(base.Grain):
     """
     Class to encapsulate DIC grain data and useful analysis and plotting
@@ -1020,8 +1896,8 @@ class Grain(base.Grain):
         DIC map this grain is a member of
     ownerMap : defdap.hrdic.Map
         DIC map this grain is a member of
-    maxShearList : list
-        List of maximum shear values for grain.
+    maxShearList : numpy.ndarray
+        Maximum shear values at each point in grain.
     ebsdGrain : defdap.ebsd.Grain
         EBSD grain ID that this DIC grain corresponds to.
     ebsdMap : defdap.ebsd.Map
@@ -1038,7 +1914,6 @@ class Grain(base.Grain):
         super(Grain, self).__init__(grainID, dicMap)
 
         self.dicMap = self.ownerMap     # DIC map this grain is a member of
-        self.maxShearList = []
         self.ebsdGrain = None
         self.ebsdMap = None
 
@@ -1052,10 +1927,9 @@ class Grain(base.Grain):
             plotSlipBands=True, *args, **kwargs
         )
 
-    # coord is a tuple (x, y)
-    def addPoint(self, coord, maxShear):
-        self.coordList.append(coord)
-        self.maxShearList.append(maxShear)
+    @property
+    def maxShearList(self):
+        return self.grainData(self.dicMap.crop(self.dicMap.eMaxShear))
 
     def plotMaxShear(self, **kwargs):
         """Plot a maximum shear map for a grain.
@@ -246,7 +246,7 @@ class GrainInspector:
         grainInfoText = 'Grain ID: {0} / {1}\n'.format(self.grainID, len(self.currMap.grainList)-1)
         grainInfoText += 'Min: {0:.1f} %     Mean:{1:.1f} %     Max: {2:.1f} %'.format(
             np.min(self.currDICGrain.maxShearList)*100,
-            np.mean(self.currDICGrain.maxShearList)*100,
+            np.mean(self.currDICGrain.maxShearList, dtype=np.float64)*100,
             np.max(self.currDICGrain.maxShearList)*100)
         self.plot.addText(self.grainInfoAx, 0, 1, grainInfoText,  va='top', ha='left', fontsize=10)
         
@@ -405,7 +405,7 @@ class GrainInspector:
                     v.append((self.currMap.crop(self.currMap.y_map))[ymap, xmap])
 
                 ### Take away mean
-                u = u-np.mean(u); v = v-np.mean(v)
+                u = u-np.mean(u, dtype=np.float64); v = v-np.mean(v, dtype=np.float64)
 
                 ### Append to main lists (ulist,vlist)
                 ulist.extend(u)
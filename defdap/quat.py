@@ -230,6 +230,11 @@ class Quat(object):
 
     # overload * operator for quaternion product and vector product
     def __mul__(self, right: 'Quat', allow_southern: bool = False) -> 'Quat':
+        if isinstance(right, QuatArray):    # array of quats
+            return QuatArray(
+                _quatProduct(self.quatCoef, right.quatCoef),
+                allow_southern=allow_southern
+            )
         if isinstance(right, type(self)):   # another quat
             newQuatCoef = np.zeros(4, dtype=float)
             newQuatCoef[0] = (
@@ -385,14 +390,15 @@ class Quat(object):
         """
         if isinstance(right, type(self)):
             # looking for max of this as it is cos of misorientation angle
-            minMisOri = 0
-            # loop over symmetrically equivalent orientations
-            for sym in Quat.symEqv(symGroup):
-                quatSym = sym * right
-                currentMisOri = abs(self.dot(quatSym))
-                if currentMisOri > minMisOri:   # keep if misorientation lower
-                    minMisOri = currentMisOri
-                    minQuatSym = quatSym
+            minMisOri, symIndex = Quat.calcMaxSymDot(
+                self.quatCoef, right.quatCoef, symGroup, stream=False,
+                returnIndex=True
+            )
+            minMisOri = minMisOri[()]
+            if returnQuat in (1, 2):
+                minQuatSym = Quat(
+                    Quat.symEqvMatrices(symGroup)[symIndex] @ right.quatCoef
+                )
 
             if returnQuat == 1:
                 return minQuatSym
@@ -596,25 +602,13 @@ class Quat(object):
         quats : numpy.ndarray(defdap.quat.Quat)
             Array of quat objects of shape n x ... x m.
 
-        """
-        ph1 = eulerArray[0]
-        phi = eulerArray[1]
-        ph2 = eulerArray[2]
-        oriShape = eulerArray.shape[1:]
-
-        quatComps = np.zeros((4,) + oriShape, dtype=float)
-
-        quatComps[0] = np.cos(phi / 2.0) * np.cos((ph1 + ph2) / 2.0)
-        quatComps[1] = -np.sin(phi / 2.0) * np.cos((ph1 - ph2) / 2.0)
-        quatComps[2] = -np.sin(phi / 2.0) * np.sin((ph1 - ph2) / 2.0)
-        quatComps[3] = -np.cos(phi / 2.0) * np.sin((ph1 + ph2) / 2.0)
+        Notes
+        -----
+        A Quat object is created for every orientation, prefer
+        :func:`defdap.quat.QuatArray.fromEulerAngles` for large arrays.
 
-        quats = np.empty(oriShape, dtype=Quat)
-
-        for i, idx in enumerate(np.ndindex(oriShape)):
-            quats[idx] = Quat(quatComps[(slice(None),) + idx])
-
-        return quats
+        """
+        return QuatArray.fromEulerAngles(eulerArray).toQuats()
 
     @staticmethod
     def multiplyManyQuats(quats: List['Quat'], right: 'Quat') -> List['Quat']:
@@ -649,11 +643,12 @@ class Quat(object):
         """Return a NumPy array of the provided quaternion components
 
         Input quaternions may be given as a list of Quat objects or any iterable
-        whose items have 4 components which map to the quaternion.
+        whose items have 4 components which map to the quaternion. The
+        components of a QuatArray are returned directly without copying.
 
         Parameters
         ----------
-        quats : numpy.ndarray(defdap.quat.Quat)
+        quats : numpy.ndarray(defdap.quat.Quat) or defdap.quat.QuatArray
             A list of Quat objects to return the components of
 
         Returns
@@ -662,6 +657,9 @@ class Quat(object):
             Array of quaternion components, shape (4, ..)
 
         """
+        if isinstance(quats, QuatArray):
+            return quats.quatCoef
+
         quats = np.array(quats)
         quat_comps = np.empty((4,) + quats.shape)
         for idx in np.ndindex(quats.shape):
@@ -669,61 +667,264 @@ class Quat(object):
 
         return quat_comps
 
+    @staticmethod
+    def symEqvMatrices(
+        symGroup: str,
+        dtype: Optional[type] = np.float
+    ) -> np.ndarray:
+        """Calculate matrices that apply the symmetry operators of a
+        crystal type to quat components by left multiplication, so
+        that sym * quat is given by matrix @ quatComps.
+
+        Parameters
+        ----------
+        symGroup
+            Crystal type (cubic, hexagonal).
+        dtype
+            Data type of the matrices, defaults to np.float.
+
+        Returns
+        -------
+        numpy.ndarray, shape: (numSym x 4 x 4)
+            Matrix for each symmetry operator.
+
+        """
+        symComps = np.array([sym.quatCoef for sym in Quat.symEqv(symGroup)])
+        s0, s1, s2, s3 = symComps.T
+
+        symMatrices = np.array([
+            [s0, -s1, -s2, -s3],
+            [s1, s0, -s3, s2],
+            [s2, s3, s0, -s1],
+            [s3, -s2, s1, s0]
+        ], dtype=dtype)
+
+        return np.ascontiguousarray(symMatrices.transpose((2, 0, 1)))
+
     @staticmethod
     def calcSymEqvs(
-        quats: np.ndarray,
+        quats: Union[np.ndarray, 'QuatArray'],
         symGroup: str,
         dtype: Optional[type] = np.float
     ) -> np.ndarray:
-        """Calculate all symmetrically equivalent quaternions of given quaternions.
+        """Calculate all symmetrically equivalent quaternions of given
+        quaternions. All symmetry operators are applied in a single
+        batched matrix product.
 
         Parameters
         ----------
-        quats : numpy.ndarray(defdap.quat.Quat)
+        quats : numpy.ndarray(defdap.quat.Quat) or defdap.quat.QuatArray
             Array of quat objects.
         symGroup
             Crystal type (cubic, hexagonal).
         dtype
             Data type used for calculation, defaults to np.float.
+            Using np.float32 halves the memory required.
 
         Returns
         -------
         quatComps: numpy.ndarray, shape: (numSym x 4 x numQuats)
-            Array containing all symmetrically equivalent quaternion components of input quaternions.
+            Array containing all symmetrically equivalent quaternion
+            components of input quaternions.
+
+        """
+        symMatrices = Quat.symEqvMatrices(symGroup, dtype=dtype)
+        quatComps = np.asarray(Quat.extract_quat_comps(quats), dtype=dtype)
+
+        quatCompsSym = np.matmul(symMatrices, quatComps.reshape((4, -1)))
+        quatCompsSym = quatCompsSym.reshape(
+            (len(symMatrices),) + quatComps.shape
+        )
+
+        # swap into positive hemisphere if required
+        np.negative(quatCompsSym, out=quatCompsSym,
+                    where=quatCompsSym[:, 0:1] < 0)
+
+        return quatCompsSym
+
+    @staticmethod
+    def calcMaxSymDot(
+        quatComps: np.ndarray,
+        quatCompsRight: np.ndarray,
+        symGroup: str,
+        dtype: Optional[type] = np.float,
+        stream: Optional[bool] = True,
+        returnIndex: Optional[bool] = False
+    ) -> Union[np.ndarray, Tuple[np.ndarray, np.ndarray]]:
+        """Calculate the maximum absolute dot product between quats and
+        all symmetric equivalents of other quats, ie the cosine of
+        half the minimum misorientation angle between them.
+
+        Parameters
+        ----------
+        quatComps
+            Quat components, shape (4, n, ..., m).
+        quatCompsRight
+            Quat components to apply symmetries to, must broadcast
+            with `quatComps`.
+        symGroup
+            Crystal type (cubic, hexagonal).
+        dtype
+            Data type used for calculation, defaults to np.float.
+        stream
+            If True, reduce the maximum one symmetry operator at a time
+            without storing all equivalents. Otherwise, all dot products
+            are calculated in a single batched product.
+        returnIndex
+            If True, also return index of the symmetry operator giving
+            the maximum.
+
+        Returns
+        -------
+        numpy.ndarray
+            Maximum absolute dot product, shape (n, ..., m).
+        numpy.ndarray
+            Index of symmetry operator applied to `quatCompsRight` that
+            gives the maximum.
+
+        """
+        symMatrices = Quat.symEqvMatrices(symGroup, dtype=dtype)
+        quatComps = np.asarray(quatComps, dtype=dtype)
+        quatCompsRight = np.asarray(quatCompsRight, dtype=dtype)
+
+        if stream:
+            outShape = np.broadcast(quatComps[0], quatCompsRight[0]).shape
+            maxDot = np.full(outShape, -1, dtype=dtype)
+            maxIndex = np.zeros(outShape, dtype=int)
+            for i, symMatrix in enumerate(symMatrices):
+                # q . (S r) = (S^T q) . r
+                currentDot = np.abs(np.einsum(
+                    "i...,i...->...",
+                    np.tensordot(symMatrix.T, quatComps, axes=1),
+                    quatCompsRight
+                ))
+                better = currentDot > maxDot
+                maxDot[better] = currentDot[better]
+                maxIndex[better] = i
+        else:
+            dots = np.abs(np.einsum(
+                "sij,i...,j...->s...",
+                symMatrices, quatComps, quatCompsRight, optimize=True
+            ))
+            maxIndex = np.argmax(dots, axis=0)
+            maxDot = np.take_along_axis(dots, maxIndex[None], axis=0)[0]
+
+        if returnIndex:
+            return maxDot, maxIndex
+        return maxDot
+
+    @staticmethod
+    def calcMisOriPairs(
+        quats: Union[np.ndarray, 'Quat', 'QuatArray'],
+        quatsRight: Union[np.ndarray, 'Quat', 'QuatArray'],
+        symGroup: str,
+        returnAxis: Optional[bool] = False,
+        disorientation: Optional[bool] = False,
+        dtype: Optional[type] = np.float
+    ) -> Union[Tuple[np.ndarray, np.ndarray],
+               Tuple[np.ndarray, np.ndarray, np.ndarray]]:
+        """Calculate the misorientation between pairs of orientations
+        taking into account the symmetries of the crystal structure.
+        All pairs and symmetry operators are processed together.
+
+        Parameters
+        ----------
+        quats
+            Orientations. Quat components of shape (4, n, ..., m), a
+            quat array or a single quat.
+        quatsRight
+            Orientations to find misorientation to, must broadcast with
+            `quats`. A single quat is used as a reference for all.
+        symGroup
+            Crystal type (cubic, hexagonal).
+        returnAxis
+            If True, also return the misorientation axis.
+        disorientation
+            If True, the axis returned is the equivalent axis in the
+            fundamental zone, considering the symmetries of both
+            crystals and exchange of the 2 orientations.
+        dtype
+            Data type used for calculation, defaults to np.float.
+
+        Returns
+        -------
+        numpy.ndarray
+            Minimum misorientation angle in radians, shape (n, ..., m).
+        numpy.ndarray
+            Index of symmetry operator applied to `quatsRight` that
+            gives the minimum misorientation.
+        numpy.ndarray
+            Misorientation axis in the crystal frame as a unit vector,
+            shape (3, n, ..., m). Only returned if `returnAxis` is True.
 
         """
-        syms = Quat.symEqv(symGroup)
-        quatComps = np.empty((len(syms), 4, len(quats)), dtype=dtype)
-
-        # store quat components in array
-        quatComps[0] = Quat.extract_quat_comps(quats)
-
-        # calculate symmetrical equivalents
-        for i, sym in enumerate(syms[1:], start=1):
-            # sym[i] * quat for all points (* is quaternion product)
-            quatComps[i, 0, :] = (
-                quatComps[0, 0, :] * sym[0] - quatComps[0, 1, :] * sym[1] -
-                quatComps[0, 2, :] * sym[2] - quatComps[0, 3, :] * sym[3])
-            quatComps[i, 1, :] = (
-                quatComps[0, 0, :] * sym[1] + quatComps[0, 1, :] * sym[0] -
-                quatComps[0, 2, :] * sym[3] + quatComps[0, 3, :] * sym[2])
-            quatComps[i, 2, :] = (
-                quatComps[0, 0, :] * sym[2] + quatComps[0, 2, :] * sym[0] -
-                quatComps[0, 3, :] * sym[1] + quatComps[0, 1, :] * sym[3])
-            quatComps[i, 3, :] = (
-                quatComps[0, 0, :] * sym[3] + quatComps[0, 3, :] * sym[0] -
-                quatComps[0, 1, :] * sym[2] + quatComps[0, 2, :] * sym[1])
-
-            # swap into positive hemisphere if required
-            quatComps[i, :, quatComps[i, 0, :] < 0] *= -1
-
-        return quatComps
+        quatComps, quatCompsRight = (
+            np.asarray(quat.quatCoef if isinstance(quat, (Quat, QuatArray))
+                       else quat, dtype=dtype)
+            for quat in (quats, quatsRight)
+        )
+        # a single quat is used for all of the other orientations
+        nDim = max(quatComps.ndim, quatCompsRight.ndim)
+        quatComps = quatComps.reshape(
+            quatComps.shape + (1,) * (nDim - quatComps.ndim))
+        quatCompsRight = quatCompsRight.reshape(
+            quatCompsRight.shape + (1,) * (nDim - quatCompsRight.ndim))
+
+        maxDot, symIndex = Quat.calcMaxSymDot(
+            quatComps, quatCompsRight, symGroup, dtype=dtype, returnIndex=True
+        )
+        misOri = 2 * np.arccos(np.clip(maxDot, -1, 1))
+
+        if not returnAxis:
+            return misOri, symIndex
+
+        # misorientation from symmetric equivalent with minimum angle
+        symMatrices = Quat.symEqvMatrices(symGroup, dtype=dtype)
+        minQuatComps = np.einsum(
+            "...ij,j...->i...", symMatrices[symIndex],
+            np.broadcast_to(quatCompsRight, (4,) + symIndex.shape)
+        )
+        conjugate = quatComps * np.array([1, -1, -1, -1]).reshape(
+            (4,) + (1,) * (nDim - 1))
+        misOriQuat = _quatProduct(minQuatComps, conjugate)
+        misOriAxis = np.where(misOriQuat[0] < 0, -1, 1) * misOriQuat[1:]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            misOriAxis /= np.sqrt(np.sum(misOriAxis**2, axis=0))
+
+        if disorientation:
+            # equivalent axes are found by rotating by the symmetries
+            # and reversing (exchanging the orientations). The
+            # fundamental zone is the equivalent closest to a point
+            # inside of it as the symmetries and reversal form a
+            # reflection group
+            symComps = np.array([sym.quatCoef for sym in
+                                 Quat.symEqv(symGroup)]).T
+            symRotMatrices = QuatArray(symComps).rotMatrix().astype(dtype)
+            axes = np.einsum("ijs,j...->si...", symRotMatrices, misOriAxis)
+            axes = np.concatenate((axes, -axes))
+
+            if symGroup == 'cubic':
+                # u >= v >= w >= 0
+                zoneVector = np.array([3, 2, 1])
+            else:
+                # w >= 0 and 0 <= angle of (u, v) from x <= 30 degrees
+                zoneVector = np.array([np.cos(np.pi / 12),
+                                       np.sin(np.pi / 12), 1])
+            bestAxis = np.argmax(np.einsum("si...,i->s...", axes, zoneVector),
+                                 axis=0)
+            misOriAxis = np.take_along_axis(axes, bestAxis[None, None],
+                                            axis=0)[0]
+
+        return misOri, symIndex, misOriAxis
 
     @staticmethod
     def calcAverageOri(
         quatComps: np.ndarray
     ) -> 'Quat':
-        """Calculate the average orientation of given quats.
+        """Calculate the average orientation of given quats. The
+        symmetric equivalent of each quat closest to the first quat is
+        averaged, then this is repeated once with the closest to the
+        average.
 
         Parameters
         ----------
@@ -737,20 +938,17 @@ class Quat(object):
             Average orientation of input quaternions.
 
         """
-        avOri = np.copy(quatComps[0, :, 0])
-        currMisOris = np.empty(quatComps.shape[0])
-
-        for i in range(1, quatComps.shape[2]):
-            # calculate misorientation between current average and all
-            # symmetrical equivalents. Dot product of each symm quat in
-            # quatComps with refOri for point i
-            currMisOris[:] = abs(np.einsum(
-                "ij,j->i", quatComps[:, :, i], avOri
-            ))
-
-            # find min misorientation with current average then add to it
-            maxIdx = np.argmax(currMisOris[:])
-            avOri += quatComps[maxIdx, :, i]
+        pointIdxs = np.arange(quatComps.shape[2])
+        avOri = quatComps[0, :, 0]
+
+        for _ in range(2):
+            # dot product of each symm quat in quatComps with current
+            # average, keep closest and on the same side as the average
+            dots = np.einsum("ijk,j->ik", quatComps, avOri)
+            maxIdxs = np.argmax(np.abs(dots), axis=0)
+            signs = np.where(dots[maxIdxs, pointIdxs] < 0, -1, 1)
+            avOri = np.einsum("kj,k->j", quatComps[maxIdxs, :, pointIdxs],
+                              signs)
 
         # Convert components back to a quat and normalise
         avOri = Quat(avOri)
@@ -758,6 +956,90 @@ class Quat(object):
 
         return avOri
 
+    @staticmethod
+    def calcAverageOris(
+        quats: Union[np.ndarray, 'QuatArray'],
+        symGroup: str,
+        groupOffsets: Optional[np.ndarray] = None,
+        numRefine: Optional[int] = 1,
+        method: Optional[str] = 'mean',
+        dtype: Optional[type] = np.float
+    ) -> 'QuatArray':
+        """Calculate the average orientation of groups of quats, e.g.
+        the grains of a map, all at once. Each quat is replaced by its
+        symmetric equivalent closest to the first quat of its group and
+        the average taken. This is repeated with the closest to the
+        average for each refinement pass.
+
+        Parameters
+        ----------
+        quats
+            Quat components, shape (4, n), sorted by group.
+        symGroup
+            Crystal type (cubic, hexagonal).
+        groupOffsets
+            Start of each group in `quats` with the total number of
+            quats as the last element. Groups must not be empty. All
+            quats are one group if not given.
+        numRefine
+            Number of refinement passes.
+        method
+            'mean' for the normalised sum of quats or 'markley' for the
+            eigenvector of the largest eigenvalue of the sum of outer
+            products of quats (Markley et al., 2007).
+        dtype
+            Data type used for calculation, defaults to np.float.
+
+        Returns
+        -------
+        defdap.quat.QuatArray
+            Average orientation of each group, shape (number of groups,).
+
+        """
+        if method not in ('mean', 'markley'):
+            raise ValueError(f"Unknown averaging method '{method}', must be "
+                             f"'mean' or 'markley'.")
+
+        quatComps = np.asarray(quats.quatCoef if isinstance(quats, QuatArray)
+                               else quats, dtype=dtype).reshape((4, -1))
+        if groupOffsets is None:
+            groupOffsets = [0, quatComps.shape[1]]
+        groupStarts = np.asarray(groupOffsets)[:-1]
+        groupIds = np.repeat(np.arange(len(groupStarts)),
+                             np.diff(groupOffsets))
+        symMatrices = Quat.symEqvMatrices(symGroup, dtype=dtype)
+
+        avOris = quatComps[:, groupStarts]
+        eqvComps = np.empty_like(quatComps)
+        for _ in range(numRefine + 1):
+            # symmetric equivalent of each quat closest to the average
+            # of its group
+            _, symIndex = Quat.calcMaxSymDot(
+                avOris[:, groupIds], quatComps, symGroup, dtype=dtype,
+                returnIndex=True
+            )
+            for i, symMatrix in enumerate(symMatrices):
+                isSym = symIndex == i
+                eqvComps[:, isSym] = symMatrix @ quatComps[:, isSym]
+
+            if method == 'markley':
+                # upper triangle of the sum of outer products per group
+                outerSum = np.empty((len(groupStarts), 4, 4), dtype=dtype)
+                for i, j in zip(*np.triu_indices(4)):
+                    outerSum[:, i, j] = outerSum[:, j, i] = np.add.reduceat(
+                        eqvComps[i] * eqvComps[j], groupStarts
+                    )
+                avOris = np.linalg.eigh(outerSum)[1][:, :, -1].T
+            else:
+                # on the same side as the current average
+                eqvComps[:, np.einsum("ij,ij->j", avOris[:, groupIds],
+                                      eqvComps) < 0] *= -1
+                avOris = np.add.reduceat(eqvComps, groupStarts, axis=1)
+
+            avOris = avOris / np.sqrt(np.sum(avOris**2, axis=0))
+
+        return QuatArray(avOris)
+
     @staticmethod
     def calcMisOri(
         quatComps: np.ndarray,
@@ -1089,3 +1371,568 @@ class Quat(object):
         except KeyError:
             # return just identity if unknown structure
             return [Quat(1.0, 0.0, 0.0, 0.0)]
+
+
+class QuatArray(object):
+    """Class used to store and operate on an array of quaternions. The
+    components are held in a single contiguous array of shape
+    (4, n, ..., m) and Quat objects are only created when individual
+    elements are requested. As for Quat, these are interpreted in the
+    passive sense.
+
+    """
+    __slots__ = ['quatCoef']
+
+    def __init__(
+        self,
+        quatCoef: np.ndarray,
+        allow_southern: Optional[bool] = False
+    ) -> None:
+        """
+        Construct a QuatArray object from an array of quat components.
+
+        Parameters
+        ----------
+        quatCoef
+            Array of quat components of shape (4, n, ..., m).
+        allow_southern
+            if False, move quats to northern hemisphere.
+
+        """
+        quatCoef = np.asarray(quatCoef)
+        if quatCoef.ndim < 1 or quatCoef.shape[0] != 4:
+            raise TypeError("Array input must have 4 components along "
+                            "the first axis")
+        if not np.issubdtype(quatCoef.dtype, np.floating):
+            quatCoef = quatCoef.astype(float)
+
+        # move to northern hemisphere
+        if not allow_southern and np.any(quatCoef[0] < 0):
+            quatCoef = np.where(quatCoef[0] < 0, -quatCoef, quatCoef)
+
+        self.quatCoef = quatCoef
+
+    @classmethod
+    def fromEulerAngles(cls, eulerArray: np.ndarray) -> 'QuatArray':
+        """Create a QuatArray object from an array of Bunge Euler angles.
+
+        Parameters
+        ----------
+        eulerArray
+            Array of Bunge Euler angles (in radians) of shape
+            (3, n, ..., m).
+
+        Returns
+        -------
+        defdap.quat.QuatArray
+            Initialised QuatArray object of shape (n, ..., m).
+
+        """
+        ph1 = eulerArray[0]
+        phi = eulerArray[1]
+        ph2 = eulerArray[2]
+
+        quatCoef = np.empty((4,) + eulerArray.shape[1:], dtype=float)
+
+        quatCoef[0] = np.cos(phi / 2.0) * np.cos((ph1 + ph2) / 2.0)
+        quatCoef[1] = -np.sin(phi / 2.0) * np.cos((ph1 - ph2) / 2.0)
+        quatCoef[2] = -np.sin(phi / 2.0) * np.sin((ph1 - ph2) / 2.0)
+        quatCoef[3] = -np.cos(phi / 2.0) * np.sin((ph1 + ph2) / 2.0)
+
+        return cls(quatCoef)
+
+    def rotMatrix(self) -> np.ndarray:
+        """Calculate the rotation matrix representation for each
+        rotation, see :func:`defdap.quat.Quat.rotMatrix`.
+
+        Returns
+        -------
+        rotMatrix : numpy.ndarray, shape (3, 3, n, ..., m)
+            Rotation matrices.
+
+        """
+        rotMatrix = np.empty((3, 3) + self.shape, dtype=self.quatCoef.dtype)
+
+        q = self.quatCoef
+        qbar = q[0]**2 - q[1]**2 - q[2]**2 - q[3]**2
+
+        rotMatrix[0, 0] = qbar + 2 * q[1]**2
+        rotMatrix[0, 1] = 2 * (q[1] * q[2] - q[0] * q[3])
+        rotMatrix[0, 2] = 2 * (q[1] * q[3] + q[0] * q[2])
+
+        rotMatrix[1, 0] = 2 * (q[1] * q[2] + q[0] * q[3])
+        rotMatrix[1, 1] = qbar + 2 * q[2]**2
+        rotMatrix[1, 2] = 2 * (q[2] * q[3] - q[0] * q[1])
+
+        rotMatrix[2, 0] = 2 * (q[1] * q[3] - q[0] * q[2])
+        rotMatrix[2, 1] = 2 * (q[2] * q[3] + q[0] * q[1])
+        rotMatrix[2, 2] = qbar + 2 * q[3]**2
+
+        return rotMatrix
+
+    @classmethod
+    def fromRotMatrix(cls, rotMatrix: np.ndarray) -> 'QuatArray':
+        """Create a QuatArray object from an array of rotation matrices,
+        the inverse of :func:`defdap.quat.QuatArray.rotMatrix`. Each
+        component is calculated from the largest of the diagonal terms
+        and trace to avoid loss of precision.
+
+        Parameters
+        ----------
+        rotMatrix
+            Array of rotation matrices of shape (3, 3, n, ..., m).
+
+        Returns
+        -------
+        defdap.quat.QuatArray
+            Initialised QuatArray object of shape (n, ..., m).
+
+        """
+        rotMatrix = np.asarray(rotMatrix, dtype=float)
+        R = rotMatrix
+        trace = R[0, 0] + R[1, 1] + R[2, 2]
+
+        # 4 times the square of each component, which are used to
+        # select the branch for each matrix
+        quatSq = np.stack((
+            1 + trace,
+            1 + R[0, 0] - R[1, 1] - R[2, 2],
+            1 - R[0, 0] + R[1, 1] - R[2, 2],
+            1 - R[0, 0] - R[1, 1] + R[2, 2],
+        ))
+        largest = np.argmax(quatSq, axis=0)
+        # 4 times the product of each pair of components
+        q0q1 = R[2, 1] - R[1, 2]
+        q0q2 = R[0, 2] - R[2, 0]
+        q0q3 = R[1, 0] - R[0, 1]
+        q1q2 = R[0, 1] + R[1, 0]
+        q1q3 = R[0, 2] + R[2, 0]
+        q2q3 = R[1, 2] + R[2, 1]
+        products = np.stack((
+            np.stack((quatSq[0], q0q1, q0q2, q0q3)),
+            np.stack((q0q1, quatSq[1], q1q2, q1q3)),
+            np.stack((q0q2, q1q2, quatSq[2], q2q3)),
+            np.stack((q0q3, q1q3, q2q3, quatSq[3])),
+        ))
+
+        quatCoef = np.take_along_axis(products, largest[None, None],
+                                      axis=0)[0]
+        quatCoef /= 2 * np.sqrt(np.take_along_axis(quatSq, largest[None],
+                                                   axis=0))
+
+        return cls(quatCoef)
+
+    @classmethod
+    def fromAxisAngle(
+        cls,
+        axis: np.ndarray,
+        angle: np.ndarray
+    ) -> 'QuatArray':
+        """Create a QuatArray object from arrays of rotation axes and
+        angles, see :func:`defdap.quat.Quat.fromAxisAngle`.
+
+        Parameters
+        ----------
+        axis
+            Axes that the rotations are applied around, shape
+            (3, n, ..., m). These do not need to be unit vectors.
+        angle
+            Magnitude of rotations in radians, shape (n, ..., m).
+
+        Returns
+        -------
+        defdap.quat.QuatArray
+            Initialised QuatArray object of shape (n, ..., m).
+
+        """
+        axis = np.asarray(axis, dtype=float)
+        angle = np.asarray(angle, dtype=float)
+        axis = axis / np.sqrt(np.sum(axis**2, axis=0))
+
+        quatCoef = np.empty((4,) + np.broadcast(axis[0], angle).shape,
+                            dtype=float)
+        quatCoef[0] = np.cos(angle / 2)
+        quatCoef[1:4] = -np.sin(angle / 2) * axis
+
+        return cls(quatCoef)
+
+    @classmethod
+    def fromRodrigues(cls, rodVector: np.ndarray) -> 'QuatArray':
+        """Create a QuatArray object from an array of Rodrigues vectors,
+        the rotation axis scaled by tan of half the rotation angle.
+        Vectors with infinite components are taken as rotations of pi
+        about the axis given by the signs of those components.
+
+        Parameters
+        ----------
+        rodVector
+            Array of Rodrigues vectors of shape (3, n, ..., m).
+
+        Returns
+        -------
+        defdap.quat.QuatArray
+            Initialised QuatArray object of shape (n, ..., m).
+
+        """
+        rodVector = np.asarray(rodVector, dtype=float)
+        isInf = np.isinf(rodVector)
+        halfTurn = np.any(isInf, axis=0)
+
+        finiteVector = np.where(halfTurn, 0., rodVector)
+        quatCoef = np.empty((4,) + rodVector.shape[1:], dtype=float)
+        quatCoef[0] = 1 / np.sqrt(1 + np.sum(finiteVector**2, axis=0))
+        quatCoef[1:4] = -finiteVector * quatCoef[0]
+
+        # rotations of pi, only the signs of the infinite components
+        # are known
+        if np.any(halfTurn):
+            axis = -np.sign(rodVector[:, halfTurn]) * isInf[:, halfTurn]
+            quatCoef[0, halfTurn] = 0
+            quatCoef[1:4, halfTurn] = axis / np.linalg.norm(axis, axis=0)
+
+        return cls(quatCoef)
+
+    def eulerAngles(self) -> np.ndarray:
+        """Calculate the Euler angle representation for each rotation,
+        see :func:`defdap.quat.Quat.eulerAngles`. Rotations with Phi
+        of 0 or pi are handled separately.
+
+        Returns
+        -------
+        eulers : numpy.ndarray, shape (3, n, ..., m)
+            Bunge euler angles (in radians).
+
+        """
+        eulers = np.empty((3,) + self.shape, dtype=self.quatCoef.dtype)
+
+        q = self.quatCoef
+        q03 = q[0]**2 + q[3]**2
+        q12 = q[1]**2 + q[2]**2
+        chi = np.sqrt(q03 * q12)
+
+        phiZero = (chi == 0) & (q12 == 0)
+        phiPi = (chi == 0) & (q03 == 0) & ~phiZero
+        general = ~(phiZero | phiPi)
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            cosPh1 = (-q[0] * q[1] - q[2] * q[3]) / chi
+            sinPh1 = (-q[0] * q[2] + q[1] * q[3]) / chi
+
+            cosPhi = q[0]**2 + q[3]**2 - q[1]**2 - q[2]**2
+            sinPhi = 2 * chi
+
+            cosPh2 = (-q[0] * q[1] + q[2] * q[3]) / chi
+            sinPh2 = (q[1] * q[3] + q[0] * q[2]) / chi
+
+        eulers[0] = np.select(
+            [general, phiZero],
+            [np.arctan2(sinPh1, cosPh1),
+             np.arctan2(-2 * q[0] * q[3], q[0]**2 - q[3]**2)],
+            np.arctan2(2 * q[1] * q[2], q[1]**2 - q[2]**2)
+        )
+        eulers[1] = np.select([general, phiZero],
+                              [np.arctan2(sinPhi, cosPhi), 0], np.pi)
+        eulers[2] = np.where(general, np.arctan2(sinPh2, cosPh2), 0)
+
+        eulers[0][eulers[0] < 0] += 2 * np.pi
+        eulers[2][eulers[2] < 0] += 2 * np.pi
+
+        return eulers
+
+    def axisAngle(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Calculate the axis-angle representation for each rotation,
+        the inverse of :func:`defdap.quat.QuatArray.fromAxisAngle`. The
+        axis of rotations with no angle is taken as z.
+
+        Returns
+        -------
+        axis : numpy.ndarray, shape (3, n, ..., m)
+            Unit rotation axes.
+        angle : numpy.ndarray, shape (n, ..., m)
+            Rotation angles in radians, between 0 and pi for quats in
+            the northern hemisphere.
+
+        """
+        q = self.quatCoef
+        vecNorm = np.sqrt(np.sum(q[1:4]**2, axis=0))
+        angle = 2 * np.arctan2(vecNorm, q[0])
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            axis = -q[1:4] / vecNorm
+        axis = np.where(vecNorm == 0,
+                        np.array([0, 0, 1]).reshape((3,) + (1,) * vecNorm.ndim),
+                        axis)
+
+        return axis, angle
+
+    def rodrigues(self) -> np.ndarray:
+        """Calculate the Rodrigues vector representation for each
+        rotation, the rotation axis scaled by tan of half the rotation
+        angle. Rotations of pi give infinite components.
+
+        Returns
+        -------
+        numpy.ndarray, shape (3, n, ..., m)
+            Rodrigues vectors.
+
+        """
+        q = self.quatCoef
+        with np.errstate(divide='ignore', invalid='ignore'):
+            rodVector = -q[1:4] / q[0]
+        # components with no rotation are 0 rather than nan
+        rodVector[q[1:4] == 0] = 0
+
+        return rodVector
+
+    @property
+    def shape(self) -> Tuple[int, ...]:
+        return self.quatCoef.shape[1:]
+
+    @property
+    def size(self) -> int:
+        return int(np.prod(self.shape))
+
+    def __len__(self) -> int:
+        if len(self.shape) == 0:
+            raise TypeError("len() of unsized QuatArray")
+        return self.shape[0]
+
+    def __repr__(self) -> str:
+        return "QuatArray(shape={:})".format(self.shape)
+
+    def __str__(self) -> str:
+        return self.__repr__()
+
+    # allow array like getting/setting of quats. A Quat is returned
+    # when a single element is selected, otherwise a QuatArray
+    def __getitem__(self, key) -> Union['Quat', 'QuatArray']:
+        if not isinstance(key, tuple):
+            key = (key,)
+        quatCoef = self.quatCoef[(slice(None),) + key]
+        if quatCoef.ndim == 1:
+            return Quat(quatCoef)
+        return QuatArray(quatCoef, allow_southern=True)
+
+    def __setitem__(self, key, value: Union['Quat', 'QuatArray']) -> None:
+        if not isinstance(key, tuple):
+            key = (key,)
+        if isinstance(value, (Quat, QuatArray)):
+            value = value.quatCoef
+        self.quatCoef[(slice(None),) + key] = value
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+    def toQuats(self) -> np.ndarray:
+        """Create an array of Quat objects from the quaternions.
+
+        Returns
+        -------
+        numpy.ndarray(defdap.quat.Quat)
+            Array of quat objects, same shape as this array.
+
+        """
+        quats = np.empty(self.shape, dtype=Quat)
+        for idx in np.ndindex(self.shape):
+            quats[idx] = Quat(self.quatCoef[(slice(None),) + idx])
+
+        return quats
+
+    def flatten(self) -> 'QuatArray':
+        """Return a copy of the array collapsed into 1 dimension.
+
+        """
+        return QuatArray(self.quatCoef.reshape((4, -1)).copy(),
+                         allow_southern=True)
+
+    def reshape(self, *shape) -> 'QuatArray':
+        """Return the array with a new shape. A view is returned where
+        possible.
+
+        """
+        if len(shape) == 1 and isinstance(shape[0], (tuple, list)):
+            shape = tuple(shape[0])
+        return QuatArray(self.quatCoef.reshape((4,) + shape),
+                         allow_southern=True)
+
+    def copy(self) -> 'QuatArray':
+        return QuatArray(self.quatCoef.copy(), allow_southern=True)
+
+    # overload * operator for quaternion product
+    def __mul__(
+        self,
+        right: Union['Quat', 'QuatArray'],
+        allow_southern: bool = False
+    ) -> 'QuatArray':
+        if isinstance(right, (Quat, QuatArray)):
+            return QuatArray(
+                _quatProduct(self.quatCoef, right.quatCoef),
+                allow_southern=allow_southern
+            )
+        raise TypeError("{:} - {:}".format(type(self), type(right)))
+
+    def dot(self, right: Union['Quat', 'QuatArray']) -> np.ndarray:
+        """Calculate dot product between quaternions.
+
+        Parameters
+        ----------
+        right
+            Right hand quaternion or array of quaternions of the same
+            shape.
+
+        Returns
+        -------
+        numpy.ndarray
+            Dot product at each element.
+
+        """
+        if isinstance(right, Quat):
+            return np.einsum("i...,i->...", self.quatCoef, right.quatCoef)
+        if isinstance(right, QuatArray):
+            return np.einsum("i...,i...->...", self.quatCoef, right.quatCoef)
+        raise TypeError()
+
+    def norm(self) -> np.ndarray:
+        """Calculate the norm of each quaternion.
+
+        Returns
+        -------
+        numpy.ndarray
+            Norm of the quaternions.
+
+        """
+        return np.sqrt(np.einsum("i...,i...->...", self.quatCoef,
+                                 self.quatCoef))
+
+    def normalise(self) -> None:
+        """Normalise the quaternions (turn them into unit quaternions).
+
+        """
+        self.quatCoef /= self.norm()
+
+    # also the inverse if these are unit quaternions
+    @property
+    def conjugate(self) -> 'QuatArray':
+        """Calculate the conjugate of the quaternions.
+
+        Returns
+        -------
+        defdap.quat.QuatArray
+            Conjugate of quaternions.
+
+        """
+        quatCoef = -self.quatCoef
+        quatCoef[0] *= -1
+        return QuatArray(quatCoef)
+
+    def misOri(
+        self,
+        right: Union['Quat', 'QuatArray'],
+        symGroup: str,
+        returnQuat: Optional[int] = 0
+    ) -> Union[np.ndarray, 'QuatArray',
+               Tuple[np.ndarray, 'QuatArray']]:
+        """
+        Calculate misorientation angle between orientations taking
+        into account the symmetries of the crystal structure. Each
+        symmetry is applied to the whole array at once. Angle is
+        2*arccos(output).
+
+        Parameters
+        ----------
+        right
+            Orientation(s) to find misorientation to. Either a single
+            quat or an array with the same shape as this array.
+        symGroup
+            Crystal type (cubic, hexagonal).
+        returnQuat
+            What to return: 0 for minimum misorientation, 1 for
+            symmetric equivalent with minimum misorientation, 2 for both.
+
+        Returns
+        -------
+        numpy.ndarray
+            Minimum misorientation.
+        defdap.quat.QuatArray
+            Symmetric equivalent orientations with minimum misorientation.
+
+        """
+        if not isinstance(right, (Quat, QuatArray)):
+            raise TypeError("Input must be a quaternion.")
+
+        rightCoef = np.broadcast_to(
+            right.quatCoef.reshape((4,) + (1,) * (self.quatCoef.ndim - 1))
+            if isinstance(right, Quat) else right.quatCoef,
+            self.quatCoef.shape
+        )
+
+        # looking for max of this as it is cos of misorientation angle
+        minMisOri, symIndex = Quat.calcMaxSymDot(
+            self.quatCoef, rightCoef, symGroup,
+            dtype=self.quatCoef.dtype, returnIndex=True
+        )
+
+        if returnQuat in (1, 2):
+            symMatrices = Quat.symEqvMatrices(symGroup,
+                                              dtype=self.quatCoef.dtype)
+            minQuatSym = np.einsum("...ij,j...->i...",
+                                   symMatrices[symIndex], rightCoef)
+
+        if returnQuat == 1:
+            return QuatArray(minQuatSym)
+        elif returnQuat == 2:
+            return minMisOri, QuatArray(minQuatSym)
+        else:
+            return minMisOri
+
+    def misOriAxis(self, right: Union['Quat', 'QuatArray']) -> np.ndarray:
+        """
+        Calculate misorientation axis between orientations. This
+        does not consider symmetries of the crystal structure.
+
+        Parameters
+        ----------
+        right
+            Orientation(s) to find misorientation axis to.
+
+        Returns
+        -------
+        numpy.ndarray, shape (3, n, ..., m)
+            Axis of misorientation.
+
+        """
+        if not isinstance(right, (Quat, QuatArray)):
+            raise TypeError("Input must be a quaternion.")
+
+        Dq = _quatProduct(right.quatCoef, self.conjugate.quatCoef)
+        Dq[:, Dq[0] < 0] *= -1
+        Dq[0] = np.clip(Dq[0], -1, 1)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            misOriAxis = (2 * Dq[1:4] * np.arccos(Dq[0]) /
+                          np.sqrt(1 - Dq[0]**2))
+
+        return misOriAxis
+
+
+def _quatProduct(left: np.ndarray, right: np.ndarray) -> np.ndarray:
+    """Quaternion product of arrays of quat components. Inputs are of
+    shape (4, ...) and are broadcast against each other.
+
+    """
+    nDim = max(left.ndim, right.ndim)
+    left = left.reshape(left.shape + (1,) * (nDim - left.ndim))
+    right = right.reshape(right.shape + (1,) * (nDim - right.ndim))
+
+    product = np.empty(np.broadcast(left, right).shape,
+                       dtype=np.result_type(left, right))
+    product[0] = (left[0] * right[0] - left[1] * right[1] -
+                  left[2] * right[2] - left[3] * right[3])
+    product[1] = (left[0] * right[1] + left[1] * right[0] +
+                  left[2] * right[3] - left[3] * right[2])
+    product[2] = (left[0] * right[2] + left[2] * right[0] +
+                  left[3] * right[1] - left[1] * right[3])
+    product[3] = (left[0] * right[3] + left[3] * right[0] +
+                  left[1] * right[2] - left[2] * right[1])
+
+    return product
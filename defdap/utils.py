@@ -16,6 +16,8 @@
 import functools
 from datetime import datetime
 
+from defdap import defaults
+
 
 def reportProgress(message: str = ""):
     """Decorator for reporting progress of given function
@@ -67,3 +69,46 @@ def reportProgress(message: str = ""):
         return wrapper
     return decorator
 
+
+def mapBlocks(shape, blockSize=None, halo=0):
+    """Split a map into blocks of rows, with an optional overlap (halo)
+    between neighbouring blocks. Used to process large maps in pieces
+    and limit memory use.
+
+    Parameters
+    ----------
+    shape : tuple of int
+        Shape of the map (y, x).
+    blockSize : int, optional
+        Maximum number of map points in a block, excluding the halo. A
+        block always contains at least one row. Uses
+        `defaults['map_block_size']` if None and the whole map is a
+        single block if that is also None.
+    halo : int, optional
+        Number of extra rows to include either side of each block.
+
+    Yields
+    ------
+    slice
+        Rows of the map in the block.
+    slice
+        Rows of the map in the block including the halo.
+    slice
+        Rows of the block within the block including the halo.
+
+    """
+    numRows, numCols = shape[:2]
+    if blockSize is None:
+        blockSize = defaults['map_block_size']
+    if blockSize is None:
+        blockRows = max(numRows, 1)
+    else:
+        blockRows = max(int(blockSize) // max(numCols, 1), 1)
+
+    for start in range(0, numRows, blockRows):
+        end = min(start + blockRows, numRows)
+        haloStart = max(start - halo, 0)
+        haloEnd = min(end + halo, numRows)
+
+        yield (slice(start, end), slice(haloStart, haloEnd),
+               slice(start - haloStart, end - haloStart))
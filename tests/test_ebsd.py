@@ -3,8 +3,10 @@ from pytest import approx
 from unittest.mock import Mock
 
 import numpy as np
+from scipy.spatial import cKDTree
 import defdap.ebsd as ebsd
 import defdap.crystal as crystal
+from defdap.quat import Quat, QuatArray
 
 
 DATA_DIR = "tests/data/"
@@ -36,25 +38,35 @@ def good_phase_array(good_map_with_quats):
     return good_map_with_quats.phaseArray
 
 
+@pytest.fixture
+def mock_map(good_quat_array, good_phase_array):
+    # create stub object
+    mock_map = Mock(spec=ebsd.Map)
+    mock_map.quatArray = good_quat_array
+    mock_map.phaseArray = good_phase_array.copy()
+    mock_map.shape = good_quat_array.shape
+    mock_map.yDim, mock_map.xDim = good_quat_array.shape
+    mock_phase = Mock(spec=crystal.Phase)
+    mock_phase.crystalStructure = crystal.crystalStructures['cubic']
+    mock_map.primaryPhase = mock_phase
+    mock_map.phases = [mock_phase]
+
+    return mock_map
+
+
+@pytest.fixture(scope="module")
+def map_with_grains(good_map_with_quats):
+    good_map_with_quats.findBoundaries(boundDef=10)
+    good_map_with_quats.findGrains(minGrainSize=10)
+
+    return good_map_with_quats
+
+
 class TestMapFindBoundaries:
     # Depends on Quat.symEqv, self.crystalSym, self.yDim, self.xDim,
     # self.quatArray, self.phaseArray
     # Affects self.boundaries
 
-    @staticmethod
-    @pytest.fixture
-    def mock_map(good_quat_array, good_phase_array):
-        # create stub object
-        mock_map = Mock(spec=ebsd.Map)
-        mock_map.quatArray = good_quat_array
-        mock_map.phaseArray = good_phase_array
-        mock_map.yDim, mock_map.xDim = good_quat_array.shape
-        mock_phase = Mock(spec=crystal.Phase)
-        mock_phase.crystalStructure = crystal.crystalStructures['cubic']
-        mock_map.primaryPhase = mock_phase
-
-        return mock_map
-
     @staticmethod
     def test_return_type(mock_map):
         # run test and collect result
@@ -82,7 +94,727 @@ class TestMapFindBoundaries:
 
         assert np.allclose(result, expected)
 
+    @staticmethod
+    @pytest.mark.parametrize('block_size', [1, 1000])
+    def test_blocks(mock_map, block_size):
+        ebsd.Map.findBoundaries(mock_map, boundDef=10, blockSize=block_size)
+        result = mock_map.boundaries
+
+        expected = -np.loadtxt(
+            "{:}boundaries_10deg.txt".format(EXPECTED_RESULTS_DIR), dtype=int
+        )
+
+        assert np.allclose(result, expected)
+
+
+class TestMapCalcKam:
+    # Depends on self.quatArray, self.phaseArray, self.phases, self.shape
+    # Affects self.kam
+
+    @staticmethod
+    def expected_kam(mock_map, y, x, kernel_order, mis_ori_tol):
+        quat_array = mock_map.quatArray
+        if mock_map.phaseArray[y, x] == 0:
+            return np.nan
+        y_dim, x_dim = mock_map.shape
+        n = kernel_order
+        mis_oris = []
+        for dy in range(-n, n + 1):
+            for dx in range(-n, n + 1):
+                y_n, x_n = y + dy, x + dx
+                if (max(abs(dy), abs(dx)) != n or
+                        not (0 <= y_n < y_dim and 0 <= x_n < x_dim) or
+                        mock_map.phaseArray[y_n, x_n] == 0):
+                    continue
+                mis_ori = min(quat_array[y, x].misOri(quat_array[y_n, x_n],
+                                                      'cubic'), 1)
+                if (mis_ori_tol is None or
+                        mis_ori >= np.cos(mis_ori_tol * np.pi / 360)):
+                    mis_oris.append(mis_ori)
+
+        return np.mean(mis_oris) if mis_oris else np.nan
+
+    @staticmethod
+    def test_return_type(mock_map):
+        ebsd.Map.calcKam(mock_map)
+        result = mock_map.kam
+
+        assert type(result) is np.ndarray
+        assert result.shape == mock_map.shape
+        assert np.nanmax(result) <= 1.
+
+    @staticmethod
+    @pytest.mark.parametrize('kernel_order, mis_ori_tol',
+                             [(1, None), (1, 5), (2, 3)])
+    def test_calc(mock_map, kernel_order, mis_ori_tol):
+        mock_map.phaseArray[10:13, 20:22] = 0
+        ebsd.Map.calcKam(mock_map, kernelOrder=kernel_order,
+                         misOriTol=mis_ori_tol)
+        result = mock_map.kam
+
+        assert np.all(np.isnan(result[10:13, 20:22]))
+        points = [(0, 0), (9, 20), (11, 23), (50, 60), (242, 358),
+                  (100, 0), (0, 200)]
+        for y, x in points:
+            expected = TestMapCalcKam.expected_kam(
+                mock_map, y, x, kernel_order, mis_ori_tol
+            )
+            assert result[y, x] == approx(expected, nan_ok=True)
+
+    @staticmethod
+    @pytest.mark.parametrize('kernel_order', [1, 3])
+    def test_blocks(mock_map, kernel_order):
+        ebsd.Map.calcKam(mock_map, kernelOrder=kernel_order, misOriTol=5)
+        expected = mock_map.kam
+
+        ebsd.Map.calcKam(mock_map, kernelOrder=kernel_order, misOriTol=5,
+                         blockSize=2 * 359)
+
+        assert np.allclose(mock_map.kam, expected, equal_nan=True)
+
+    @staticmethod
+    def test_bad_kernel_order(mock_map):
+        with pytest.raises(ValueError):
+            ebsd.Map.calcKam(mock_map, kernelOrder=0)
+
+
+class TestMapFilterData:
+    # Depends on self.quatArray, self.phaseArray, self.phases, self.shape
+    # Affects self.quatArray
+
+    @staticmethod
+    def expected_quat(mock_map, y, x, mis_ori_tol, kernel_size,
+                      use_symmetry):
+        quat_array = mock_map.quatArray
+        ref_quat = quat_array[y, x]
+        if mock_map.phaseArray[y, x] == 0:
+            return ref_quat.quatCoef
+        y_dim, x_dim = mock_map.shape
+        starts = (1 - kernel_size, -(kernel_size // 2), 0)
+        syms = Quat.symEqv('cubic') if use_symmetry else [Quat(1, 0, 0, 0)]
+
+        best_mis_ori = -1
+        for sy in starts:
+            for sx in starts:
+                if sy == sx == starts[1]:
+                    continue
+                mis_oris = []
+                quat_sum = np.zeros(4)
+                for y_n in range(y + sy, y + sy + kernel_size):
+                    for x_n in range(x + sx, x + sx + kernel_size):
+                        if (not (0 <= y_n < y_dim and 0 <= x_n < x_dim) or
+                                mock_map.phaseArray[y_n, x_n] == 0):
+                            continue
+                        eqvs = [sym * quat_array[y_n, x_n] for sym in syms]
+                        dots = [ref_quat.dot(eqv) for eqv in eqvs]
+                        i = np.argmax(np.abs(dots))
+                        if abs(dots[i]) < np.cos(mis_ori_tol * np.pi / 360):
+                            continue
+                        mis_oris.append(min(abs(dots[i]), 1))
+                        quat_sum += np.sign(dots[i]) * eqvs[i].quatCoef
+                if np.mean(mis_oris) > best_mis_ori:
+                    best_mis_ori = np.mean(mis_oris)
+                    best_quat = quat_sum / np.linalg.norm(quat_sum)
+
+        return best_quat
+
+    @staticmethod
+    def test_return_type(mock_map):
+        result = ebsd.Map.filterData(mock_map)
+
+        assert isinstance(result, QuatArray)
+        assert mock_map.quatArray is result
+        assert result.shape == mock_map.shape
+        assert np.allclose(result.norm(), 1)
+
+    @staticmethod
+    @pytest.mark.parametrize('mis_ori_tol, kernel_size, use_symmetry',
+                             [(5, 3, True), (5, 3, False), (10, 4, True)])
+    def test_calc(mock_map, mis_ori_tol, kernel_size, use_symmetry):
+        mock_map.phaseArray[10:13, 20:22] = 0
+        original = mock_map.quatArray
+        result = ebsd.Map.filterData(mock_map, misOriTol=mis_ori_tol,
+                                     kernelSize=kernel_size,
+                                     useSymmetry=use_symmetry)
+        mock_map.quatArray = original
+
+        assert np.all(result.quatCoef[:, 10:13, 20:22] ==
+                      original.quatCoef[:, 10:13, 20:22])
+        points = [(0, 0), (9, 20), (11, 23), (50, 60), (242, 358),
+                  (100, 0), (0, 200), (160, 160)]
+        for y, x in points:
+            expected = TestMapFilterData.expected_quat(
+                mock_map, y, x, mis_ori_tol, kernel_size, use_symmetry
+            )
+            assert Quat(result.quatCoef[:, y, x]).dot(Quat(expected)) == \
+                approx(1)
+
+    @staticmethod
+    def test_mask_and_blocks(mock_map):
+        mask = np.zeros(mock_map.shape, dtype=bool)
+        mask[50:60, 50:60] = True
+        original = mock_map.quatArray
+        expected = ebsd.Map.filterData(mock_map, numIterations=2,
+                                       mask=mask)
+        mock_map.quatArray = original
+        result = ebsd.Map.filterData(mock_map, numIterations=2, mask=mask,
+                                     blockSize=10 * 359)
+
+        assert np.allclose(result.quatCoef, expected.quatCoef)
+        assert np.all(result.quatCoef[:, mask] == original.quatCoef[:, mask])
+
+    @staticmethod
+    def test_bad_kernel_size(mock_map):
+        with pytest.raises(ValueError):
+            ebsd.Map.filterData(mock_map, kernelSize=1)
+
+
+class TestMapFillNonIndexed:
+    # Depends on self.quatArray, self.phaseArray, self.eulerAngleArray,
+    # self.meanAngularDeviationArray, self.phases, self.numPhases,
+    # self.yDim, self.xDim
+    # Affects self.quatArray, self.phaseArray, self.eulerAngleArray,
+    # self.filledPoints
+
+    @staticmethod
+    @pytest.fixture
+    def mock_map(mock_map, good_map_with_quats):
+        mock_map.eulerAngleArray = good_map_with_quats.eulerAngleArray
+        mock_map.meanAngularDeviationArray = \
+            good_map_with_quats.meanAngularDeviationArray
+        mock_map.numPhases = 1
+
+        # single point and block of non-indexed points
+        mock_map.phaseArray[50, 60] = 0
+        mock_map.phaseArray[100:110, 200:212] = 0
+
+        return mock_map
+
+    @staticmethod
+    def test_calc(mock_map):
+        original = mock_map.quatArray
+        expected_filled = mock_map.phaseArray == 0
+        ebsd.Map.fillNonIndexed(mock_map)
+
+        assert np.all(mock_map.phaseArray == 1)
+        assert np.array_equal(mock_map.filledPoints, expected_filled)
+        assert np.all(mock_map.quatArray.quatCoef[:, ~expected_filled] ==
+                      original.quatCoef[:, ~expected_filled])
+        assert np.allclose(mock_map.quatArray.norm(), 1)
+
+        neighbours = original[49:52, 59:62].quatCoef.reshape((4, -1))
+        expected = Quat.calcAverageOri(Quat.calcSymEqvs(
+            QuatArray(neighbours[:, [0, 1, 2, 3, 5, 6, 7, 8]]), 'cubic'))
+        assert mock_map.quatArray[50, 60].misOri(expected, 'cubic') == \
+            approx(1)
+
+        # Euler angles give the same orientations
+        quats = QuatArray.fromEulerAngles(
+            mock_map.eulerAngleArray[:, expected_filled])
+        assert np.allclose(Quat.calcMaxSymDot(
+            quats.quatCoef, mock_map.quatArray.quatCoef[:, expected_filled],
+            'cubic'), 1)
+
+    @staticmethod
+    def test_iterations(mock_map):
+        ebsd.Map.fillNonIndexed(mock_map, maxIterations=1)
+
+        # only corners of the block have 4 indexed neighbours
+        expected_filled = np.zeros(mock_map.phaseArray.shape, dtype=bool)
+        expected_filled[50, 60] = True
+        expected_filled[[100, 100, 109, 109], [200, 211, 200, 211]] = True
+        assert np.array_equal(mock_map.filledPoints, expected_filled)
+        assert np.count_nonzero(mock_map.phaseArray == 0) == 120 - 4
+
+    @staticmethod
+    def test_mad(mock_map):
+        high_mad = mock_map.meanAngularDeviationArray > 1.5
+        ebsd.Map.fillNonIndexed(mock_map, minNeighbours=8, maxMad=1.5)
+
+        assert np.any(high_mad)
+        assert np.all(mock_map.filledPoints[high_mad])
+        assert mock_map.filledPoints[50, 60]
+        assert not np.any(mock_map.filledPoints[100:110, 200:212])
+
+    @staticmethod
+    def test_bad_min_neighbours(mock_map):
+        with pytest.raises(ValueError):
+            ebsd.Map.fillNonIndexed(mock_map, minNeighbours=9)
+
+
+class TestMapCalcNye:
+    # Depends on self.quatArray, self.primaryPhase, self.stepSize,
+    # self.yDim, self.xDim
+    # Affects self.Nye, self.GND
+
+    @staticmethod
+    @pytest.fixture
+    def mock_map(good_quat_array):
+        # create stub object
+        mock_map = Mock(spec=ebsd.Map)
+        mock_map.quatArray = good_quat_array[:40, :50]
+        mock_map.yDim, mock_map.xDim = mock_map.quatArray.shape
+        mock_map.stepSize = 0.12
+        mock_phase = Mock(spec=crystal.Phase)
+        mock_phase.crystalStructure = crystal.crystalStructures['cubic']
+        mock_map.primaryPhase = mock_phase
+
+        return mock_map
+
+    @staticmethod
+    def expected_beta_der(quat, quat_neighbour, step_size):
+        quat_sym = quat.misOri(quat_neighbour, 'cubic', returnQuat=1)
+        mis_ori_quat = quat_sym.conjugate * quat
+
+        return (mis_ori_quat.rotMatrix() - np.eye(3)) / step_size / 1e-6
+
+    @staticmethod
+    def test_return_type(mock_map):
+        ebsd.Map.calcNye(mock_map)
+
+        assert type(mock_map.Nye) is np.ndarray
+        assert mock_map.Nye.shape == (3, 3, 40, 50)
+        assert type(mock_map.GND) is np.ndarray
+        assert mock_map.GND.shape == (40, 50)
+
+    @staticmethod
+    def test_calc(mock_map):
+        ebsd.Map.calcNye(mock_map)
+        result = mock_map.Nye
+
+        quat_array = mock_map.quatArray
+        bavg = 1.4e-10
+        for y, x in [(0, 0), (5, 7), (20, 30), (38, 48)]:
+            beta_der_x = TestMapCalcNye.expected_beta_der(
+                quat_array[y, x], quat_array[y, x + 1], mock_map.stepSize
+            )
+            beta_der_y = TestMapCalcNye.expected_beta_der(
+                quat_array[y, x], quat_array[y + 1, x], mock_map.stepSize
+            )
+            expected = np.zeros((3, 3))
+            expected[:, 2] = (beta_der_y[:, 0] - beta_der_x[:, 1]) / bavg
+            expected[:, 1] = beta_der_x[:, 2] / bavg
+            expected[:, 0] = -beta_der_y[:, 2] / bavg
+
+            assert np.allclose(result[:, :, y, x], expected)
+
+    @staticmethod
+    def test_blocks(mock_map):
+        ebsd.Map.calcNye(mock_map)
+        expected = mock_map.Nye
+
+        ebsd.Map.calcNye(mock_map, blockSize=7 * 50)
 
+        assert np.allclose(mock_map.Nye, expected)
+
+
+class TestMapLabelGrains:
+
+    @staticmethod
+    @pytest.fixture
+    def boundaries():
+        # 4x5 map split into regions of 6, 10, 3 and 1 points
+        boundaries_x = np.zeros((4, 5), dtype=bool)
+        boundaries_y = np.zeros((4, 5), dtype=bool)
+        boundaries_x[:3, 1] = True
+        boundaries_y[2, :3] = True
+        boundaries_x[3, 2:4] = True
+        boundaries_y[2, 3] = True
+
+        return boundaries_x, boundaries_y
+
+    @staticmethod
+    def test_calc(boundaries):
+        result = ebsd.Map.labelGrains(*boundaries)
+
+        expected = np.array([
+            [1, 1, 2, 2, 2],
+            [1, 1, 2, 2, 2],
+            [1, 1, 2, 2, 2],
+            [3, 3, 3, 4, 2],
+        ])
+
+        assert np.array_equal(result, expected)
+
+    @staticmethod
+    def test_min_size_and_mask(boundaries):
+        mask = np.ones((4, 5), dtype=bool)
+        mask[0, 4] = False
+        result = ebsd.Map.labelGrains(*boundaries, mask=mask,
+                                      minGrainSize=4)
+
+        expected = np.array([
+            [1, 1, 2, 2, 0],
+            [1, 1, 2, 2, 2],
+            [1, 1, 2, 2, 2],
+            [-2, -2, -2, -2, 2],
+        ])
+
+        assert np.array_equal(result, expected)
+
+
+class TestMapFindGrains:
+
+    @staticmethod
+    def test_return_type(map_with_grains):
+        assert type(map_with_grains.grains) is np.ndarray
+        assert map_with_grains.grains.shape == map_with_grains.shape
+        assert len(map_with_grains) == map_with_grains.grains.max()
+        assert all(type(grain) is ebsd.Grain for grain in map_with_grains)
+
+    @staticmethod
+    def test_flood_fill(map_with_grains):
+        # grain IDs should match flood filling from first point of each
+        grains = map_with_grains.grains
+        for grain_id in [0, 10, len(map_with_grains) - 1]:
+            grain = map_with_grains[grain_id]
+            x, y = grain.coordList[0]
+
+            assert grain.grainID == grain_id
+            assert grains[y, x] == grain_id + 1
+            assert np.all(grains.reshape(-1)[:y * grains.shape[1] + x] !=
+                          grain_id + 1)
+
+            fill_map = Mock(spec=ebsd.Map)
+            fill_map.grains = np.zeros_like(grains)
+            fill_map.boundariesX = map_with_grains.boundariesX
+            fill_map.boundariesY = map_with_grains.boundariesY
+            fill_map.yDim, fill_map.xDim = grains.shape
+            points_left = np.ones_like(grains, dtype=bool)
+            filled_points = ebsd.Map.floodFill(fill_map, x, y, grain_id + 1,
+                                               points_left)
+
+            assert np.array_equal(fill_map.grains == grain_id + 1,
+                                  grains == grain_id + 1)
+            assert filled_points.shape == (len(grain), 2)
+
+    @staticmethod
+    def test_grain_points(map_with_grains):
+        grain = map_with_grains[3]
+        xs, ys = np.array(grain.coordList).T
+
+        assert np.all(map_with_grains.grains[ys, xs] == 4)
+        assert np.sum(map_with_grains.grains == 4) == len(grain)
+        assert np.allclose(grain.quatList.quatCoef,
+                           map_with_grains.quatArray.quatCoef[:, ys, xs])
+
+    @staticmethod
+    def test_grain_index(map_with_grains):
+        grains_flat = map_with_grains.grains.reshape(-1)
+        offsets = map_with_grains.grainOffsets
+
+        assert len(offsets) == len(map_with_grains) + 1
+        assert offsets[-1] == np.sum(grains_flat > 0)
+        for grain in map_with_grains:
+            assert np.all(grains_flat[grain.pointIdxs] == grain.grainID + 1)
+
+    @staticmethod
+    def test_grain_data(map_with_grains):
+        grain = map_with_grains[7]
+        x0, y0, xmax, ymax = grain.extremeCoords
+        map_data = np.arange(map_with_grains.grains.size).reshape(
+            map_with_grains.shape)
+
+        grain_data = grain.grainData(map_data)
+        grain_map_data = grain.grainMapData(map_data, bg=-1)
+
+        assert np.array_equal(grain_data, grain.pointIdxs)
+        assert grain_map_data.shape == (ymax - y0 + 1, xmax - x0 + 1)
+        expected = np.where(
+            map_with_grains.grains[y0:ymax + 1, x0:xmax + 1] == 8,
+            map_data[y0:ymax + 1, x0:xmax + 1], -1
+        )
+        assert np.array_equal(grain_map_data, expected)
+
+    @staticmethod
+    @pytest.mark.parametrize('ignore_nan', [False, True])
+    def test_grain_stats(map_with_grains, ignore_nan):
+        rng = np.random.default_rng(0)
+        map_data = rng.normal(size=(2,) + map_with_grains.shape)
+        map_data[rng.random(map_data.shape) < 0.05] = np.nan
+        grain_ids = [0, 5, len(map_with_grains) - 1]
+
+        stats = map_with_grains.calcGrainStats(
+            map_data, stats=('count', 'mean', 'std', 'min', 'max', 'median'),
+            percentiles=(10, 90), grainIds=grain_ids, ignoreNan=ignore_nan
+        )
+
+        assert stats['mean'].shape == (2, 3)
+        assert stats['percentiles'].shape == (2, 2, 3)
+        prefix = 'nan' if ignore_nan else ''
+        for i, grain_id in enumerate(grain_ids):
+            for j in range(2):
+                grain_data = map_with_grains[grain_id].grainData(map_data[j])
+                if ignore_nan:
+                    assert stats['count'][j, i] == np.sum(~np.isnan(grain_data))
+                else:
+                    assert stats['count'][j, i] == len(grain_data)
+                for stat in ['mean', 'std', 'min', 'max', 'median']:
+                    expected = getattr(np, prefix + stat)(grain_data)
+                    assert np.allclose(stats[stat][j, i], expected,
+                                       equal_nan=True)
+                expected = getattr(np, prefix + 'percentile')(grain_data,
+                                                              [10, 90])
+                assert np.allclose(stats['percentiles'][:, j, i], expected,
+                                   equal_nan=True)
+
+    @staticmethod
+    def test_grain_stats_selection(map_with_grains):
+        map_data = np.arange(map_with_grains.grains.size, dtype=float).reshape(
+            map_with_grains.shape)
+
+        stats = map_with_grains.calcGrainStats(
+            map_data, stats=('mean', 'max'), grainIds=np.int64(3))
+        assert stats['mean'].shape == (1,)
+        assert stats['mean'][0] == approx(map_with_grains[3].pointIdxs.mean())
+        assert stats['max'][0] == map_with_grains[3].pointIdxs.max()
+        assert map_with_grains.calcGrainAv(map_data, grainIds=np.int64(3)) == \
+            approx(stats['mean'])
+
+        stats = map_with_grains.calcGrainStats(
+            map_data, stats=('mean',), percentiles=(50,), grainIds=[])
+        assert stats['mean'].shape == (0,)
+        assert stats['percentiles'].shape == (1, 0)
+
+    @staticmethod
+    def test_grain_data_to_map_data(map_with_grains):
+        grains = map_with_grains.grains
+        grain_data = np.arange(len(map_with_grains)) * 2.
+        grain_map = map_with_grains.grainDataToMapData(grain_data, bg=-1)
+
+        assert grain_map.shape == grains.shape
+        assert np.array_equal(grain_map,
+                              np.where(grains > 0, (grains - 1) * 2., -1))
+        # cached result returned as a new writeable array
+        grain_map[:] = 0
+        cached_map = map_with_grains.grainDataToMapData(grain_data, bg=-1)
+        assert cached_map is not grain_map
+        assert cached_map.flags.writeable
+        assert np.array_equal(cached_map,
+                              np.where(grains > 0, (grains - 1) * 2., -1))
+        assert map_with_grains.grainMapCache[4] is not cached_map
+        assert np.array_equal(
+            map_with_grains.grainDataToMapData(grain_data + 1, bg=-1),
+            np.where(grains > 0, (grains - 1) * 2. + 1, -1)
+        )
+        grain_map = map_with_grains.grainDataToMapData([6.],
+                                                       grainIds=np.int64(3))
+        assert np.all(grain_map[grains == 4] == 6.)
+        assert np.all(grain_map[grains != 4] == 0)
+
+        rgb = np.random.default_rng(0).random((2, 3))
+        grain_map = map_with_grains.grainDataToMapData(rgb, grainIds=[4, 2])
+
+        assert grain_map.shape == grains.shape + (3,)
+        assert np.array_equal(grain_map[grains == 5], np.tile(rgb[0], (
+            np.sum(grains == 5), 1)))
+        assert np.array_equal(grain_map[grains == 3], np.tile(rgb[1], (
+            np.sum(grains == 3), 1)))
+        assert np.all(grain_map[(grains != 5) & (grains != 3)] == 0)
+
+    @staticmethod
+    def test_grain_av(map_with_grains):
+        map_data = np.arange(map_with_grains.grains.size).reshape(
+            map_with_grains.shape)
+        grain_av = map_with_grains.calcGrainAv(map_data, grainIds=[3, 1])
+
+        assert np.allclose(grain_av, [map_with_grains[3].pointIdxs.mean(),
+                                      map_with_grains[1].pointIdxs.mean()])
+
+    @staticmethod
+    @pytest.mark.parametrize('method', ['mean', 'markley'])
+    def test_grain_av_oris(map_with_grains, method):
+        map_with_grains.calcGrainAvOris(method=method)
+
+        for grain in map_with_grains:
+            expected = Quat.calcAverageOri(
+                Quat.calcSymEqvs(grain.quatList, 'cubic'))
+            assert isinstance(grain.refOri, Quat)
+            assert grain.refOri.misOri(expected, 'cubic') > np.cos(
+                0.05 * np.pi / 360)
+
+    @staticmethod
+    def test_grain_mis_ori(map_with_grains):
+        map_with_grains.calcGrainMisOri(calcAxis=True, grainIds=[1, 4])
+
+        assert map_with_grains.misOri.shape == map_with_grains.shape
+        assert map_with_grains.misOriAxis.shape == \
+            (3,) + map_with_grains.shape
+        assert map_with_grains[0].misOriList is None
+        for grain_id in [1, 4]:
+            grain = map_with_grains[grain_id]
+            mis_ori, min_quat_comps = Quat.calcMisOri(
+                Quat.calcSymEqvs(grain.quatList, 'cubic'), grain.refOri)
+            dq = (QuatArray(min_quat_comps, allow_southern=True) *
+                  grain.refOri.conjugate).quatCoef
+            dq *= np.sign(dq[0])
+            angle = 2 * np.arccos(np.minimum(dq[0], 1))
+            with np.errstate(invalid='ignore'):
+                expected_axis = np.nan_to_num(
+                    dq[1:] * angle / np.linalg.norm(dq[1:], axis=0)).T
+            assert np.allclose(grain.misOriList, mis_ori)
+            assert np.allclose(grain.misOriAxisList, expected_axis)
+            assert np.allclose(np.linalg.norm(grain.misOriAxisList, axis=1),
+                               2 * np.arccos(mis_ori))
+            assert grain.averageMisOri == approx(np.mean(grain.misOriList))
+
+        map_with_grains.calcGrainMisOri()
+        assert np.all(np.isnan(map_with_grains.misOri) ==
+                      (map_with_grains.grains <= 0))
+
+    @staticmethod
+    def test_grain_mis_ori_selection(map_with_grains):
+        map_with_grains.calcGrainMisOri(grainIds=np.int64(2))
+        mis_ori = map_with_grains.misOri.copy()
+        assert not np.any(np.isnan(map_with_grains[2].misOriList))
+
+        # nothing calculated for an empty selection
+        map_with_grains.calcGrainMisOri(calcAxis=True, grainIds=[])
+        assert np.array_equal(map_with_grains.misOri, mis_ori, equal_nan=True)
+
+
+class TestMapBuildNeighbourNetwork:
+
+    @staticmethod
+    @pytest.fixture(scope="class")
+    def map_with_network(map_with_grains):
+        map_with_grains.buildNeighbourNetwork()
+
+        return map_with_grains
+
+    @staticmethod
+    def test_edges(map_with_network):
+        grains = map_with_network.grains[1:-1, 1:-1]
+        expected = set()
+        for i, (boundaries, shift) in enumerate((
+            (map_with_network.boundariesX, (0, 1)),
+            (map_with_network.boundariesY, (1, 0)),
+        )):
+            shifted = map_with_network.grains[1 + shift[0]:, 1 + shift[1]:]
+            shifted = shifted[:grains.shape[0], :grains.shape[1]]
+            mask = (boundaries[1:-1, 1:-1] & (grains > 0) & (shifted > 0) &
+                    (grains != shifted))
+            expected.update(frozenset(pair) for pair in
+                            zip(grains[mask] - 1, shifted[mask] - 1))
+
+        edges = {frozenset((g1.grainID, g2.grainID))
+                 for g1, g2 in map_with_network.neighbourNetwork.edges}
+
+        assert len(map_with_network.neighbourNetwork) == len(map_with_network)
+        assert edges == expected
+
+    @staticmethod
+    def test_boundary_segments(map_with_network):
+        grains = map_with_network.grains
+        for _, _, b_seg in map_with_network.neighbourNetwork.edges(
+                data='boundary'):
+            assert len(b_seg) == (len(b_seg.boundaryPointsX) +
+                                  len(b_seg.boundaryPointsY))
+            for pairs in (b_seg.boundaryPointPairsX,
+                          b_seg.boundaryPointPairsY):
+                assert np.all(grains[pairs[:, 0, 1], pairs[:, 0, 0]] ==
+                              b_seg.grain1.grainID + 1)
+                assert np.all(grains[pairs[:, 1, 1], pairs[:, 1, 0]] ==
+                              b_seg.grain2.grainID + 1)
+
+
+class TestMapBuildBoundaryTable:
+
+    @staticmethod
+    @pytest.fixture(scope="class")
+    def map_with_table(map_with_grains):
+        map_with_grains.buildBoundaryTable()
+
+        return map_with_grains
+
+    @staticmethod
+    def test_return_type(map_with_table):
+        table = map_with_table.boundaryTable
+        num_edges = map_with_table.neighbourNetwork.number_of_edges()
+
+        assert len(table) == num_edges
+        assert list(table.columns) == [
+            'grain1', 'grain2', 'pointsX', 'pointsY', 'length', 'misOri',
+            'axisX', 'axisY', 'axisZ', 'sigma', 'twin'
+        ]
+
+    @staticmethod
+    def test_misorientation(map_with_table):
+        network = map_with_table.neighbourNetwork
+        for row in map_with_table.boundaryTable.iloc[::10].itertuples():
+            b_seg = network[map_with_table[row.grain1]][
+                map_with_table[row.grain2]]['boundary']
+            mis_ori, mis_ori_axis = b_seg.misorientation()
+
+            assert row.grain1 == b_seg.grain1.grainID
+            assert row.length == approx(len(b_seg) * map_with_table.stepSize)
+            assert row.misOri == approx(mis_ori * 180 / np.pi)
+            assert np.allclose([row.axisX, row.axisY, row.axisZ],
+                               mis_ori_axis)
+
+    @staticmethod
+    def test_classification(map_with_table):
+        table = map_with_table.boundaryTable
+
+        assert np.all(table.sigma[table.misOri <= 15] == 1)
+        assert np.all(table.sigma[table.twin] == 3)
+
+    @staticmethod
+    def test_deviation():
+        syms = Quat.symEqv('cubic')
+        sigma3 = Quat.fromAxisAngle((1, 1, 1), np.pi / 3)
+        small_rot = Quat.fromAxisAngle((1, 2, 3), 2 * np.pi / 180)
+        mis_oris = np.array([
+            (syms[5] * sigma3 * syms[11]).quatCoef,
+            (syms[20] * sigma3 * small_rot * syms[2]).quatCoef,
+        ]).T
+
+        deviation = ebsd.Map._calcDeviation(mis_oris, sigma3, 'cubic')
+
+        assert deviation == approx([0, 2], abs=1e-5)
+
+
+class TestMapCalcProxigram:
+
+    @staticmethod
+    def brute_force_proxigram(boundaries, sampling):
+        boundary_points = (np.argwhere(boundaries == -1) + 0.5) * sampling
+        points = np.argwhere(np.ones_like(boundaries, dtype=bool)) * sampling
+        distances, nearest = cKDTree(boundary_points).query(points)
+
+        return distances.reshape(boundaries.shape), nearest
+
+    @staticmethod
+    @pytest.mark.parametrize('sampling', [(1., 1.), (0.5, 2.)])
+    def test_calc(map_with_grains, sampling):
+        map_with_grains.calcProxigram(sampling=sampling)
+
+        expected, _ = TestMapCalcProxigram.brute_force_proxigram(
+            map_with_grains.boundaries, np.array(sampling)
+        )
+
+        assert map_with_grains.proxigramArr.shape == map_with_grains.shape
+        assert np.allclose(map_with_grains.proxigramArr, expected)
+
+    @staticmethod
+    def test_indices(map_with_grains):
+        boundary_idxs, grain_ids = map_with_grains.calcProxigram(
+            returnIndices=True
+        )
+        boundaries = map_with_grains.boundaries
+        ys, xs = np.indices(boundaries.shape)
+
+        assert boundary_idxs.shape == (2,) + boundaries.shape
+        assert np.all(boundaries[boundary_idxs[0], boundary_idxs[1]] == -1)
+        assert np.allclose(
+            np.hypot(boundary_idxs[0] + 0.5 - ys, boundary_idxs[1] + 0.5 - xs),
+            map_with_grains.proxigramArr
+        )
+        assert np.array_equal(
+            grain_ids,
+            np.maximum(map_with_grains.grains[boundary_idxs[0],
+                                              boundary_idxs[1]] - 1, -1)
+        )
 
 
 ''' Functions left to test
@@ -96,20 +828,14 @@ plotBandContrastMap
 plotEulerMap
 plotIPFMap
 plotPhaseMap
-calcKam
 plotKamMap
-calcNye
 plotGNDMap
 checkDataLoaded
 buildQuatArray
 findPhaseBoundaries
 plotPhaseBoundaryMap
 plotBoundaryMap
-findGrains
 plotGrainMap
-floodFill
-calcGrainAvOris
-calcGrainMisOri
 plotMisOriMap
 loadSlipSystems
 printSlipSystems
@@ -118,7 +844,6 @@ plotAverageGrainSchmidFactorsMap
 
 Grain:
 __init__
-addPoint
 calcAverageOri
 buildMisOriList
 plotRefOri
@@ -1,3 +1,384 @@
+import pytest
+
+import numpy as np
+from skimage import transform as tf
+import defdap.hrdic as hrdic
+import defdap.ebsd as ebsd
+
+
+DATA_DIR = "tests/data/"
+EXAMPLE_DIC = "testDataDIC.txt"
+
+
+@pytest.fixture
+def good_map():
+    return hrdic.Map(DATA_DIR, EXAMPLE_DIC)
+
+
+class TestMapComponents:
+
+    @staticmethod
+    def test_lazy(good_map, monkeypatch):
+        assert good_map.componentCache == {}
+
+        gradCalls = []
+        grad = good_map._grad
+        monkeypatch.setattr(good_map, '_grad',
+                            lambda data: gradCalls.append(1) or grad(data))
+
+        eMaxShear = good_map.eMaxShear
+
+        assert set(good_map.componentCache) == {
+            'eMaxShear', 'e11', 'e22', 'e12', 'xDispGrad', 'yDispGrad'
+        }
+        assert good_map.eMaxShear is eMaxShear
+
+        # gradients and intermediate components are reused
+        e11 = good_map.componentCache['e11']
+        assert good_map.e11 is e11
+        good_map.eMaxPrincipal
+        good_map.rotation
+        assert len(gradCalls) == 2
+
+    @staticmethod
+    def test_values(good_map):
+        x_map = np.reshape(good_map.xd, (good_map.ydim, good_map.xdim))
+        y_map = np.reshape(good_map.yd, (good_map.ydim, good_map.xdim))
+        step = abs(good_map.xc[1] - good_map.xc[0])
+        dudy, dudx = np.gradient(x_map, step, step)
+        dvdy, dvdx = np.gradient(y_map, step, step)
+        e11 = dudx + 0.5 * (dudx**2 + dvdx**2)
+        e22 = dvdy + 0.5 * (dudy**2 + dvdy**2)
+        e12 = 0.5 * (dudy + dvdx + dudx * dudy + dvdx * dvdy)
+
+        assert np.allclose(good_map.f11, dudx + 1)
+        assert np.allclose(good_map.f12, dudy)
+        assert np.allclose(good_map.f21, dvdx)
+        assert np.allclose(good_map.f22, dvdy + 1)
+        assert np.allclose(good_map.e11, e11)
+        assert np.allclose(good_map.e22, e22)
+        assert np.allclose(good_map.e12, e12)
+        assert np.allclose(good_map.eMaxShear,
+                           np.sqrt(((e11 - e22) / 2.)**2 + e12**2))
+
+    @staticmethod
+    def test_derived(good_map):
+        strain = np.stack((
+            np.stack((good_map.e11, good_map.e12), axis=-1),
+            np.stack((good_map.e12, good_map.e22), axis=-1),
+        ), axis=-2)
+        principal = np.linalg.eigvalsh(strain)
+
+        assert np.allclose(good_map.eMinPrincipal, principal[..., 0])
+        assert np.allclose(good_map.eMaxPrincipal, principal[..., 1])
+
+        e33 = -(good_map.e11 + good_map.e22)
+        expected = np.sqrt(2. / 3. * (
+            np.sum(principal**2, axis=-1) + e33**2
+        ))
+        assert np.allclose(good_map.eVonMises, expected)
+
+        # no rotation if the deformation gradient is symmetric
+        f = np.stack((
+            np.stack((good_map.f11, good_map.f12), axis=-1),
+            np.stack((good_map.f21, good_map.f22), axis=-1),
+        ), axis=-2)
+        rot = np.stack((
+            np.stack((np.cos(good_map.rotation),
+                      -np.sin(good_map.rotation)), axis=-1),
+            np.stack((np.sin(good_map.rotation),
+                      np.cos(good_map.rotation)), axis=-1),
+        ), axis=-2)
+        stretch = np.swapaxes(rot, -1, -2) @ f
+        assert np.allclose(stretch[..., 0, 1], stretch[..., 1, 0])
+
+    @staticmethod
+    def test_float32(good_map):
+        map32 = hrdic.Map(DATA_DIR, EXAMPLE_DIC, dtype=np.float32)
+
+        assert map32.xd.dtype == np.float32
+        for name in good_map.componentNames:
+            data = map32.component[name]
+            assert data.dtype == np.float32
+            assert np.allclose(data, good_map.component[name], atol=1e-6)
+
+        mask = good_map.eMaxShear > np.percentile(good_map.eMaxShear, 90)
+        map32.generateThresholdMask(mask, preview=False)
+        map32.applyThresholdMask()
+        assert map32.e11.dtype == np.float32
+        assert np.all(np.isnan(map32.e11[mask]))
+
+    @staticmethod
+    def test_component_mapping(good_map):
+        assert set(good_map.component) == set(good_map.componentNames)
+        assert good_map.component['e11'] is good_map.e11
+        with pytest.raises(KeyError):
+            good_map.component['e33']
+
+    @staticmethod
+    def test_threshold_mask(good_map):
+        eMaxShear = good_map.eMaxShear
+        mask = eMaxShear > np.percentile(eMaxShear, 90)
+
+        good_map.generateThresholdMask(mask, preview=False)
+        good_map.applyThresholdMask()
+
+        assert good_map.componentCache == {}
+        for name in good_map.componentNames:
+            data = good_map.component[name]
+            assert np.all(np.isnan(data[mask]))
+            assert not np.any(np.isnan(data[~mask]))
+        assert np.array_equal(good_map.eMaxShear[~mask], eMaxShear[~mask])
+
+    @staticmethod
+    def test_set_crop(good_map):
+        e11 = good_map.e11
+
+        good_map.setCrop(xMin=10, yMax=5)
+
+        assert good_map.componentCache == {}
+        assert np.array_equal(good_map.e11, e11)
+        assert good_map.crop(good_map.e11).shape == (
+            good_map.ydim - 5, good_map.xdim - 10
+        )
+
+
+@pytest.fixture
+def series_dir(tmp_path):
+    """Write a series of 3 steps with displacements scaled from the
+    example map, cumulative and incremental versions.
+
+    """
+    with open(DATA_DIR + EXAMPLE_DIC) as f:
+        header = f.readline().strip()
+    data = np.loadtxt(DATA_DIR + EXAMPLE_DIC, skiprows=1)
+
+    for i in range(3):
+        stepData = data.copy()
+        stepData[:, 2:] *= (i + 1) / 3
+        np.savetxt(tmp_path / f"cumulative_{i}.txt", stepData,
+                   delimiter='\t', header=header, comments='')
+    stepData = data.copy()
+    stepData[:, 2:] /= 3
+    for i in range(3):
+        np.savetxt(tmp_path / f"incremental_{i}.txt", stepData,
+                   delimiter='\t', header=header, comments='')
+
+    return str(tmp_path) + "/"
+
+
+@pytest.fixture
+def ebsd_map():
+    ebsdMap = ebsd.Map(DATA_DIR + "testDataEBSD")
+    ebsdMap.buildQuatArray()
+    ebsdMap.findBoundaries(boundDef=8)
+    ebsdMap.findGrains(minGrainSize=10)
+    ebsdMap.homogPoints = [(68, 95), (308, 45), (191, 187), (89, 174)]
+
+    return ebsdMap
+
+
+def cumulative_series(series_dir, **kwargs):
+    fnames = [f"cumulative_{i}.txt" for i in range(3)]
+    return hrdic.MapSeries(series_dir, fnames, **kwargs)
+
+
+@pytest.fixture
+def linked_map(good_map, ebsd_map):
+    good_map.homogPoints = [(36, 72), (279, 27), (162, 174), (60, 157)]
+    good_map.linkEbsdMap(ebsd_map)
+
+    return good_map
+
+
+class TestMapWarp:
+
+    @staticmethod
+    @pytest.mark.parametrize('transformType',
+                             ['affine', 'piecewiseAffine', 'polynomial'])
+    def test_warp(linked_map, transformType):
+        linked_map.linkEbsdMap(linked_map.ebsdMap, transformType=transformType)
+        assert linked_map.warpCoordsCache == {}
+
+        data = linked_map.ebsdMap.bandContrastArray.astype(float)
+        for order in (0, 1):
+            expected = tf.warp(data, linked_map.ebsdTransform,
+                               output_shape=linked_map.shape, order=order)
+            warped = linked_map.warpToDicFrame(data, order=order)
+            assert np.allclose(warped, expected, rtol=0, atol=1e-12)
+
+        # coordinates reused for both orders and other data
+        assert len(linked_map.warpCoordsCache) == 1
+        coords = linked_map.warpCoords(data.shape)
+        linked_map.warpToDicFrame(linked_map.ebsdMap.grains, order=0,
+                                  preserve_range=True)
+        assert linked_map.warpCoords(data.shape) is coords
+
+    @staticmethod
+    @pytest.mark.parametrize('cropImage', [True, False])
+    def test_multichannel(linked_map, cropImage):
+        ebsdMap = linked_map.ebsdMap
+        data = np.stack((ebsdMap.bandContrastArray.astype(float),
+                         ebsdMap.grains.astype(float),
+                         ebsdMap.phaseArray.astype(float)), axis=-1)
+
+        for order in (0, 1):
+            warped = linked_map.warpToDicFrame(data, cropImage=cropImage,
+                                               order=order, preserve_range=True)
+            assert warped.ndim == 3 and warped.shape[2] == 3
+            for i in range(3):
+                expected = linked_map.warpToDicFrame(
+                    data[..., i], cropImage=cropImage, order=order,
+                    preserve_range=True
+                )
+                assert np.allclose(warped[..., i], expected)
+
+        assert len(linked_map.warpCoordsCache) == 1
+
+    @staticmethod
+    def test_uncropped(linked_map):
+        grains = linked_map.ebsdMap.grains
+
+        warped = linked_map.warpToDicFrame(grains, cropImage=False, order=0,
+                                           preserve_range=True)
+
+        assert warped.shape != linked_map.shape
+        assert len(linked_map.warpCoordsCache) == 1
+        assert set(np.unique(warped)) <= set(np.unique(grains)) | {0}
+
+    @staticmethod
+    def test_save_load(linked_map, tmp_path):
+        linked_map.boundaries
+        filePath = tmp_path / "warp.npz"
+        linked_map.saveWarpCoords(filePath)
+
+        dicMap = hrdic.Map(DATA_DIR, EXAMPLE_DIC)
+        dicMap.homogPoints = linked_map.homogPoints
+        dicMap.linkEbsdMap(linked_map.ebsdMap)
+        dicMap.loadWarpCoords(filePath)
+
+        assert dicMap.warpCoordsCache.keys() == linked_map.warpCoordsCache.keys()
+        for key, coords in linked_map.warpCoordsCache.items():
+            assert np.array_equal(dicMap.warpCoordsCache[key], coords)
+        assert np.array_equal(dicMap.boundaries, linked_map.boundaries)
+
+        dicMap.linkEbsdMap(linked_map.ebsdMap, transformType='polynomial')
+        with pytest.raises(ValueError):
+            dicMap.loadWarpCoords(filePath)
+
+    @staticmethod
+    @pytest.mark.parametrize('algorithm', ['warp', 'floodfill'])
+    def test_find_grains(linked_map, algorithm):
+        linked_map.findGrains(algorithm=algorithm)
+
+        assert len(linked_map) > 0
+        for grain in linked_map:
+            assert grain.ebsdGrain is linked_map.ebsdMap[grain.ebsdGrainId]
+
+
+class TestMapSeries:
+
+    @staticmethod
+    def test_lazy_loading(series_dir):
+        series = cumulative_series(series_dir, maxLoaded=2)
+
+        assert len(series) == 3
+        assert list(series.loadedMaps) == [2]
+        assert series.refMap is series[-1]
+
+        map0 = series[0]
+        assert list(series.loadedMaps) == [2, 0]
+        assert series[0] is map0
+
+        # least recently used step unloaded, reference kept
+        series[1]
+        assert list(series.loadedMaps) == [2, 1]
+
+        series.unloadStep(1)
+        series.unloadStep(2)
+        assert list(series.loadedMaps) == [2]
+
+    @staticmethod
+    def test_shared_state(series_dir):
+        series = cumulative_series(series_dir)
+        map0 = series[0]
+
+        series.setCrop(xMin=5, yMax=10)
+        mask = series.refMap.eMaxShear > np.percentile(
+            series.refMap.eMaxShear, 90)
+        series.generateThresholdMask(mask, preview=False)
+        series.applyThresholdMask()
+
+        for dicMap in (map0, series[1]):
+            assert np.array_equal(dicMap.cropDists, series.refMap.cropDists)
+            assert dicMap.shape == series.refMap.shape
+            assert np.all(np.isnan(dicMap.e11[mask]))
+            assert not np.any(np.isnan(dicMap.e11[~mask]))
+
+    @staticmethod
+    def test_cumulative_data(series_dir):
+        series = cumulative_series(series_dir)
+
+        for name in ('e11', 'eMaxShear', 'x_map'):
+            assert series.calcComponent(name, 2) is series[2].getComponent(name)
+        assert np.allclose(series.calcComponent('x_map', 2, incremental=True),
+                           series[2].x_map - series[1].x_map)
+
+        # incremental deformation takes the previous step to this one
+        defGrad = hrdic._matMul2(series.defGrad(2, incremental=True),
+                                 series.defGrad(1))
+        for component, expected in zip(defGrad, series.defGrad(2)):
+            assert np.allclose(component, expected)
+
+        f11, f12, f21, f22 = series.defGrad(2, incremental=True)
+        e11 = 0.5 * (f11**2 + f21**2 - 1)
+        assert np.allclose(series.calcComponent('e11', 2, incremental=True),
+                           e11)
+
+    @staticmethod
+    def test_incremental_data(series_dir):
+        fnames = [f"incremental_{i}.txt" for i in range(3)]
+        series = hrdic.MapSeries(series_dir, fnames, cumulativeData=False)
+        stepMap = series[0]
+        stepDefGrad = (stepMap.f11, stepMap.f12, stepMap.f21, stepMap.f22)
+
+        assert series.calcComponent('e11', 1, incremental=True) is \
+            series[1].e11
+
+        expected = hrdic._matMul2(stepDefGrad, stepDefGrad)
+        for component, expected in zip(series.defGrad(1), expected):
+            assert np.allclose(component, expected)
+        assert np.allclose(series.calcComponent('x_map', 2),
+                           3 * stepMap.x_map)
+
+    @staticmethod
+    def test_grain_history(series_dir, ebsd_map):
+        series = cumulative_series(series_dir)
+        map0 = series[0]
+
+        series.homogPoints = [(36, 72), (279, 27), (162, 174), (60, 157)]
+        series.linkEbsdMap(ebsd_map)
+        series.findGrains(algorithm='warp')
+
+        assert map0.ebsdTransform is series.refMap.ebsdTransform
+        assert map0.grains is series.refMap.grains
+        assert len(map0) == len(series.refMap)
+        assert map0[3].ebsdGrain is series.refMap[3].ebsdGrain
+        assert series[1][3].dicMap is series[1]
+
+        history = series.grainHistory('eMaxShear')
+        assert history.shape == (3, len(series.refMap))
+        for i, dicMap in enumerate(series):
+            assert np.allclose(history[i],
+                               dicMap.calcGrainAv(dicMap.crop(dicMap.eMaxShear)))
+
+        history = series.grainHistory('e11', stat='max', incremental=True)
+        expected = series.refMap.calcGrainStats(
+            series.refMap.crop(series.calcComponent('e11', 1, incremental=True)),
+            stats=('max',)
+        )['max']
+        assert np.allclose(history[1], expected)
+
 
 # methods to test
 # '_grad',
@@ -6,8 +387,6 @@
 # 'boundaries',
 # 'bseScale',
 # 'buildNeighbourNetwork',
-# 'calcGrainAv',
-# 'calcProxigram',
 # 'checkEbsdLinked',
 # 'checkGrainsDetected',
 # 'clickGrainID',
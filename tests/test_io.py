@@ -2,7 +2,9 @@ import pytest
 import numpy as np
 
 import defdap.file_readers
+import defdap.ebsd
 from defdap.crystal import crystalStructures, Phase
+from defdap.quat import Quat, QuatArray
 
 DATA_DIR = "tests/data/"
 EXAMPLE_EBSD = DATA_DIR + "testDataEBSD"
@@ -90,12 +92,80 @@ class TestEBSDDataLoader:
         assert metadata_loaded_oxford_binary.loadedData['eulerAngle'].shape == (3, y_dim, x_dim)
         assert isinstance(metadata_loaded_oxford_binary.loadedData['eulerAngle'][0, 0, 0], np.float64)
 
+    @staticmethod
+    def test_load_oxford_crc_memmap(metadata_loaded_oxford_binary):
+        expected = defdap.file_readers.OxfordBinaryLoader()
+        expected.load(EXAMPLE_EBSD)
+        metadata_loaded_oxford_binary.loadOxfordCRC(EXAMPLE_EBSD,
+                                                    memmap=True)
+        loaded_data = metadata_loaded_oxford_binary.loadedData
+
+        for key in ('bandContrast', 'bandSlope', 'meanAngularDeviation',
+                    'phase', 'eulerAngle'):
+            assert isinstance(loaded_data[key], np.memmap)
+            assert not loaded_data[key].flags.writeable
+            assert np.array_equal(loaded_data[key],
+                                  expected.loadedData[key])
+        assert loaded_data['eulerAngle'].dtype == np.float32
+
     @staticmethod
     def test_load_oxford_crc_bad(metadata_loaded_oxford_binary):
         with pytest.raises(FileNotFoundError):
             metadata_loaded_oxford_binary.loadOxfordCRC("badger")
 
 
+class TestOxfordTextLoader:
+
+    @staticmethod
+    @pytest.fixture(scope="class")
+    def ctf_file(tmp_path_factory):
+        ebsd_map = defdap.ebsd.Map(EXAMPLE_EBSD)
+        ebsd_map.buildQuatArray()
+        file_dir = tmp_path_factory.mktemp("ctf")
+        ebsd_map.save("test", file_dir=str(file_dir))
+
+        return file_dir / "test"
+
+    @staticmethod
+    @pytest.fixture(scope="class")
+    def binary_data():
+        data_loader = defdap.file_readers.OxfordBinaryLoader()
+        data_loader.load(EXAMPLE_EBSD)
+
+        return data_loader.loadedData
+
+    @staticmethod
+    @pytest.mark.parametrize('chunk_size', [None, 1000])
+    def test_load(ctf_file, binary_data, chunk_size):
+        data_loader = defdap.file_readers.OxfordTextLoader()
+        data_loader.load(str(ctf_file), chunkSize=chunk_size)
+        loaded_data = data_loader.loadedData
+
+        assert data_loader.loadedMetadata['xDim'] == 359
+        assert data_loader.loadedMetadata['yDim'] == 243
+        assert loaded_data['eulerAngle'].shape == (3, 243, 359)
+        assert loaded_data['eulerAngle'].dtype == np.float64
+        assert loaded_data['phase'].dtype == np.uint8
+        assert loaded_data['bandContrast'].dtype == np.uint8
+        assert np.array_equal(loaded_data['phase'], binary_data['phase'])
+        assert np.array_equal(loaded_data['bandContrast'],
+                              binary_data['bandContrast'])
+        quats = QuatArray.fromEulerAngles(loaded_data['eulerAngle'])
+        expected = QuatArray.fromEulerAngles(binary_data['eulerAngle'])
+        assert np.allclose(Quat.calcMaxSymDot(quats.quatCoef,
+                                              expected.quatCoef, 'cubic'),
+                           1, atol=1e-8)
+
+    @staticmethod
+    def test_load_truncated(ctf_file, tmp_path):
+        lines = ctf_file.with_suffix(".ctf").read_text().splitlines()
+        (tmp_path / "test.ctf").write_text("\n".join(lines[:-10]))
+        data_loader = defdap.file_readers.OxfordTextLoader()
+
+        with pytest.raises(ValueError):
+            data_loader.load(str(tmp_path / "test"), chunkSize=1000)
+
+
 class TestDICDataLoader:
 
     @staticmethod
@@ -146,6 +216,29 @@ class TestDICDataLoader:
         assert data['xd'].shape[0] == num_elements
         assert data['yd'].shape[0] == num_elements
 
+    @staticmethod
+    def test_load_davis_data_chunks(dic_data_loaded):
+        # metadata is loaded from the header if not already
+        dic_loader = defdap.file_readers.DICDataLoader()
+        dic_loader.loadDavisData(EXAMPLE_DIC, chunkSize=1000)
+
+        assert dic_loader.loadedMetadata['xDim'] == 300
+        assert dic_loader.loadedMetadata['yDim'] == 200
+        for key in ('xc', 'yc', 'xd', 'yd'):
+            assert dic_loader.loadedData[key].dtype == np.float64
+            assert np.array_equal(dic_loader.loadedData[key],
+                                  dic_data_loaded.loadedData[key])
+
+    @staticmethod
+    def test_load_davis_data_float32(dic_data_loaded):
+        dic_loader = defdap.file_readers.DICDataLoader()
+        dic_loader.loadDavisData(EXAMPLE_DIC, dtype=np.float32)
+
+        for key in ('xc', 'yc', 'xd', 'yd'):
+            assert dic_loader.loadedData[key].dtype == np.float32
+            assert np.allclose(dic_loader.loadedData[key],
+                               dic_data_loaded.loadedData[key])
+
     @staticmethod
     def test_load_davis_data_bad_file(dic_metadata_loaded):
         with pytest.raises(FileNotFoundError):
@@ -3,7 +3,7 @@ from pytest import approx
 from pytest_cases import parametrize, parametrize_with_cases
 
 import numpy as np
-from defdap.quat import Quat
+from defdap.quat import Quat, QuatArray
 
 
 # Initialisation tests
@@ -595,6 +595,433 @@ class TestSymEqv:
 
 
 
+class TestSymEqvMatrices:
+
+    @staticmethod
+    @pytest.mark.parametrize('sym_group', ['cubic', 'hexagonal'])
+    def test_calc(single_quat, sym_group):
+        sym_matrices = Quat.symEqvMatrices(sym_group)
+        syms = Quat.symEqv(sym_group)
+
+        assert sym_matrices.shape == (len(syms), 4, 4)
+        for sym, sym_matrix in zip(syms, sym_matrices):
+            expected = (sym * single_quat).quatCoef
+            result = sym_matrix @ single_quat.quatCoef
+            # sym * quat is moved to northern hemisphere
+            assert np.allclose(np.sign(result[0]) * result, expected)
+
+
+class TestCalcSymEqvs:
+
+    @staticmethod
+    def test_return_type(ori_quat_list_valid):
+        result = Quat.calcSymEqvs(ori_quat_list_valid, 'cubic')
+
+        assert type(result) is np.ndarray
+        assert result.shape == (24, 4, 2)
+        assert result.dtype == np.float64
+
+    @staticmethod
+    def test_calc(ori_quat_list_valid):
+        result = Quat.calcSymEqvs(ori_quat_list_valid, 'hexagonal')
+
+        for i, sym in enumerate(Quat.symEqv('hexagonal')):
+            for j, quat in enumerate(ori_quat_list_valid):
+                assert np.allclose(result[i, :, j], (sym * quat).quatCoef)
+
+    @staticmethod
+    def test_float32(ori_quat_list_valid):
+        result = Quat.calcSymEqvs(ori_quat_list_valid, 'cubic',
+                                  dtype=np.float32)
+        expected = Quat.calcSymEqvs(ori_quat_list_valid, 'cubic')
+
+        assert result.dtype == np.float32
+        assert np.allclose(result, expected, atol=1e-6)
+
+
+class TestCalcMaxSymDot:
+
+    @staticmethod
+    @pytest.fixture
+    def quat_comps():
+        eulers = np.random.default_rng(1).random((2, 3, 3, 4)) * np.pi
+        return np.array([QuatArray.fromEulerAngles(euler).quatCoef
+                         for euler in eulers])
+
+    @staticmethod
+    @pytest.mark.parametrize('stream', [True, False])
+    def test_calc(quat_comps, stream):
+        max_dot, max_index = Quat.calcMaxSymDot(
+            quat_comps[0], quat_comps[1], 'cubic',
+            stream=stream, returnIndex=True
+        )
+
+        assert max_dot.shape == (3, 4)
+        syms = Quat.symEqv('cubic')
+        for idx in np.ndindex(max_dot.shape):
+            quat = Quat(quat_comps[(0, slice(None)) + idx])
+            quat_right = Quat(quat_comps[(1, slice(None)) + idx])
+            assert max_dot[idx] == approx(quat.misOri(quat_right, 'cubic'))
+            assert abs(quat.dot(syms[max_index[idx]] * quat_right)) == \
+                approx(max_dot[idx])
+
+    @staticmethod
+    def test_float32(quat_comps):
+        result = Quat.calcMaxSymDot(quat_comps[0], quat_comps[1], 'cubic',
+                                    dtype=np.float32)
+        expected = Quat.calcMaxSymDot(quat_comps[0], quat_comps[1], 'cubic')
+
+        assert result.dtype == np.float32
+        assert np.allclose(result, expected, atol=1e-6)
+
+
+class TestCalcMisOriPairs:
+
+    @staticmethod
+    @pytest.fixture
+    def quat_comps():
+        eulers = np.random.default_rng(2).random((2, 3, 50)) * np.pi
+        return np.array([QuatArray.fromEulerAngles(euler).quatCoef
+                         for euler in eulers])
+
+    @staticmethod
+    @pytest.mark.parametrize('sym_group', ['cubic', 'hexagonal'])
+    def test_calc(quat_comps, sym_group):
+        mis_ori, sym_index, mis_ori_axis = Quat.calcMisOriPairs(
+            quat_comps[0], quat_comps[1], sym_group, returnAxis=True
+        )
+
+        assert mis_ori.shape == sym_index.shape == (50,)
+        assert mis_ori_axis.shape == (3, 50)
+        syms = Quat.symEqv(sym_group)
+        for i in range(50):
+            quat = Quat(quat_comps[0, :, i])
+            quat_right = Quat(quat_comps[1, :, i])
+            min_mis_ori, min_quat_sym = quat.misOri(quat_right, sym_group,
+                                                    returnQuat=2)
+            expected_axis = quat.misOriAxis(min_quat_sym)
+
+            assert np.cos(mis_ori[i] / 2) == approx(min_mis_ori)
+            assert abs(quat.dot(syms[sym_index[i]] * quat_right)) == \
+                approx(min_mis_ori)
+            assert mis_ori_axis[:, i] == approx(
+                expected_axis / np.linalg.norm(expected_axis))
+
+    @staticmethod
+    def test_reference(quat_comps):
+        ref_quat = Quat(quat_comps[1, :, 0])
+        mis_ori, _ = Quat.calcMisOriPairs(QuatArray(quat_comps[0]), ref_quat,
+                                          'cubic')
+        expected, _ = Quat.calcMisOriPairs(quat_comps[0],
+                                           quat_comps[1, :, :1], 'cubic')
+
+        assert np.allclose(mis_ori, expected)
+
+    @staticmethod
+    def test_disorientation_cubic(quat_comps):
+        mis_ori, _, axis = Quat.calcMisOriPairs(
+            quat_comps[0], quat_comps[1], 'cubic',
+            returnAxis=True, disorientation=True
+        )
+
+        assert np.all(mis_ori <= 62.8 * np.pi / 180)
+        assert np.all(axis[0] >= axis[1] - 1e-10)
+        assert np.all(axis[1] >= axis[2] - 1e-10)
+        assert np.all(axis[2] >= -1e-10)
+        assert np.allclose(np.linalg.norm(axis, axis=0), 1)
+
+    @staticmethod
+    def test_disorientation_hexagonal(quat_comps):
+        _, _, axis = Quat.calcMisOriPairs(
+            quat_comps[0], quat_comps[1], 'hexagonal',
+            returnAxis=True, disorientation=True
+        )
+        azimuth = np.arctan2(axis[1], axis[0])
+
+        assert np.all(axis[2] >= -1e-10)
+        assert np.all(azimuth >= -1e-10)
+        assert np.all(azimuth <= np.pi / 6 + 1e-10)
+
+
+class TestCalcAverageOris:
+
+    @staticmethod
+    @pytest.fixture
+    def group_comps():
+        # 3 groups of quats scattered by up to about 2 degrees around a
+        # known orientation, replaced with random symmetric equivalents
+        rng = np.random.default_rng(3)
+        centres = QuatArray.fromEulerAngles(
+            rng.random((3, 3)).T * np.pi).quatCoef
+        group_sizes = [20, 1, 35]
+        group_offsets = np.concatenate(([0], np.cumsum(group_sizes)))
+        scatter = QuatArray.fromAxisAngle(
+            rng.standard_normal((3, group_offsets[-1])),
+            rng.random(group_offsets[-1]) * np.pi / 90
+        ).quatCoef
+        sym_matrices = Quat.symEqvMatrices('cubic')[
+            rng.integers(24, size=group_offsets[-1])]
+        group_ids = np.repeat(np.arange(3), group_sizes)
+
+        quat_comps = np.array([
+            (Quat(scatter[:, i]) * Quat(centres[:, group_ids[i]])).quatCoef
+            for i in range(group_offsets[-1])
+        ])
+        quat_comps = np.einsum('nij,nj->in', sym_matrices, quat_comps)
+        quat_comps *= rng.choice([-1, 1], size=group_offsets[-1])
+
+        return centres, quat_comps, group_offsets
+
+    @staticmethod
+    @pytest.mark.parametrize('method', ['mean', 'markley'])
+    def test_calc(group_comps, method):
+        centres, quat_comps, group_offsets = group_comps
+        av_oris = Quat.calcAverageOris(quat_comps, 'cubic', group_offsets,
+                                       method=method)
+
+        assert av_oris.shape == (3,)
+        assert np.allclose(np.linalg.norm(av_oris.quatCoef, axis=0), 1)
+        max_dot = Quat.calcMaxSymDot(av_oris.quatCoef, centres, 'cubic')
+        assert np.all(2 * np.arccos(np.minimum(max_dot, 1)) < np.pi / 180)
+        # single quat group is unchanged
+        assert Quat.calcMaxSymDot(av_oris.quatCoef[:, 1],
+                                  quat_comps[:, 20], 'cubic') == approx(1)
+
+    @staticmethod
+    def test_methods_agree(group_comps):
+        _, quat_comps, group_offsets = group_comps
+        av_oris = Quat.calcAverageOris(quat_comps, 'cubic', group_offsets,
+                                       numRefine=2)
+        av_oris_markley = Quat.calcAverageOris(
+            quat_comps, 'cubic', group_offsets, method='markley'
+        )
+
+        max_dot = Quat.calcMaxSymDot(av_oris.quatCoef,
+                                     av_oris_markley.quatCoef, 'cubic')
+        assert np.all(max_dot > np.cos(0.01 * np.pi / 360))
+
+    @staticmethod
+    def test_single_group(group_comps):
+        _, quat_comps, group_offsets = group_comps
+        quat_comps = quat_comps[:, :group_offsets[1]]
+        av_ori = Quat.calcAverageOri(
+            Quat.calcSymEqvs(QuatArray(quat_comps), 'cubic'))
+        av_oris = Quat.calcAverageOris(QuatArray(quat_comps), 'cubic')
+
+        assert av_oris.shape == (1,)
+        assert av_ori.misOri(av_oris[0], 'cubic') == approx(1)
+
+    @staticmethod
+    def test_bad_method(group_comps):
+        _, quat_comps, _ = group_comps
+        with pytest.raises(ValueError):
+            Quat.calcAverageOris(quat_comps, 'cubic', method='median')
+
+
+# Test array of quats
+
+
+@pytest.fixture
+def quat_array(single_quat, single_quat2) -> QuatArray:
+    """2x2 array of quats, made of single_quat and single_quat2"""
+    quatCoef = np.empty((4, 2, 2))
+    quatCoef[:, 0, 0] = quatCoef[:, 1, 1] = single_quat.quatCoef
+    quatCoef[:, 0, 1] = quatCoef[:, 1, 0] = single_quat2.quatCoef
+    return QuatArray(quatCoef)
+
+
+class TestQuatArray:
+
+    @staticmethod
+    def test_init_bad_shape():
+        with pytest.raises(TypeError):
+            QuatArray(np.zeros((3, 2)))
+
+    @staticmethod
+    def test_init_northern():
+        quat_array = QuatArray(np.array([[-1., 1.], [0, 0], [0, 0], [0, 0]]))
+
+        assert np.all(quat_array.quatCoef[0] == 1.)
+
+    @staticmethod
+    def test_from_euler_angles():
+        eulers = np.random.default_rng(0).random((3, 4, 5)) * np.pi
+        quat_array = QuatArray.fromEulerAngles(eulers)
+        quats = Quat.createManyQuats(eulers)
+
+        assert quat_array.shape == (4, 5)
+        assert type(quats[0, 0]) is Quat
+        assert np.allclose(quat_array.quatCoef,
+                           Quat.extract_quat_comps(quats))
+
+    @staticmethod
+    def test_getitem(quat_array, single_quat2):
+        result = quat_array[0, 1]
+
+        assert type(result) is Quat
+        assert np.allclose(result.quatCoef, single_quat2.quatCoef)
+        assert type(quat_array[0]) is QuatArray
+        assert quat_array[0].shape == (2,)
+        assert quat_array[np.eye(2, dtype=bool)].shape == (2,)
+
+    @staticmethod
+    def test_setitem(quat_array, single_quat):
+        quat_array[0, 1] = single_quat
+
+        assert np.allclose(quat_array[0, 1].quatCoef, single_quat.quatCoef)
+
+    @staticmethod
+    def test_mul(quat_array, single_quat, single_quat2):
+        result = quat_array * single_quat2
+        result_left = single_quat2 * quat_array
+        result_array = quat_array * quat_array
+
+        assert type(result) is QuatArray
+        assert type(result_left) is QuatArray
+        assert np.allclose(result[0, 0].quatCoef,
+                           (single_quat * single_quat2).quatCoef)
+        assert np.allclose(result_left[0, 0].quatCoef,
+                           (single_quat2 * single_quat).quatCoef)
+        assert np.allclose(result_array[0, 1].quatCoef,
+                           (single_quat2 * single_quat2).quatCoef)
+
+    @staticmethod
+    def test_dot(quat_array, single_quat, single_quat2):
+        result = quat_array.dot(single_quat2)
+
+        assert result.shape == (2, 2)
+        assert result[0, 0] == approx(single_quat.dot(single_quat2))
+
+    @staticmethod
+    def test_conjugate(quat_array, single_quat):
+        result = quat_array.conjugate
+
+        assert np.allclose(result[0, 0].quatCoef,
+                           single_quat.conjugate.quatCoef)
+
+    @staticmethod
+    def test_mis_ori(quat_array, single_quat, single_quat2):
+        misOri, minQuatSym = quat_array.misOri(single_quat2, "cubic",
+                                               returnQuat=2)
+        expMisOri, expQuatSym = single_quat.misOri(single_quat2, "cubic",
+                                                   returnQuat=2)
+
+        assert misOri.shape == (2, 2)
+        assert misOri[0, 0] == approx(expMisOri)
+        assert misOri[0, 1] == approx(1.)
+        assert np.allclose(minQuatSym[0, 0].quatCoef, expQuatSym.quatCoef)
+
+    @staticmethod
+    def test_mis_ori_axis(quat_array, single_quat, single_quat2):
+        result = quat_array.misOriAxis(single_quat2)
+
+        assert result.shape == (3, 2, 2)
+        assert np.allclose(result[:, 0, 0],
+                           single_quat.misOriAxis(single_quat2))
+
+    @staticmethod
+    def test_rot_matrix(quat_array, single_quat):
+        result = quat_array.rotMatrix()
+
+        assert result.shape == (3, 3, 2, 2)
+        assert np.allclose(result[:, :, 0, 0], single_quat.rotMatrix())
+
+    @staticmethod
+    def test_extract_quat_comps(quat_array):
+        assert Quat.extract_quat_comps(quat_array) is quat_array.quatCoef
+
+
+class TestQuatArrayConversions:
+
+    @staticmethod
+    @pytest.fixture
+    def quat_comps():
+        quat_comps = np.random.default_rng(3).normal(size=(4, 5, 6))
+        quat_comps /= np.linalg.norm(quat_comps, axis=0)
+        # Phi of 0 and pi and no rotation
+        quat_comps[:, 0, 0] = [0.70710678, 0., 0., 0.70710678]
+        quat_comps[:, 0, 1] = [0., 0.70710678, 0.70710678, 0.]
+        quat_comps[:, 0, 2] = [1., 0., 0., 0.]
+        return quat_comps
+
+    @staticmethod
+    def same_rotations(quat_comps1, quat_comps2):
+        return np.allclose(np.abs(np.sum(quat_comps1 * quat_comps2, axis=0)),
+                           1)
+
+    @staticmethod
+    def test_euler_angles(quat_comps):
+        eulers = QuatArray(quat_comps).eulerAngles()
+
+        assert eulers.shape == (3, 5, 6)
+        for idx in np.ndindex(5, 6):
+            assert np.allclose(eulers[(slice(None),) + idx],
+                               Quat(quat_comps[(slice(None),) + idx])
+                               .eulerAngles())
+        assert TestQuatArrayConversions.same_rotations(
+            QuatArray.fromEulerAngles(eulers).quatCoef, quat_comps)
+
+    @staticmethod
+    def test_rot_matrix(quat_comps):
+        rot_matrix = QuatArray(quat_comps).rotMatrix()
+        result = QuatArray.fromRotMatrix(rot_matrix)
+
+        assert result.shape == (5, 6)
+        assert TestQuatArrayConversions.same_rotations(result.quatCoef,
+                                                       quat_comps)
+
+    @staticmethod
+    @pytest.mark.parametrize('quat_comp', [
+        [0., 1., 0., 0.], [0., 0., 1., 0.], [0., 0., 0., 1.], [0., 0.6, 0.8, 0.]
+    ])
+    def test_rot_matrix_half_turn(quat_comp):
+        quat_comp = np.array(quat_comp)
+        result = QuatArray.fromRotMatrix(QuatArray(quat_comp).rotMatrix())
+
+        assert abs(np.dot(result.quatCoef, quat_comp)) == approx(1)
+
+    @staticmethod
+    def test_axis_angle(quat_comps):
+        axis, angle = QuatArray(quat_comps).axisAngle()
+
+        assert axis.shape == (3, 5, 6)
+        assert np.allclose(np.linalg.norm(axis, axis=0), 1)
+        assert np.all((angle >= 0) & (angle <= np.pi))
+        assert np.allclose(axis[:, 0, 2], [0, 0, 1]) and angle[0, 2] == 0
+        assert TestQuatArrayConversions.same_rotations(
+            QuatArray.fromAxisAngle(axis, angle).quatCoef, quat_comps)
+        assert np.allclose(
+            QuatArray.fromAxisAngle(axis[:, 1, 1], angle[1, 1]).quatCoef,
+            Quat.fromAxisAngle(axis[:, 1, 1], angle[1, 1]).quatCoef
+        )
+
+    @staticmethod
+    def test_rodrigues(quat_comps):
+        quat_comps = quat_comps[:, 1:]
+        rod_vector = QuatArray(quat_comps).rodrigues()
+        axis, angle = QuatArray(quat_comps).axisAngle()
+
+        assert np.allclose(rod_vector, axis * np.tan(angle / 2))
+        assert TestQuatArrayConversions.same_rotations(
+            QuatArray.fromRodrigues(rod_vector).quatCoef, quat_comps)
+
+    @staticmethod
+    @pytest.mark.parametrize('quat_comp', [
+        [[0., 1., 0., 0.], [0., 0., 0., 1.]],
+        [[0., 0.70710678, 0.70710678, 0.], [0.5, 0.5, 0.5, 0.5]],
+        [[0., -0.57735027, 0.57735027, 0.57735027], [1., 0., 0., 0.]],
+    ])
+    def test_rodrigues_half_turn(quat_comp):
+        quat_comp = np.array(quat_comp).T
+        rod_vector = QuatArray(quat_comp).rodrigues()
+        with np.errstate(all='raise'):
+            result = QuatArray.fromRodrigues(rod_vector)
+
+        assert TestQuatArrayConversions.same_rotations(
+            result.quatCoef, quat_comp)
+
+
+
 
 
 
@@ -606,8 +1033,6 @@ plotIPF
 plotUnitCell
 
 createManyQuats(eulerArray)
-calcSymEqvs(quats, symGroup, dtype=np.float)
-calcAverageOri(quatComps)
 calcMisOri(quatComps, refOri)
 polarAngles(x, y, z)
 calcIPFcolours(quats, direction, symGroup)